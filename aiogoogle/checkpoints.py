@@ -0,0 +1,213 @@
+"""
+Checkpoints of paginated scans, so that a scan that's interrupted (e.g. the process dies halfway through a listing of millions of files)
+resumes from the last page it got through, instead of starting over.
+
+Usage::
+
+    >>> store = FileCheckpointStore("checkpoints/")
+    >>> res = await aiogoogle.as_user(drive.files.list(pageSize=1000), full_res=True)
+    >>> async for file in res.items(checkpoint_store=store):
+    ...     process(file)
+
+Run the same code again after a crash and the scan carries on from the page after the last one that was fully processed.
+Checkpoints are deleted once their scan completes.
+
+Checkpoints are keyed by the request of the first page and by who sends it, so that users never resume from each other's page tokens.
+"""
+
+__all__ = ["AbstractCheckpointStore", "MemoryCheckpointStore", "FileCheckpointStore"]
+
+from abc import ABC, abstractmethod
+import copy
+import hashlib
+import json
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiofiles
+from aiofiles import os as async_os
+
+
+class AbstractCheckpointStore(ABC):
+    """
+    Storage for the checkpoints of paginated scans.
+
+    Checkpoints are dicts with the following keys:
+
+        * "method", "url" and "json": The request of the first page, without its page token. Credentials (e.g. API keys) are stripped from the URL
+
+        * "page_token": Token of the next page to request
+
+        * "pages_emitted" and "items_emitted": Number of pages and items the scan got through so far
+
+    They only hold JSON serializable values.
+    """
+
+    @abstractmethod
+    async def get(self, key):
+        """
+        Returns the checkpoint stored under ``key`` or None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key, checkpoint):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key):
+        raise NotImplementedError
+
+
+class MemoryCheckpointStore(AbstractCheckpointStore):
+    """
+    Keeps checkpoints in memory. Useful to resume a scan in the same process e.g. after an error
+    """
+
+    def __init__(self):
+        self._checkpoints = {}
+
+    def __len__(self):
+        return len(self._checkpoints)
+
+    async def get(self, key):
+        return copy.deepcopy(self._checkpoints.get(key))
+
+    async def set(self, key, checkpoint):
+        self._checkpoints[key] = copy.deepcopy(checkpoint)
+
+    async def delete(self, key):
+        self._checkpoints.pop(key, None)
+
+
+class FileCheckpointStore(AbstractCheckpointStore):
+    """
+    Stores every checkpoint in a JSON file of its own, so that scans can be resumed by another process
+
+    Arguments:
+
+        directory (str): Directory to store checkpoints in. Created if it doesn't exist
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path_of(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    async def get(self, key):
+        try:
+            async with aiofiles.open(self._path_of(key), "r") as f:
+                return json.loads(await f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    async def set(self, key, checkpoint):
+        path = self._path_of(key)
+        # Write to a temporary file first, so that a crash never leaves a half written checkpoint behind
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        async with aiofiles.open(tmp_path, "w") as f:
+            await f.write(json.dumps(checkpoint))
+        os.replace(tmp_path, path)
+
+    async def delete(self, key):
+        try:
+            await async_os.remove(self._path_of(key))
+        except FileNotFoundError:
+            pass
+
+
+# Query parameters that carry credentials. Never written to checkpoints
+CREDENTIAL_PARAMETERS = frozenset(("key", "access_token"))
+
+
+def _strip_credentials(url):
+    """
+    Returns ``url`` without the query parameters that carry credentials
+    """
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name not in CREDENTIAL_PARAMETERS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _identity_of(user_creds, auth_manager):
+    """
+    Returns who sends a request in a way that doesn't change as their access tokens are renewed, or None if that's unknown.
+    i.e. The subject of the user's ID token or a digest of their refresh token, or the email of the service account (and of the user it acts on behalf of)
+    """
+    if user_creds:
+        subject = (user_creds.get("id_token") or {}).get("sub")
+        if subject:
+            return f"user {subject}"
+        if user_creds.get("refresh_token"):
+            return "user " + hashlib.sha256(user_creds["refresh_token"].encode("utf-8")).hexdigest()
+        return None
+    creds = getattr(auth_manager, "creds", None) or {}
+    if creds.get("client_email"):
+        return f"service_account {creds['client_email']} {creds.get('subject') or ''}"
+    return None
+
+
+def _checkpoint_key(method, url, body, authorized=False, user_creds=None, auth_manager=None):
+    """
+    Returns the key of the checkpoints of the scan that starts with a request, given its URL and body without their page tokens.
+
+    Who sends the request is part of the key, as is the URL (API keys included), so that users never share checkpoints.
+    Access tokens are left out, since they're renewed every hour or so and the scan should still resume with a new one
+
+    Raises:
+
+        ValueError: If the request is authorized, but there's no telling by whom
+    """
+    identity = "anon"
+    if authorized:
+        identity = _identity_of(user_creds, auth_manager)
+        if identity is None:
+            raise ValueError("Can't tell whose credentials the scan is sent with. Pass a checkpoint_key")
+    body = json.dumps(body, sort_keys=True) if body is not None else ""
+    return hashlib.sha256(f"{identity} {(method or 'GET').upper()} {url} {body}".encode("utf-8")).hexdigest()
+
+
+class _Checkpointer:
+    """
+    Records the progress of one scan to a store
+    """
+
+    def __init__(self, store, key, method, url, body):
+        self.store = store
+        self.key = key
+        self.checkpoint = {
+            "method": method,
+            "url": _strip_credentials(url),
+            "json": body,
+            "page_token": None,
+            "pages_emitted": 0,
+            "items_emitted": 0,
+        }
+
+    async def load(self):
+        """
+        Returns the page token to resume the scan from, if it was checkpointed
+        """
+        checkpoint = await self.store.get(self.key)
+        if checkpoint is None or not checkpoint.get("page_token"):
+            return None
+        self.checkpoint.update(
+            page_token=checkpoint["page_token"],
+            pages_emitted=checkpoint.get("pages_emitted", 0),
+            items_emitted=checkpoint.get("items_emitted", 0),
+        )
+        return checkpoint["page_token"]
+
+    async def commit(self, next_page_token, items):
+        """
+        Records that a page (and its ``items``) was processed. Deletes the checkpoint if it was the last page
+        """
+        if not next_page_token:
+            await self.store.delete(self.key)
+            return
+        self.checkpoint["page_token"] = next_page_token
+        self.checkpoint["pages_emitted"] += 1
+        self.checkpoint["items_emitted"] += items
+        await self.store.set(self.key, self.checkpoint)
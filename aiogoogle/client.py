@@ -2,12 +2,20 @@ from __future__ import annotations
 
 __all__ = ["Aiogoogle"]
 
+from collections.abc import Sized
 from contextvars import ContextVar
-from typing import TYPE_CHECKING, Any, Literal, Optional, Type
+import time
+from typing import TYPE_CHECKING, Any, Literal, Optional, Type, Union
 
 from .resource import GoogleAPI
 from .auth.managers import Oauth2Manager, ApiKeyManager, OpenIdConnectManager, ServiceAccountManager
 from .sessions.aiohttp_session import AiohttpSession
+from .sessions.common import SessionStats, RetryPolicy, _unpack_requests
+from .sessions.limiters import ConcurrencyLimiter, RateLimiter
+from .sessions.batching import BatchCoalescer
+from .sessions.dedup import SingleFlight
+from .sessions.cache import AbstractCache, FileCache
+from .sessions.codec import JsonCodec
 from .data import DISCOVERY_SERVICE_V1_DISCOVERY_DOC
 from .excs import HTTPError
 
@@ -24,6 +32,13 @@ GOOGLE_DISCOVERY_SERVICE_URL_FMT_V2 = (
 )
 
 
+def _authorize_all(authorize, requests):
+    # Iterables of unknown length are authorized lazily, as their requests are sent
+    if isinstance(requests, Sized):
+        return [authorize(request) for request in requests]
+    return map(authorize, requests)
+
+
 class Aiogoogle:
     """
     Main entry point for Aiogoogle.
@@ -49,8 +64,41 @@ class Aiogoogle:
 
         service_account_creds (aiogoogle.auth.creds.ServiceAccountCreds): Service account credentials
 
+        max_concurrency (int, aiogoogle.sessions.limiters.ConcurrencyLimiter): Max requests in flight, shared by all calls made by this object. No limit by default. See ``AdaptiveConcurrencyLimiter``
+
+        retry_policy (aiogoogle.sessions.common.RetryPolicy): Policy for retrying requests that fail with transient errors (e.g. 429, 503 or a dropped connection). Defaults to no retries
+
+        rate_limiter (aiogoogle.sessions.limiters.RateLimiter): Client side rate limiter keyed by API ID (e.g. "drive:v3") and method ID (e.g. "drive.files.list"). Defaults to no pacing
+
+        auto_batch (bool, aiogoogle.sessions.batching.BatchCoalescer): Coalesce requests of the same API and user that are sent around the same time into batch requests. Defaults to False
+
+        deduplicate (bool, aiogoogle.sessions.dedup.SingleFlight): Make concurrent identical GET requests share one network call. Check ``stats.deduplicated`` for the calls saved. Defaults to False
+
+        cache (bool, aiogoogle.sessions.cache.AbstractCache): Cache responses by ETag and revalidate them with conditional requests. True creates a ``MemoryCache``. Defaults to no caching
+
+        offload_json (bool, aiogoogle.sessions.codec.JsonCodec): Parse and serialize large JSON bodies in an executor instead of on the event loop. Check ``stats.bodies_offloaded``. Defaults to False
+
+        discovery_cache_dir (str): Directory to keep the discovery documents downloaded by ``discover`` (and the listings of ``list_api``) in. Defaults to not caching them
+
+        discovery_cache_ttl (float): Seconds a cached discovery document is used for before being revalidated. Stale documents are still used if the Discovery Service can't be reached
+
+    Attributes:
+
+        stats (aiogoogle.sessions.common.SessionStats): Counters (e.g. connections opened and reused) collected by all the sessions this object sends requests with
+
+        concurrency_limiter (aiogoogle.sessions.limiters.ConcurrencyLimiter): Limiter built from ``max_concurrency``. Check its ``in_flight`` and ``queue_depth`` for monitoring
+
+        batch_coalescer (aiogoogle.sessions.batching.BatchCoalescer): Coalescer built from ``auto_batch``. Check its ``batches_sent`` and ``requests_coalesced`` for monitoring
+
+        single_flight (aiogoogle.sessions.dedup.SingleFlight): Built from ``deduplicate``
+
+        json_codec (aiogoogle.sessions.codec.JsonCodec): Built from ``offload_json``
+
     Note:
 
+        ``max_concurrency``, ``rate_limiter``, ``auto_batch``, ``deduplicate``, ``cache`` and ``offload_json`` are supported by the default session only.
+        Other sessions raise NotImplementedError when sending requests with any of them set
+
         In case you want to instantiate a custom session with initial parameters, you can pass an anonymous factory. e.g. ::
 
             >>> sess = lambda: Session(your_custome_arg, your_custom_kwarg=True)
@@ -64,11 +112,30 @@ class Aiogoogle:
         user_creds: Optional[UserCreds] = None,
         client_creds: Optional[ClientCreds] = None,
         service_account_creds: Optional[ServiceAccountCreds] = None,
+        max_concurrency: Optional[Union[int, ConcurrencyLimiter]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        auto_batch: Optional[Union[bool, BatchCoalescer]] = None,
+        deduplicate: Optional[Union[bool, SingleFlight]] = None,
+        cache: Optional[Union[bool, AbstractCache]] = None,
+        offload_json: Optional[Union[bool, JsonCodec]] = None,
+        discovery_cache_dir: Optional[str] = None,
+        discovery_cache_ttl: float = 24 * 60 * 60,
     ):
 
         self.session_factory = session_factory
         # Guarantees that each context manager gets its own active_session.
         self.session_context: ContextVar[session_factory] = ContextVar("active_session", default=None)
+        self.stats = SessionStats()
+        self.concurrency_limiter = ConcurrencyLimiter.from_option(max_concurrency)
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.batch_coalescer = BatchCoalescer.from_option(auto_batch)
+        self.single_flight = SingleFlight.from_option(deduplicate)
+        self.cache = AbstractCache.from_option(cache)
+        self.json_codec = JsonCodec.from_option(offload_json)
+        self.discovery_cache = FileCache(discovery_cache_dir) if discovery_cache_dir is not None else None
+        self.discovery_cache_ttl = discovery_cache_ttl
 
         # Keys
         self.api_key = api_key
@@ -152,9 +219,17 @@ class Aiogoogle:
         request = self.discovery_service.apis.list(
             name=name, preferred=preferred, fields=fields
         )
-        return await self.as_anon(request)
+        return await self._get_discovery_json(request, f"list {name} {preferred} {fields}")
 
-    async def discover(self, api_name: str, api_version: Optional[str] = None, validate: bool = False, *, disco_doc_ver: Optional[Literal[2]] = None) -> GoogleAPI:
+    async def discover(
+        self,
+        api_name: str,
+        api_version: Optional[str] = None,
+        validate: bool = False,
+        *,
+        disco_doc_ver: Optional[Literal[2]] = None,
+        maximize_page_size: bool = False,
+    ) -> GoogleAPI:
         """
         Donwloads a discovery document from Google's Discovery Service V1 and sets it a ``aiogoogle.resource.GoogleAPI``
 
@@ -172,11 +247,13 @@ class Aiogoogle:
 
             api_version (str): API version to discover *e.g.: "v3" not "3" and not 3*
 
-            validate (bool): Set this to True to use this lib's built in parameter validation logic. Note that you shouldn't rely on this for critical user input validation.
+            validate (bool, ValidationPolicy): Set this to True to use this lib's built in parameter validation logic. Note that you shouldn't rely on this for critical user input validation.
             disco_doc_ver: Specify which Google Discovery Service version to fetch a discovery document with.
                 Useful for fetching discovery docs for Google APIs that aren't supported by
                 the default version of the Google Discovery Service Aiogoogle uses.
 
+            maximize_page_size (bool): Ask for as many items per page as each paginated method allows, unless a page size is passed
+
         Returns:
 
             aiogoogle.resource.GoogleAPI: An object that will then be used to create API requests
@@ -208,7 +285,7 @@ class Aiogoogle:
             )
 
         try:
-            discovery_document = await self.as_anon(request)
+            discovery_document = await self._get_discovery_json(request, f"rest {api_name} {api_version} {disco_doc_ver or 1}")
 
         except Exception as e:
             if isinstance(e, HTTPError):
@@ -218,11 +295,91 @@ class Aiogoogle:
                     )
             raise e
 
-        return GoogleAPI(discovery_document, validate)
+        return GoogleAPI(discovery_document, validate, maximize_page_size)
+
+    async def _get_discovery_json(self, request, cache_key):
+        """
+        Sends a request to the Discovery Service, going through ``self.discovery_cache`` if there's one.
+
+        * Fresh cached documents are returned without hitting the network
+
+        * Expired ones are revalidated with their etag
+
+        * Stale ones are returned if the Discovery Service can't be reached or fails with a server error
+        """
+        if self.discovery_cache is None:
+            return await self.as_anon(request)
+
+        entry = await self.discovery_cache.get(cache_key)
+        if entry is not None:
+            if time.time() - entry["stored_at"] < self.discovery_cache_ttl:
+                return entry["json"]
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+
+        try:
+            response = await self.as_anon(request, full_res=True)
+        except Exception as e:
+            client_error = isinstance(e, HTTPError) and e.res is not None and e.res.status_code < 500 and e.res.status_code != 429
+            if entry is None or client_error:
+                raise
+            return entry["json"]
+
+        if response.status_code == 304 and entry is not None:
+            # Still valid. Refresh its timestamp
+            await self.discovery_cache.set(cache_key, entry)
+            return entry["json"]
+
+        headers = response.headers or {}
+        await self.discovery_cache.set(cache_key, {
+            "etag": headers.get("ETag") or (response.json or {}).get("etag"),
+            "status_code": response.status_code,
+            "headers": {},
+            "json": response.json,
+            "data": None,
+        })
+        return response.json
+
+    # -------- Authorize Requests ----------#
+
+    async def _authorize_as_user(self, requests, user_creds=None):
+        user_creds = user_creds or self.user_creds
+        if user_creds is None:
+            raise TypeError("No user credentials were found")
+
+        is_refreshed, user_creds = await self.oauth2.refresh(
+            user_creds, client_creds=self.client_creds
+        )
+        # Set refreshed user_creds if ones already exist
+        if is_refreshed and self.user_creds is not None:
+            self.user_creds = user_creds
+
+        authorized_requests = _authorize_all(
+            lambda request: self.oauth2.authorize(request, user_creds), requests
+        )
+        return authorized_requests, user_creds
+
+    async def _authorize_as_service_account(self, requests, service_account_creds=None):
+        service_account_creds = service_account_creds or self.service_account_creds
+        if service_account_creds is None:
+            raise TypeError("Please pass service account creds")
+
+        await self.service_account_manager.refresh()
+
+        return _authorize_all(self.service_account_manager.authorize, requests)
+
+    def _authorize_as_api_key(self, requests, api_key=None):
+        api_key = api_key or self.api_key
+        if api_key is None:
+            raise TypeError("Please pass an API key")
+
+        return _authorize_all(
+            lambda request: self.api_key_manager.authorize(request, api_key), requests
+        )
 
     # -------- Send Requests ----------#
 
-    async def as_user(self, *requests, timeout=None, full_res=False, user_creds=None, raise_for_status=True):
+    async def as_user(self, *requests, timeout=None, full_res=False, user_creds=None, raise_for_status=True, batch=False):
         """
         Sends requests on behalf of ``self.user_creds`` (OAuth2)
 
@@ -248,24 +405,15 @@ class Aiogoogle:
 
                 If True, raises an HTTP error on HTTP status codes >= 400
 
+            batch (bool, int):
+
+                If True, sends requests of the same API in batch requests of up to 100 requests each (or as many as the given int). Supported by the default session only
+
         Returns:
 
             aiogoogle.models.Response:
         """
-        user_creds = user_creds or self.user_creds
-        if user_creds is None:
-            raise TypeError("No user credentials were found")
-
-        is_refreshed, user_creds = await self.oauth2.refresh(
-            user_creds, client_creds=self.client_creds
-        )
-        # Set refreshed user_creds if ones already exist
-        if is_refreshed and self.user_creds is not None:
-            self.user_creds = user_creds
-
-        authorized_requests = [
-            self.oauth2.authorize(request, user_creds) for request in requests
-        ]
+        authorized_requests, user_creds = await self._authorize_as_user(requests, user_creds)
 
         return await self.send(
             *authorized_requests,
@@ -274,11 +422,13 @@ class Aiogoogle:
             raise_for_status=raise_for_status,
             session_factory=self.session_factory,
             auth_manager=self.oauth2,
-            user_creds=user_creds
+            user_creds=user_creds,
+            batch=batch,
         )
 
     async def as_service_account(
-            self, *requests: Request, timeout: Optional[int] = None, full_res: bool = False, service_account_creds: ServiceAccountCreds = None, raise_for_status: bool = True) -> Response:
+            self, *requests: Request, timeout: Optional[int] = None, full_res: bool = False, service_account_creds: ServiceAccountCreds = None, raise_for_status: bool = True,
+            batch: Union[bool, int] = False) -> Response:
         """
         Sends requests on behalf of ``self.user_creds`` (OAuth2)
 
@@ -304,19 +454,15 @@ class Aiogoogle:
 
                 If True, raises an HTTP error on HTTP status codes >= 400
 
+            batch (bool, int):
+
+                If True, sends requests of the same API in batch requests of up to 100 requests each (or as many as the given int). Supported by the default session only
+
         Returns:
 
             aiogoogle.models.Response:
         """
-        service_account_creds = service_account_creds or self.service_account_creds
-        if service_account_creds is None:
-            raise TypeError("Please pass service account creds")
-
-        await self.service_account_manager.refresh()
-
-        authorized_requests = [
-            self.service_account_manager.authorize(request) for request in requests
-        ]
+        authorized_requests = await self._authorize_as_service_account(requests, service_account_creds)
 
         return await self.send(
             *authorized_requests,
@@ -325,9 +471,10 @@ class Aiogoogle:
             raise_for_status=raise_for_status,
             session_factory=self.session_factory,
             auth_manager=self.service_account_manager,
+            batch=batch,
         )
 
-    async def as_api_key(self, *requests, timeout=None, full_res=False, api_key=None, raise_for_status=True):
+    async def as_api_key(self, *requests, timeout=None, full_res=False, api_key=None, raise_for_status=True, batch=False):
         """
         Sends requests on behalf of ``self.api_key`` (OAuth2)
 
@@ -353,18 +500,15 @@ class Aiogoogle:
 
                 If True, raises an HTTP error on HTTP status codes >= 400
 
+            batch (bool, int):
+
+                If True, sends requests of the same API in batch requests of up to 100 requests each (or as many as the given int). Supported by the default session only
+
         Returns:
 
             aiogoogle.models.Response:
         """
-        api_key = api_key or self.api_key
-        if api_key is None:
-            raise TypeError("Please pass an API key")
-
-        authorized_requests = [
-            self.api_key_manager.authorize(request, api_key)
-            for request in requests
-        ]
+        authorized_requests = self._authorize_as_api_key(requests, api_key)
 
         return await self.send(
             *authorized_requests,
@@ -372,10 +516,11 @@ class Aiogoogle:
             full_res=full_res,
             raise_for_status=raise_for_status,
             session_factory=self.session_factory,
-            auth_manager=self.api_key_manager
+            auth_manager=self.api_key_manager,
+            batch=batch,
         )
 
-    async def as_anon(self, *requests, timeout=None, full_res=False, raise_for_status=True):
+    async def as_anon(self, *requests, timeout=None, full_res=False, raise_for_status=True, batch=False):
         """
         Sends unauthorized requests
 
@@ -397,6 +542,10 @@ class Aiogoogle:
 
                 If True, raises an HTTP error on HTTP status codes >= 400
 
+            batch (bool, int):
+
+                If True, sends requests of the same API in batch requests of up to 100 requests each (or as many as the given int). Supported by the default session only
+
         Returns:
 
             aiogoogle.models.Response:
@@ -407,9 +556,122 @@ class Aiogoogle:
             full_res=full_res,
             raise_for_status=raise_for_status,
             session_factory=self.session_factory,
-            auth_manager=None
+            auth_manager=None,
+            batch=batch,
         )
 
+    # -------- Stream Responses ----------#
+
+    async def as_user_iter(self, *requests, timeout=None, full_res=False, user_creds=None, raise_for_status=True):
+        """
+        Same as ``as_user``, but yields ``(request, response_or_exception)`` as soon as each request completes.
+
+        Example:
+
+            ::
+
+                >>> async for request, response in aiogoogle.as_user_iter(*requests):
+                ...     if isinstance(response, Exception):
+                ...         handle_error(request, response)
+                ...     else:
+                ...         process(response)
+
+        Arguments:
+
+            Same as ``as_user``. Instead of ``*requests``, a single iterable of requests can be passed (e.g. ``aiogoogle.resource.Method.iter_build``).
+            Its requests are only built, authorized and sent as the results come in, so it can be as long as needed
+
+        Yields:
+
+            tuple: ``(request, response_or_exception)``. Errors are yielded, not raised
+        """
+        authorized_requests, user_creds = await self._authorize_as_user(_unpack_requests(requests), user_creds)
+
+        async for result in self.send_iter(
+            authorized_requests,
+            timeout=timeout,
+            full_res=full_res,
+            raise_for_status=raise_for_status,
+            session_factory=self.session_factory,
+            auth_manager=self.oauth2,
+            user_creds=user_creds
+        ):
+            yield result
+
+    async def as_service_account_iter(
+            self, *requests: Request, timeout: Optional[int] = None, full_res: bool = False, service_account_creds: ServiceAccountCreds = None, raise_for_status: bool = True):
+        """
+        Same as ``as_service_account``, but yields ``(request, response_or_exception)`` as soon as each request completes.
+
+        Arguments:
+
+            Same as ``as_service_account``. Instead of ``*requests``, a single iterable of requests can be passed (e.g. ``aiogoogle.resource.Method.iter_build``).
+            Its requests are only built, authorized and sent as the results come in, so it can be as long as needed
+
+        Yields:
+
+            tuple: ``(request, response_or_exception)``. Errors are yielded, not raised
+        """
+        authorized_requests = await self._authorize_as_service_account(_unpack_requests(requests), service_account_creds)
+
+        async for result in self.send_iter(
+            authorized_requests,
+            timeout=timeout,
+            full_res=full_res,
+            raise_for_status=raise_for_status,
+            session_factory=self.session_factory,
+            auth_manager=self.service_account_manager,
+        ):
+            yield result
+
+    async def as_api_key_iter(self, *requests, timeout=None, full_res=False, api_key=None, raise_for_status=True):
+        """
+        Same as ``as_api_key``, but yields ``(request, response_or_exception)`` as soon as each request completes.
+
+        Arguments:
+
+            Same as ``as_api_key``. Instead of ``*requests``, a single iterable of requests can be passed (e.g. ``aiogoogle.resource.Method.iter_build``).
+            Its requests are only built, authorized and sent as the results come in, so it can be as long as needed
+
+        Yields:
+
+            tuple: ``(request, response_or_exception)``. Errors are yielded, not raised
+        """
+        authorized_requests = self._authorize_as_api_key(_unpack_requests(requests), api_key)
+
+        async for result in self.send_iter(
+            authorized_requests,
+            timeout=timeout,
+            full_res=full_res,
+            raise_for_status=raise_for_status,
+            session_factory=self.session_factory,
+            auth_manager=self.api_key_manager
+        ):
+            yield result
+
+    async def as_anon_iter(self, *requests, timeout=None, full_res=False, raise_for_status=True):
+        """
+        Same as ``as_anon``, but yields ``(request, response_or_exception)`` as soon as each request completes.
+
+        Arguments:
+
+            Same as ``as_anon``. Instead of ``*requests``, a single iterable of requests can be passed (e.g. ``aiogoogle.resource.Method.iter_build``).
+            Its requests are only built, authorized and sent as the results come in, so it can be as long as needed
+
+        Yields:
+
+            tuple: ``(request, response_or_exception)``. Errors are yielded, not raised
+        """
+        async for result in self.send_iter(
+            _unpack_requests(requests),
+            timeout=timeout,
+            full_res=full_res,
+            raise_for_status=raise_for_status,
+            session_factory=self.session_factory,
+            auth_manager=None
+        ):
+            yield result
+
     def _get_session(self):
         return self.session_context.get()
 
@@ -418,11 +680,44 @@ class Aiogoogle:
         self.session_context.set(session)
         return session
 
+    def _set_default_send_kwargs(self, kwargs):
+        kwargs.setdefault("stats", self.stats)
+        if self.concurrency_limiter is not None:
+            kwargs.setdefault("max_concurrency", self.concurrency_limiter)
+        if self.retry_policy is not None:
+            kwargs.setdefault("retry_policy", self.retry_policy)
+        if self.rate_limiter is not None:
+            kwargs.setdefault("rate_limiter", self.rate_limiter)
+        if self.batch_coalescer is not None:
+            kwargs.setdefault("auto_batch", self.batch_coalescer)
+        if self.single_flight is not None:
+            kwargs.setdefault("deduplicate", self.single_flight)
+        if self.cache is not None:
+            kwargs.setdefault("cache", self.cache)
+        if self.json_codec is not None:
+            kwargs.setdefault("offload_json", self.json_codec)
+        return kwargs
+
     async def send(self, *args, **kwargs):
         session = self._get_session()
         if session is None:
             session = self._set_session()
-        return await session.send(*args, **kwargs)
+        return await session.send(*args, **self._set_default_send_kwargs(kwargs))
+
+    async def send_iter(self, *args, **kwargs):
+        """
+        Same as ``send``, but yields ``(request, response_or_exception)`` as soon as each request completes
+        """
+        session = self._get_session()
+        if session is None:
+            session = self._set_session()
+        results = session.send_iter(*args, **self._set_default_send_kwargs(kwargs))
+        try:
+            async for result in results:
+                yield result
+        finally:
+            # Cancels the requests still in flight if the caller stopped iterating early
+            await results.aclose()
 
     async def __aenter__(self) -> Aiogoogle:
         session = self._get_session()
@@ -434,6 +729,9 @@ class Aiogoogle:
 
     async def __aexit__(self, *args: Any) -> None:
         session = self._get_session()
+        if self.batch_coalescer is not None:
+            # Batches still in flight need the session to complete
+            await self.batch_coalescer.aclose()
         await session.__aexit__(*args)
         # Had to add this because there's no use of keeping a closed session
         # Closed sessions cannot be reopened, so it's better to just get rid of the object
@@ -0,0 +1,161 @@
+"""
+Compiles discovery documents into a compact binary format that ``aiogoogle.resource.GoogleAPI`` loads in a fraction of the time it takes to parse the JSON.
+
+Compiled documents only keep what's needed to build and validate requests:
+human readable documentation (descriptions, enum descriptions, icons) is stripped and strings are interned.
+
+Usage::
+
+    # Compile discovery documents that are saved on disk
+    python -m aiogoogle.compiler drive_v3.json gmail_v1.json -o compiled/
+
+    # Or download them first
+    python -m aiogoogle.compiler drive:v3 gmail:v1 -o compiled/
+
+Then::
+
+    >>> with open("compiled/drive_v3.aiogoogle", "rb") as f:
+    ...     drive = GoogleAPI(f.read())
+"""
+
+__all__ = ["compile_discovery_document", "load_compiled_discovery_document", "is_compiled"]
+
+import argparse
+import asyncio
+from collections.abc import Mapping
+import io
+import json
+import os
+import pickle
+import sys
+
+MAGIC = b"AIOGOOGLE-DISCO"
+FORMAT_VERSION = 1
+_HEADER = MAGIC + bytes([FORMAT_VERSION])
+
+# Keys that only document an API. Only stripped when their value is text,
+# because they can also be the names of schema properties or parameters.
+STRIPPED_KEYS = frozenset(["description", "enumDescriptions", "enumDeprecated"])
+STRIPPED_TOP_LEVEL_KEYS = frozenset(["icons"])
+
+
+def _strip(node, intern=sys.intern):
+    if isinstance(node, Mapping):
+        return {
+            intern(k): _strip(v, intern)
+            for k, v in node.items()
+            if not (k in STRIPPED_KEYS and isinstance(v, (str, list)))
+        }
+    if isinstance(node, list):
+        return [_strip(v, intern) for v in node]
+    if isinstance(node, str):
+        return intern(node)
+    return node
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    # Compiled documents are made of dicts, lists, strings, numbers, bools and None only. Refuse anything else
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Compiled discovery documents can't reference {module}.{name}")
+
+
+def compile_discovery_document(discovery_document) -> bytes:
+    """
+    Compiles a discovery document
+
+    Arguments:
+
+        discovery_document (dict): A discovery document
+
+    Returns:
+
+        bytes: The compiled document. Pass it to ``aiogoogle.resource.GoogleAPI`` as is
+    """
+    document = {
+        k: v for k, v in _strip(discovery_document).items()
+        if k not in STRIPPED_TOP_LEVEL_KEYS
+    }
+    # Interned strings are the same objects, so pickle writes each of them once
+    return _HEADER + pickle.dumps(document, protocol=4)
+
+
+def is_compiled(data) -> bool:
+    """
+    Whether ``data`` is a compiled discovery document
+    """
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def load_compiled_discovery_document(data) -> dict:
+    """
+    Loads a compiled discovery document
+
+    Arguments:
+
+        data (bytes): Output of ``compile_discovery_document``
+
+    Returns:
+
+        dict: The discovery document, without its documentation
+
+    Raises:
+
+        ValueError: If ``data`` isn't a compiled discovery document that this version of Aiogoogle can read
+    """
+    if not is_compiled(data):
+        raise ValueError("Not a compiled discovery document")
+    version = data[len(MAGIC)]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compiled discovery document version: {version}. Recompile it")
+    try:
+        return _RestrictedUnpickler(io.BytesIO(data[len(_HEADER):])).load()
+    except (pickle.UnpicklingError, EOFError) as e:
+        raise ValueError(f"Corrupt compiled discovery document: {e}") from e
+
+
+async def _discover_all(api_ids):
+    from .client import Aiogoogle
+
+    async with Aiogoogle() as aiogoogle:
+        apis = []
+        for api_id in api_ids:
+            name, _, version = api_id.partition(":")
+            api = await aiogoogle.discover(name, version or None)
+            apis.append(api.discovery_document)
+        return apis
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m aiogoogle.compiler",
+        description="Compiles discovery documents for a faster startup",
+    )
+    parser.add_argument(
+        "sources",
+        nargs="+",
+        help='Paths of discovery documents (JSON) or IDs of APIs to download e.g. "drive:v3"',
+    )
+    parser.add_argument("-o", "--output-dir", default=".", help="Directory to write compiled documents to")
+    args = parser.parse_args(argv)
+
+    paths = [source for source in args.sources if os.path.isfile(source)]
+    api_ids = [source for source in args.sources if not os.path.isfile(source)]
+
+    documents = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            documents.append(json.load(f))
+    if api_ids:
+        documents.extend(asyncio.run(_discover_all(api_ids)))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for document in documents:
+        compiled = compile_discovery_document(document)
+        out_path = os.path.join(args.output_dir, f"{document['name']}_{document['version']}.aiogoogle")
+        with open(out_path, "wb") as f:
+            f.write(compiled)
+        print(f"{document['id']} -> {out_path} ({len(compiled)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
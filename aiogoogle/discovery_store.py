@@ -0,0 +1,231 @@
+"""
+A read-only store of discovery documents that's memory mapped, so that many processes on the same host
+share one copy of the documents (the OS's page cache) instead of each holding its own.
+
+Every large enough JSON object of a document is stored as a node of its own, and is only decoded
+(into the memory of the process) once it's looked up. e.g. a ``GoogleAPI`` built from the store
+only decodes the resources, methods and schemas it's used with.
+
+Usage::
+
+    >>> build_discovery_store("apis.store", [drive_discovery_document, gmail_discovery_document])
+
+    >>> store = DiscoveryStore("apis.store")  # In every worker
+    >>> drive = store.google_api("drive:v3")
+"""
+
+__all__ = ["DiscoveryStore", "MappedNode", "build_discovery_store"]
+
+from collections.abc import Mapping, MutableMapping
+import json
+import mmap
+import os
+import struct
+
+from .compiler import _strip
+
+MAGIC = b"AIOGOOGLE-STORE"
+FORMAT_VERSION = 1
+# Magic, format version, offset and length of the index node
+_HEADER = struct.Struct(f"<{len(MAGIC)}sBQQ")
+# Key of the JSON objects that stand for nodes stored elsewhere in the file
+_REF = "\x00ref"
+
+
+def _to_builtin(value):
+    if isinstance(value, Mapping):
+        return {k: _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_builtin(v) for v in value]
+    return value
+
+
+class _Writer:
+    def __init__(self, f, min_node_size):
+        self.f = f
+        self.min_node_size = min_node_size
+
+    def write_node(self, encoded):
+        offset = self.f.tell()
+        self.f.write(encoded)
+        return {_REF: [offset, len(encoded)]}
+
+    def encode(self, value):
+        """
+        Returns ``value`` with its large objects replaced by references to the nodes they were written to
+        """
+        if isinstance(value, dict):
+            node = {k: self.encode(v) for k, v in value.items()}
+            encoded = json.dumps(node, separators=(",", ":")).encode("utf-8")
+            if len(encoded) >= self.min_node_size:
+                return self.write_node(encoded)
+            return node
+        if isinstance(value, list):
+            return [self.encode(v) for v in value]
+        return value
+
+
+def build_discovery_store(path, discovery_documents, strip_documentation=True, min_node_size=512):
+    """
+    Writes discovery documents to a store file
+
+    Arguments:
+
+        path (str): Path of the file to write. Replaced atomically if it exists
+
+        discovery_documents (Iterable[dict]): Discovery documents
+
+        strip_documentation (bool): Leave descriptions, enum descriptions and icons out. See ``aiogoogle.compiler``
+
+        min_node_size (int): JSON objects smaller than this many bytes are stored inline, in their parent's node
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"\x00" * _HEADER.size)
+        writer = _Writer(f, min_node_size)
+        index = {}
+        for document in discovery_documents:
+            document = _to_builtin(document)
+            if strip_documentation:
+                document = _strip(document, intern=lambda s: s)
+                document.pop("icons", None)
+            index[document["id"]] = writer.write_node(
+                json.dumps(
+                    {k: writer.encode(v) for k, v in document.items()}, separators=(",", ":")
+                ).encode("utf-8")
+            )[_REF]
+        index_offset, index_length = writer.write_node(json.dumps(index).encode("utf-8"))[_REF]
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, index_offset, index_length))
+    os.replace(tmp_path, path)
+
+
+class MappedNode(MutableMapping):
+    """
+    A JSON object of a ``DiscoveryStore``. Decoded the first time it's accessed.
+
+    Nested objects that are stored as nodes of their own are returned as new ``MappedNode`` objects every time they're looked up,
+    so that a node doesn't keep its children in memory once they aren't used anymore.
+
+    Note:
+
+        The store is read-only. Changes made to a node only affect that instance.
+    """
+
+    __slots__ = ("_buffer", "_offset", "_length", "_items")
+
+    def __init__(self, buffer, offset, length):
+        self._buffer = buffer
+        self._offset = offset
+        self._length = length
+        self._items = None
+
+    def _resolve(self, value):
+        if isinstance(value, dict):
+            ref = value.get(_REF)
+            if ref is not None:
+                return MappedNode(self._buffer, *ref)
+            return {k: self._resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(v) for v in value]
+        return value
+
+    @property
+    def _decoded(self):
+        if self._items is None:
+            raw = json.loads(self._buffer[self._offset:self._offset + self._length])
+            # Direct children that are nodes of their own are kept as references until they're looked up
+            self._items = {k: v if isinstance(v, dict) and _REF in v else self._resolve(v) for k, v in raw.items()}
+        return self._items
+
+    def __getitem__(self, key):
+        value = self._decoded[key]
+        if isinstance(value, dict) and _REF in value:
+            return MappedNode(self._buffer, *value[_REF])
+        return value
+
+    def __setitem__(self, key, value):
+        self._decoded[key] = value
+
+    def __delitem__(self, key):
+        del self._decoded[key]
+
+    def __iter__(self):
+        return iter(self._decoded)
+
+    def __len__(self):
+        return len(self._decoded)
+
+    def to_dict(self) -> dict:
+        """
+        Returns a deep copy of this node made of builtin types only
+        """
+        return _to_builtin(self)
+
+    def __deepcopy__(self, memo):
+        return self.to_dict()
+
+    def __reduce__(self):
+        return dict, (self.to_dict(),)
+
+    def __repr__(self):
+        state = "decoded" if self._items is not None else "not decoded"
+        return f"MappedNode({self._length} bytes, {state})"
+
+
+class DiscoveryStore(Mapping):
+    """
+    Memory maps a store written by ``build_discovery_store``. Maps API IDs (e.g. "drive:v3") to discovery documents (``MappedNode``)
+
+    Arguments:
+
+        path (str): Path of the store
+
+    Raises:
+
+        ValueError: If the file isn't a store this version of Aiogoogle can read
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError(f"{path} isn't a discovery store")
+        magic, version, index_offset, index_length = _HEADER.unpack(self._buffer[:_HEADER.size])
+        if magic != MAGIC:
+            raise ValueError(f"{path} isn't a discovery store")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported discovery store version: {version}. Rebuild {path}")
+        self._index = json.loads(self._buffer[index_offset:index_offset + index_length])
+
+    def __getitem__(self, api_id):
+        return MappedNode(self._buffer, *self._index[api_id])
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def google_api(self, api_id, validate=False, maximize_page_size=False):
+        """
+        Returns a ``aiogoogle.resource.GoogleAPI`` backed by the store
+
+        Arguments:
+
+            api_id (str): e.g. "drive:v3"
+
+            validate (bool): Same as ``aiogoogle.resource.GoogleAPI``'s ``validate``
+
+            maximize_page_size (bool): Same as ``aiogoogle.resource.GoogleAPI``'s ``maximize_page_size``
+        """
+        from .resource import GoogleAPI
+
+        return GoogleAPI(self[api_id], validate, maximize_page_size)
+
+    def close(self):
+        self._buffer.close()
+
+    def __repr__(self):
+        return f"DiscoveryStore({self.path!r}, apis={list(self._index)})"
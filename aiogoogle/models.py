@@ -1,11 +1,18 @@
 from urllib.parse import urlparse, urlunparse, urlencode, parse_qs
-from typing import Any, AsyncIterable, Callable, Optional
+from typing import Any, AsyncIterable, Callable, List, Optional
+import asyncio
+import json as _json
 import pprint
+import re
+import uuid
 
 from .excs import HTTPError, AuthError, ValidationError
+from .checkpoints import _Checkpointer, _checkpoint_key
 
 DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 DEFAULT_UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Google doesn't accept more than this many requests in a single batch request
+MAX_BATCH_SIZE = 100
 
 
 class ResumableUpload:
@@ -175,6 +182,14 @@ class Request:
         _verify_ssl (boolean): Defaults to True.
 
         upload_file_content_type (str): Optional content-type header string. In case you don't want to use the default application/octet-stream (Or whatever is auto-detected by your transport handler)
+
+        api_id (str): ID of the API this request was built from. e.g. "drive:v3"
+
+        method_id (str): ID of the method this request was built from. e.g. "drive.files.list"
+
+        items_key (str): Property of the responses that holds the items of a page e.g. "files". See ``aiogoogle.models.Response.items``
+
+        batch (list): Requests packed in this request, if it's a batch request. See ``Request.batch_requests``
         
         """
 
@@ -192,6 +207,10 @@ class Request:
         callback: Optional[Callable] = None,
         _verify_ssl: bool = True,
         upload_file_content_type: Optional[str] = None,
+        api_id: Optional[str] = None,
+        method_id: Optional[str] = None,
+        batch: Optional[List["Request"]] = None,
+        items_key: Optional[str] = None,
     ):
         self.method = method
         self.url = url
@@ -205,6 +224,10 @@ class Request:
         self.callback = callback
         self._verify_ssl = _verify_ssl
         self.upload_file_content_type = upload_file_content_type
+        self.api_id = api_id
+        self.method_id = method_id
+        self.batch = batch
+        self.items_key = items_key
 
     def _add_query_param(self, query: dict):
         url = self.url
@@ -225,20 +248,116 @@ class Request:
         u = u._replace(query=urlencode(query, True))
         self.url = urlunparse(u)
 
+    def _set_page_token(self, token, req_token_name, json_req):
+        if json_req:
+            self.json[req_token_name] = token
+        else:
+            self._rm_query_param(req_token_name)
+            self._add_query_param({req_token_name: token})
+
+    def _get_page_token(self, req_token_name, json_req):
+        if json_req:
+            return (self.json or {}).get(req_token_name)
+        values = parse_qs(urlparse(self.url).query).get(req_token_name)
+        return values[-1] if values else None
+
+    def _without_page_token(self, req_token_name, json_req):
+        """
+        Returns the URL and the JSON body of this request, without the page token
+        """
+        url = self.url
+        body = self.json
+        if json_req:
+            body = {k: v for k, v in (body or {}).items() if k != req_token_name}
+        elif self._get_page_token(req_token_name, json_req) is not None:
+            u = urlparse(url)
+            query = parse_qs(u.query)
+            query.pop(req_token_name, None)
+            url = urlunparse(u._replace(query=urlencode(query, True)))
+        return url, body
+
+    def _is_batchable(self):
+        return self.batch_url is not None and self.media_upload is None and self.media_download is None
+
+    def _to_http(self) -> bytes:
+        """
+        Serializes this request as an ``application/http`` part of a batch request
+        """
+        url = urlparse(self.url)
+        path = urlunparse(("", "", url.path, url.params, url.query, ""))
+        headers = dict(self.headers)
+        if self.json is not None:
+            body = _json.dumps(self.json).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json; charset=UTF-8")
+        elif isinstance(self.data, dict):
+            body = urlencode(self.data).encode("utf-8")
+            headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+        elif isinstance(self.data, str):
+            body = self.data.encode("utf-8")
+        else:
+            body = self.data or b""
+        lines = [f"{(self.method or 'GET').upper()} {path} HTTP/1.1"]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + body
+
     @classmethod
     def batch_requests(cls, *requests):
         """
         Given many requests, will create a batch request per https://developers.google.com/discovery/v1/batch
 
+        The requests are packed in the body of a single ``multipart/mixed`` POST request to their ``batch_url``.
+        Use ``Response.unbatch`` on the response to get a response per request.
+
         Arguments:
 
-            *requests (aiogoogle.models.Request): Request objects
+            *requests (aiogoogle.models.Request): Request objects. They must all share the same ``batch_url`` and not upload or download media
 
         Returns:
 
             aiogoogle.models.Request:
+
+        Raises:
+
+            ValueError: If the requests can't be sent in a single batch
         """
-        raise NotImplementedError
+        if not requests:
+            raise ValueError("Pass at least one request to batch")
+        if len(requests) > MAX_BATCH_SIZE:
+            raise ValueError(f"A batch request can't have more than {MAX_BATCH_SIZE} requests. Got {len(requests)}")
+        if any(request.media_upload is not None or request.media_download is not None for request in requests):
+            raise ValueError("Requests that upload or download media can't be batched")
+        batch_urls = {request.batch_url for request in requests}
+        if None in batch_urls or len(batch_urls) != 1:
+            raise ValueError("All batched requests should have the same batch_url")
+
+        boundary = f"batch_{uuid.uuid4().hex}"
+        body = b""
+        for i, request in enumerate(requests):
+            body += (
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item{i}>\r\n\r\n"
+            ).encode("utf-8")
+            body += request._to_http() + b"\r\n"
+        body += f"--{boundary}--\r\n".encode("utf-8")
+
+        headers = {"Content-Type": f"multipart/mixed; boundary={boundary}"}
+        # Inner requests are authorized individually, but Google expects the outer request to be authorized as well.
+        authorizations = {request.headers.get("Authorization") for request in requests}
+        if len(authorizations) == 1 and None not in authorizations:
+            headers["Authorization"] = authorizations.pop()
+
+        timeouts = [request.timeout for request in requests]
+        return cls(
+            method="POST",
+            url=requests[0].batch_url,
+            headers=headers,
+            data=body,
+            timeout=None if None in timeouts else max(timeouts),
+            _verify_ssl=all(request._verify_ssl for request in requests),
+            api_id=requests[0].api_id,
+            batch=list(requests),
+        )
 
     @classmethod
     def from_response(cls, response):
@@ -283,6 +402,12 @@ class Response:
         auth_manager (aiogoogle.auth.managers.ServiceAccountManager): Service account authorization manager.
 
         user_creds (aiogoogle.auth.creds.UserCreds): user_creds to make an api call with.
+
+        session (aiogoogle.sessions.abc.AbstractSession): The session that sent the request of this response. Reused to fetch the next pages if it's still open.
+
+        send_kwargs (dict): Extra keyword arguments the request was sent with. Passed again to the session when requesting the next pages.
+
+        prefetch (int): Number of pages ``async for page in response`` fetches ahead of the one being consumed. See ``__call__``
     """
 
     def __init__(
@@ -300,7 +425,10 @@ class Response:
         pipe_from=None,
         session_factory=None,
         auth_manager=None,
-        user_creds=None
+        user_creds=None,
+        session=None,
+        send_kwargs=None,
+        prefetch=0,
     ):
         if json and data:
             raise TypeError("Pass either json or data, not both.")
@@ -320,35 +448,58 @@ class Response:
         self.auth_manager = auth_manager
         # Used for refreshing tokens for the Oauth2 authentication workflow.
         self.user_creds = user_creds
+        self.session = session
+        self.send_kwargs = send_kwargs or {}
+        self.prefetch = prefetch
 
     @staticmethod
-    async def _next_page_generator(
+    async def _iter_pages(
         prev_res,
         session_factory,
         req_token_name=None,
         res_token_name=None,
         json_req=False,
+        resume_token=None,
     ):
+        """
+        Yields this response and the responses of the next pages.
+        Given a ``resume_token``, skips this response and carries on from the page of that token instead
+        """
         from .auth.managers import ServiceAccountManager, Oauth2Manager
-        prev_url = None
-        while prev_res is not None:
-
-            # Avoid infinite looping if google sent the same token twice
-            if prev_url == prev_res.req.url:
-                break
-            prev_url = prev_res.req.url
 
-            # yield
-            yield prev_res.content
+        # Reuse the session that sent the first page (e.g. the active session of an ``Aiogoogle`` context) as long as it's open.
+        # Otherwise, open one session and share its connection pool between all of the remaining pages.
+        sess = prev_res.session
+        owned_sess = None
+        prev_url = None
+        try:
+            while prev_res is not None:
+
+                # Avoid infinite looping if google sent the same token twice
+                if prev_url == prev_res.req.url:
+                    break
+                prev_url = prev_res.req.url
+
+                if resume_token is None:
+                    # yield
+                    yield prev_res
+
+                    # get request for next page
+                    next_req = prev_res.next_page(
+                        req_token_name=req_token_name,
+                        res_token_name=res_token_name,
+                        json_req=json_req,
+                    )
+                else:
+                    # This page was processed before the scan was interrupted
+                    next_req = prev_res.req
+                    next_req._set_page_token(resume_token, req_token_name or "pageToken", json_req)
+                    resume_token = None
+                if next_req is not None:
+                    if sess is None or getattr(sess, "closed", False):
+                        owned_sess = sess = session_factory()
+                        await owned_sess.__aenter__()
 
-            # get request for next page
-            next_req = prev_res.next_page(
-                req_token_name=req_token_name,
-                res_token_name=res_token_name,
-                json_req=json_req,
-            )
-            if next_req is not None:
-                async with session_factory() as sess:
                     user_creds = None
 
                     if isinstance(prev_res.auth_manager, (ServiceAccountManager, Oauth2Manager)):
@@ -364,9 +515,112 @@ class Response:
                             if is_refreshed and user_creds:
                                 prev_res.auth_manager.authorize(next_req, user_creds=user_creds)
 
-                    prev_res = await sess.send(next_req, full_res=True, auth_manager=prev_res.auth_manager, user_creds=user_creds)
+                    send_kwargs = prev_res.send_kwargs
+                    prev_res = await sess.send(
+                        next_req,
+                        full_res=True,
+                        auth_manager=prev_res.auth_manager,
+                        user_creds=user_creds,
+                        **send_kwargs,
+                    )
+                    if send_kwargs.get("stats") is not None:
+                        send_kwargs["stats"].pages_fetched += 1
+                else:
+                    prev_res = None
+        finally:
+            if owned_sess is not None:
+                await owned_sess.__aexit__(None, None, None)
+
+    @staticmethod
+    async def _next_page_generator(
+        prev_res,
+        session_factory,
+        req_token_name=None,
+        res_token_name=None,
+        json_req=False,
+        prefetch=0,
+        checkpoint_store=None,
+        checkpoint_key=None,
+        items_key=None,
+    ):
+        checkpointer = None
+        resume_token = None
+        if checkpoint_store is not None:
+            req_token_name = req_token_name or "pageToken"
+            res_token_name = res_token_name or "nextPageToken"
+            items_key = items_key or getattr(prev_res.req, "items_key", None)
+            url, body = prev_res.req._without_page_token(req_token_name, json_req)
+            checkpointer = _Checkpointer(
+                checkpoint_store,
+                checkpoint_key or _checkpoint_key(
+                    prev_res.req.method, url, body, "Authorization" in prev_res.req.headers, prev_res.user_creds, prev_res.auth_manager
+                ),
+                prev_res.req.method,
+                url,
+                body,
+            )
+            resume_token = await checkpointer.load()
+            if resume_token is not None and resume_token == prev_res.req._get_page_token(req_token_name, json_req):
+                # The scan was resumed by sending the request of the checkpointed page already
+                resume_token = None
+
+        def progress_of(content):
+            # The token of the next page and the number of items of a page, read before the consumer gets to modify the page
+            if not isinstance(content, dict):
+                return None, 0
+            return content.get(res_token_name), len(content.get(items_key) or ()) if items_key else 0
+
+        pages = Response._iter_pages(prev_res, session_factory, req_token_name, res_token_name, json_req, resume_token)
+        if not prefetch:
+            try:
+                async for res in pages:
+                    content = res.content
+                    if checkpointer is None:
+                        yield content
+                        continue
+                    next_page_token, items = progress_of(content)
+                    yield content
+                    # The consumer asked for the next page, so it's done with this one
+                    await checkpointer.commit(next_page_token, items)
+            finally:
+                await pages.aclose()
+            return
+
+        # Pages are fetched by a task of their own, which requests the next page as soon as the previous one arrives
+        # and waits once ``prefetch`` pages are waiting to be consumed
+        buffer = asyncio.Queue(maxsize=prefetch)
+
+        async def fetch_pages():
+            try:
+                async for res in pages:
+                    await buffer.put((res, None))
+            except Exception as e:
+                await buffer.put((None, e))
             else:
-                prev_res = None
+                await buffer.put((None, None))
+            finally:
+                await pages.aclose()
+
+        fetcher = asyncio.ensure_future(fetch_pages())
+        try:
+            while True:
+                res, exc = await buffer.get()
+                if exc is not None:
+                    raise exc
+                if res is None:
+                    break
+                content = res.content
+                if checkpointer is None:
+                    yield content
+                    continue
+                next_page_token, items = progress_of(content)
+                yield content
+                await checkpointer.commit(next_page_token, items)
+        finally:
+            if not fetcher.done():
+                fetcher.cancel()
+            # Wait for the fetcher to close the session it might have opened
+            await asyncio.wait([fetcher])
 
     def __call__(
         self,
@@ -374,6 +628,9 @@ class Response:
         req_token_name=None,
         res_token_name=None,
         json_req=False,
+        prefetch=None,
+        checkpoint_store=None,
+        checkpoint_key=None,
     ):
         """
         Returns a generator that yields the contents of the next pages if any (and this page as well)
@@ -396,24 +653,125 @@ class Response:
 
             json_req (dict): Normally, nextPageTokens should be sent in URL query params. If you want it in A json body, set this to True
 
+            prefetch (int):
+
+                * Number of pages to fetch ahead of the one being consumed, so that the next page downloads while the current one is processed
+
+                * Up to this many pages are kept in memory besides the current one. Requires an asyncio based session
+
+                * Default: ``self.prefetch`` (0, i.e. the next page is only requested once the current one is consumed)
+
+            checkpoint_store (aiogoogle.checkpoints.AbstractCheckpointStore):
+
+                * Store to checkpoint the scan to once each page is consumed (i.e. once the next page is asked for). See ``aiogoogle.checkpoints``
+
+                * If the store holds a checkpoint of the same scan, the scan resumes from it: the pages before it are skipped
+
+                * The checkpoint is deleted once the last page is consumed
+
+            checkpoint_key (str):
+
+                * Key of the checkpoints of this scan. Defaults to a digest of the HTTP method, URL and JSON body of the request (without the page token) and of who sends it
+
+                * Who sends it is the user of ``user_creds`` (by the subject of their ID token, or their refresh token) or the service account. Required for requests authorized any other way
+
         Returns:
 
             async generator: self._next_page_generator (staticmethod)
         """
         if session_factory is None:
             session_factory = self.session_factory
+        if prefetch is None:
+            prefetch = self.prefetch
+        if prefetch < 0:
+            raise ValueError("prefetch can't be negative")
         return self._next_page_generator(
-            self, session_factory, req_token_name, res_token_name, json_req
+            self, session_factory, req_token_name, res_token_name, json_req, prefetch, checkpoint_store, checkpoint_key
         )
 
     def __aiter__(self):
-        return self._next_page_generator(self, self.session_factory)
+        return self._next_page_generator(self, self.session_factory, prefetch=self.prefetch)
 
     def __iter__(self):
         raise TypeError(
             'You probably forgot to use an "async for" statement instead of just a "for" statement.'
         )
 
+    async def items(
+        self,
+        key=None,
+        session_factory=None,
+        req_token_name=None,
+        res_token_name=None,
+        json_req=False,
+        prefetch=None,
+        checkpoint_store=None,
+        checkpoint_key=None,
+    ):
+        """
+        Async generator that yields the items of this page and of the next pages, one by one
+
+        e.g. ::
+
+            >>> async for file in res.items():
+            ...     print(file["name"])
+
+        Items of the next pages are removed from their page as they're yielded, so that memory is released as soon as they're consumed.
+        The items of this (first) page are left as they are.
+
+        Arguments:
+
+            key (str):
+
+                * Property of each page that holds its items e.g. "files"
+
+                * Default: ``self.req.items_key`` (inferred from the response schema of the method the request was built with),
+                  or the only property of this page that's a list
+
+            prefetch (int): Number of pages to fetch ahead. The pages waiting to be consumed apply backpressure, see ``__call__``
+
+            checkpoint_store (aiogoogle.checkpoints.AbstractCheckpointStore): Checkpoint the scan once all the items of each page are consumed, see ``__call__``.
+            Checkpoints also count the items emitted so far
+
+            Other arguments: See ``__call__``
+
+        Raises:
+
+            ValueError: If ``key`` isn't passed and can't be inferred
+        """
+        if key is None:
+            key = getattr(self.req, "items_key", None)
+        if key is None and isinstance(self.json, dict):
+            lists = [k for k, v in self.json.items() if isinstance(v, list)]
+            if len(lists) == 1:
+                key = lists[0]
+        if key is None:
+            raise ValueError("Couldn't tell which property of the response holds its items. Pass a key")
+
+        if session_factory is None:
+            session_factory = self.session_factory
+        if prefetch is None:
+            prefetch = self.prefetch
+        if prefetch < 0:
+            raise ValueError("prefetch can't be negative")
+        pages = self._next_page_generator(
+            self, session_factory, req_token_name, res_token_name, json_req, prefetch, checkpoint_store, checkpoint_key, key
+        )
+        try:
+            async for page in pages:
+                if not isinstance(page, dict):
+                    continue
+                if page is self.json:
+                    for item in page.get(key) or ():
+                        yield item
+                    continue
+                items = page.pop(key, None) or []
+                items.reverse()
+                while items:
+                    yield items.pop()
+        finally:
+            await pages.aclose()
+
     @property
     def content(self):
         """
@@ -458,13 +816,80 @@ class Response:
             return None
         # request = Request.from_response(self)
         request = self.req
-        if json_req:
-            request.json[req_token_name] = res_token
-        else:
-            request._rm_query_param(req_token_name)
-            request._add_query_param({req_token_name: res_token})
+        request._set_page_token(res_token, req_token_name, json_req)
         return request
 
+    def unbatch(self) -> List["Response"]:
+        """
+        Splits the response of a batch request into a response per batched request.
+
+        Each response has its own status code, headers and content.
+        Errors of individual requests are not raised, call ``raise_for_status`` on each response to do so.
+
+        Returns:
+
+            list: ``aiogoogle.models.Response`` objects in the same order as ``self.req.batch``
+
+        Raises:
+
+            ValueError: If this isn't a valid response to a batch request
+        """
+        if self.req is None or self.req.batch is None:
+            raise ValueError("This isn't the response of a batch request")
+        content_type = (self.headers or {}).get("Content-Type", "")
+        boundary = re.search(r'boundary="?([^";]+)"?', content_type)
+        if boundary is None:
+            raise ValueError(f"Expected a multipart response to a batch request. Got: {content_type}")
+        body = self.data.decode("utf-8") if isinstance(self.data, bytes) else (self.data or "")
+
+        responses = [None] * len(self.req.batch)
+        parts = body.replace("\r\n", "\n").split(f"--{boundary.group(1)}")[1:]
+        for position, part in enumerate(parts):
+            if part.startswith("--"):
+                break
+            part_headers, _, http_response = part.lstrip("\n").partition("\n\n")
+            content_id = re.search(r"Content-ID:\s*<response-item(\d+)>", part_headers, re.IGNORECASE)
+            i = int(content_id.group(1)) if content_id is not None else position
+            if i >= len(responses):
+                raise ValueError(f"Unexpected part in the response of a batch request: {part_headers}")
+            responses[i] = self._parse_batch_part(http_response, self.req.batch[i])
+
+        if None in responses:
+            raise ValueError("The response of a batch request is missing some parts")
+        return responses
+
+    def _parse_batch_part(self, http_response, request):
+        head, _, body = http_response.partition("\n\n")
+        status_line, *header_lines = head.split("\n")
+        _, status_code, reason = (status_line.split(" ", 2) + [""])[:3]
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip()] = value.strip()
+
+        json = None
+        data = None
+        body = body.rstrip("\n")
+        if body:
+            try:
+                json = _json.loads(body)
+            except ValueError:
+                data = body
+        return Response(
+            status_code=int(status_code),
+            headers=headers,
+            url=request.url,
+            json=json,
+            data=data,
+            reason=reason,
+            req=request,
+            session_factory=self.session_factory,
+            auth_manager=self.auth_manager,
+            user_creds=self.user_creds,
+            session=self.session,
+            send_kwargs=self.send_kwargs,
+        )
+
     @property
     def error_msg(self):
         if self.json is not None and self.json.get("error") is not None:
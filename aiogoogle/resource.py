@@ -3,13 +3,13 @@ __all__ = ["GoogleAPI", "Resource", "Method"]
 import re
 import warnings
 from urllib.parse import urlencode, quote
-from functools import wraps
-from typing import List, Generic, TypeVar
+from typing import List, Generic, Optional, TypeVar
 
 from .excs import ValidationError
 from .utils import _safe_getitem
 from .models import MediaDownload, MediaUpload, ResumableUpload, Request
-from .validate import validate as validate_
+from .validate import SchemaValidator, ValidationPolicy
+from .compiler import is_compiled, load_compiled_discovery_document
 
 
 T = TypeVar("T")  # Generic type var
@@ -26,6 +26,7 @@ RESERVED_KEYWORDS = [
     "download_file",
     "pipe_to",
     "timeout",
+    "maximize_page_size",
 ]
 
 # From: https://github.com/googleapis/google-api-python-client/blob/master/googleapiclient/discovery.py
@@ -33,6 +34,8 @@ RESERVED_KEYWORDS = [
 STACK_QUERY_PARAMETERS = frozenset(["trace", "pp", "strict"])
 STACK_QUERY_PARAMETER_DEFAULT_VALUE = {"type": "string", "location": "query"}
 MEDIA_SIZE_BIT_SHIFTS = {"KB": 10, "MB": 20, "GB": 30, "TB": 40}
+# Names of the query parameters that set the number of items per page, in order of preference
+PAGE_SIZE_PARAMETERS = ("pageSize", "maxResults", "max-results", "maxPageSize")
 
 # TODO: etagRequired: {
 #    should be type: "boolean",  # noqa: F821 (weird error)
@@ -41,72 +44,194 @@ MEDIA_SIZE_BIT_SHIFTS = {"KB": 10, "MB": 20, "GB": 30, "TB": 40}
 # NOTE: etagRequired is only mentioned once in all of the discovery documents available from Google. (In discovery_service-v1. So, it isn't actually being used)
 
 
-def _temporarily_add_back_dashes_to_param_definitions(f):
+# Keyword arguments of Method.__call__ that aren't URI parameters
+_CALL_OPTIONS = frozenset(RESERVED_KEYWORDS + ["path_params_safe_chars"])
+
+# Named path placeholders. e.g. "{+resourceName}"
+_PATH_PLACEHOLDER = re.compile(r"\{(.*?)\}")
+
+
+def _page_size_of(parameters):
+    """
+    Returns ``(name, maximum)`` of the page size parameter of a paginated method (i.e. one that takes a "pageToken"),
+    if it declares a maximum. None otherwise
     """
-        When instantiating a Method, Method's constructor will remove all
-        dashes from the names of its URI params and global params in order
-        to make it possible to pass uri params through function calls
-        e.g. this is viable get_videos(my_videos=True)
-        this is will fail get_videos(my-videos=True)
-
-        This function momentarily adds back '-' to url parameters and passed uri_params
-        in order to be processed and validated correctly and comply with the disc doc
-        Reverts back to '_' after wrapped function is done
+    if "pageToken" not in parameters:
+        return None
+    for name in PAGE_SIZE_PARAMETERS:
+        schema = parameters.get(name)
+        if not schema or schema.get("location") != "query" or schema.get("type") != "integer":
+            continue
+        try:
+            maximum = int(schema["maximum"])
+            minimum = int(schema.get("minimum", maximum))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if minimum <= maximum:
+            return name, maximum
+    return None
+
+
+def _body_of(options):
+    # json or data or None
+    json = options.get("json")
+    if json is not None:
+        return json
+    return options.get("data")
+
+
+class _RequestBuilder:
     """
+    Everything ``Method.__call__`` needs to know about the parameters and the path of a method,
+    computed once per method instead of on every call.
 
-    @wraps(f)
-    def wrapper(
-        self,
-        validate=None,
-        data=None,
-        json=None,
-        upload_file=None,
-        pipe_from=None,
-        download_file=None,
-        pipe_to=None,
-        timeout=None,
-        **uri_params,
-    ):
-        # unfix urls
-        uri_params = self._replace_dashes_with_underscores_in_user_provided_params(
-            uri_params, self.parameters
-        )
+    Parameters are keyed by the names they have in the discovery document (dashes included).
+    Nothing in the discovery document is modified, so methods can build requests concurrently
 
-        # unfix params
-        self._method_specs["parameters"] = self._restore_dashes_to_params(
-            self._method_specs.get("parameters")
-        )
-        self._global_parameters = self._restore_dashes_to_params(
-            self._global_parameters
-        )
+    Arguments:
 
-        # Run function
-        results = f(
-            self,
-            validate,
-            data,
-            json,
-            upload_file,
-            pipe_from,
-            download_file,
-            pipe_to,
-            timeout,
-            **uri_params,
-        )
+        method_specs (dict): Specs of the method
 
-        # fix params again
-        self._method_specs[
-            "parameters"
-        ] = self._replace_dashes_with_underscores_in_params(
-            self._method_specs.get("parameters")
+        global_parameters (dict): Parameters that all methods of the API accept
+    """
+
+    __slots__ = (
+        "parameters",
+        "query_parameters",
+        "required_query_parameters",
+        "path_parameters",
+        "path_parameter_order",
+        "path_template",
+        "additional_properties",
+        "aliases",
+        "page_size",
+    )
+
+    def __init__(self, method_specs, global_parameters):
+        if not global_parameters:
+            parameters = method_specs.get("parameters") or {}
+        elif not method_specs.get("parameters"):
+            parameters = global_parameters
+        else:
+            parameters = {**method_specs["parameters"], **global_parameters}
+        self.parameters = parameters
+        self.query_parameters = frozenset(
+            name for name, schema in parameters.items() if schema.get("location") == "query"
+        )
+        # A tuple to report missing parameters in the same order every time
+        self.required_query_parameters = tuple(
+            name
+            for name, schema in parameters.items()
+            if schema.get("location") == "query" and schema.get("required") is True
         )
-        self._global_parameters = self._replace_dashes_with_underscores_in_params(
-            self._global_parameters
+        self.path_parameters = frozenset(
+            name for name, schema in parameters.items() if schema.get("location") == "path"
         )
+        path = method_specs.get("path")
+        if self.path_parameters:
+            self.path_parameter_order = tuple(method_specs.get("parameterOrder") or ())
+            # replace named placeholders with empty ones. e.g. {param} --> {}
+            # Why? Because some endpoints have different names in their url path placeholders than in their parameter defenitions
+            # e.g. path: {"v1/{+resourceName}/connections"}. e.g. param name: resourceName NOT +resourceName
+            self.path_template = _PATH_PLACEHOLDER.sub("{}", path)
+        else:
+            self.path_parameter_order = ()
+            self.path_template = path
+        self.additional_properties = parameters.get("additionalProperties")
+        # Parameters with a "-" in their names are passed with "_"s instead. e.g. get_videos(my_videos=True) for "my-videos"
+        self.aliases = {
+            name.replace("-", "_"): name for name in parameters if "-" in name
+        }
+        self.page_size = _page_size_of(parameters)
 
-        return results
 
-    return wrapper
+def _infer_items_key(response, schemas):
+    """
+    Returns the name of the array property that holds the items of a response: its only array property, or "items" if it has more than one
+    """
+    if not response:
+        return None
+    if response.get("$ref"):
+        response = (schemas or {}).get(response["$ref"]) or {}
+    arrays = [
+        name
+        for name, schema in (response.get("properties") or {}).items()
+        if schema.get("type") == "array"
+    ]
+    if len(arrays) == 1:
+        return arrays[0]
+    if "items" in arrays:
+        return "items"
+    return None
+
+
+# Properties of paginated responses that partial response masks should always keep
+PAGE_TOKEN_FIELDS = ("nextPageToken", "pageToken")
+
+
+def _split_fields(mask):
+    """
+    Splits a partial response mask on the commas that aren't nested in parentheses. e.g. "a,b(c,d)" --> ["a", "b(c,d)"]
+    """
+    fields = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(mask):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                raise ValidationError(f'Unbalanced parentheses in fields: "{mask}"')
+        elif char == "," and depth == 0:
+            fields.append(mask[start:i].strip())
+            start = i + 1
+    if depth != 0:
+        raise ValidationError(f'Unbalanced parentheses in fields: "{mask}"')
+    fields.append(mask[start:].strip())
+    return fields
+
+
+def _check_fields(mask, schema, schemas, schema_name):
+    """
+    Raises a ValidationError if a partial response mask selects a field that ``schema`` doesn't have
+    """
+    for field in _split_fields(mask):
+        if not field:
+            raise ValidationError(f'Empty field in "{mask}"')
+        if field.endswith(")"):
+            path, _, nested = field[:-1].partition("(")
+            _check_fields(nested, _resolve_field(path.strip(), schema, schemas, schema_name), schemas, schema_name)
+        else:
+            _resolve_field(field, schema, schemas, schema_name)
+
+
+def _resolve_field(path, schema, schemas, schema_name):
+    """
+    Returns the schema of the field a path (e.g. "owners/emailAddress") selects. Arrays select the fields of their items
+    """
+    for name in path.split("/"):
+        while True:
+            if schema.get("$ref"):
+                schema = (schemas or {}).get(schema["$ref"]) or {}
+            elif schema.get("type") == "array" and schema.get("items"):
+                schema = schema["items"]
+            else:
+                break
+        if name == "*":
+            return {}
+        properties = schema.get("properties")
+        if properties and name in properties:
+            schema = properties[name]
+        elif schema.get("additionalProperties"):
+            # Maps can have any key
+            schema = schema["additionalProperties"]
+        elif schema.get("type") == "any" or (not properties and schema.get("type") in (None, "object")):
+            # Nothing to check against
+            return {}
+        else:
+            raise ValidationError(f'"{path}" is not a field of {schema_name}')
+    return schema
 
 
 class Method:
@@ -120,16 +245,16 @@ class Method:
         service_path,
         batch_path,
         validate,
+        api_id=None,
+        schema_validator=None,
+        maximize_page_size=False,
     ):
-        # Replaces '-'s with '_'s and preserve old names to revert back to them after this method is called
-        global_parameters = self._replace_dashes_with_underscores_in_params(
-            global_parameters
-        )
-        method_specs["parameters"] = self._replace_dashes_with_underscores_in_params(
-            method_specs.get("parameters")
-        )
+        self._request_builder = None
+        # Shared by all methods of an API, so that each schema is only compiled once
+        self._schema_validator = schema_validator or SchemaValidator(schemas)
 
         self.name = name
+        self.api_id = api_id
         self._method_specs = method_specs
         self._global_parameters = global_parameters
         self._schemas = schemas
@@ -150,41 +275,8 @@ class Method:
         self._batch_url = self._root_url + self._batch_path
 
         self._should_validate = validate
-
-    # ---- Changes URL parameters with a "-" to "_" -----#
-    # Depends on how you view it, but this section also changes robots with small mouths to robots with big mouths
-
-    @staticmethod
-    def _replace_dashes_with_underscores_in_params(param_set: Generic[T]) -> T:
-        if param_set:
-            for name, schema in list(param_set.items()):
-                if "-" in name:
-                    new_name = name.replace("-", "_")  # See?!
-                    schema["orig_name"] = name
-                    param_set[new_name] = schema
-                    del param_set[name]
-        return param_set
-
-    @staticmethod
-    def _restore_dashes_to_params(param_set: Generic[T]) -> T:
-        if param_set:
-            for name, schema in list(param_set.items()):
-                if "orig_name" in schema:
-                    param_set[schema["orig_name"]] = schema
-                    del param_set[name]
-        return param_set
-
-    @staticmethod
-    def _replace_dashes_with_underscores_in_user_provided_params(
-        uri_params: Generic[T], parameters
-    ) -> T:
-        for k, v in list(uri_params.items()):
-            if "_" in k:
-                if k in parameters:
-                    if "orig_name" in parameters[k]:
-                        uri_params[parameters[k]["orig_name"]] = v
-                        del uri_params[k]
-        return uri_params
+        self._should_maximize_page_size = maximize_page_size
+        self._items_key = _infer_items_key(method_specs.get("response"), schemas)
 
     @staticmethod
     def _del_none_params(uri_params: Generic[T]) -> T:
@@ -193,8 +285,6 @@ class Method:
                 del uri_params[k]
         return uri_params
 
-    # ---- / Changes URL parameters with a "-" to "_" -----#
-
     @property
     def request(self) -> dict:
         """ Returns expected request body """
@@ -213,6 +303,78 @@ class Method:
         else:
             return body
 
+    @property
+    def items_key(self) -> Optional[str]:
+        """
+        Name of the array property that holds the items of the responses of this method e.g. "files" for drive.files.list
+
+        Inferred from the response schema. None if it has no array property, or many of them and none is called "items"
+        """
+        return self._items_key
+
+    def fields_mask(self, item_fields, fields=(), items_key=None) -> str:
+        """
+        Builds a partial response mask (the value of the "fields" parameter) that only selects the given fields of the items of each page,
+        plus the page token of the next page. Google then leaves the other fields out of every page, which makes them a lot smaller to send and parse
+
+        e.g. ::
+
+            >>> mask = drive.files.list.fields_mask(["id", "name", "owners/emailAddress"])
+            >>> mask
+            'nextPageToken,files(id,name,owners/emailAddress)'
+            >>> res = await aiogoogle.as_user(drive.files.list(fields=mask), full_res=True)
+
+        The next pages are requested with the same URL parameters, so the mask applies to all of them.
+
+        Arguments:
+
+            item_fields (Iterable[str]): Fields of each item e.g. "id" or "owners/emailAddress" or "owners(displayName,emailAddress)"
+
+            fields (Iterable[str]): Other fields of the response to select e.g. "incompleteSearch"
+
+            items_key (str): Property of the response that holds its items. Default: ``items_key``
+
+        Returns:
+
+            str: The mask
+
+        Raises:
+
+            aiogoogle.excs.ValidationError: If a field isn't in the response schema of this method
+        """
+        items_key = items_key or self._items_key
+        if items_key is None:
+            raise ValidationError(f"Couldn't tell which property of the responses of {self['id']} holds their items. Pass items_key")
+        item_fields = list(item_fields)
+        if not item_fields:
+            raise ValidationError("Pass at least one item field")
+        response = self["response"] or {}
+        schema_name = response.get("$ref") or f"the response of {self['id']}"
+        if response.get("$ref"):
+            response = (self._schemas or {}).get(response["$ref"]) or {}
+        properties = response.get("properties") or {}
+
+        mask = [name for name in PAGE_TOKEN_FIELDS if name in properties]
+        mask.extend(field for field in fields if field not in mask)
+        mask.append(f"{items_key}({','.join(item_fields)})")
+        mask = ",".join(mask)
+        _check_fields(mask, response, self._schemas, schema_name)
+        return mask
+
+    @property
+    def page_size_parameter(self) -> Optional[str]:
+        """
+        Name of the parameter that sets the number of items per page e.g. "pageSize", if this method is paginated and declares a maximum page size
+        """
+        return self._builder.page_size[0] if self._builder.page_size else None
+
+    @property
+    def _builder(self):
+        # Built on first use rather than in __init__, so that methods that are only inspected never pay for it
+        if self._request_builder is None:
+            self._request_builder = _RequestBuilder(self._method_specs, self._global_parameters)
+        return self._request_builder
+
     @property
     def parameters(self) -> dict:
         """
@@ -222,14 +384,7 @@ class Method:
 
             dict: All parameters that this method can take as described in the discovery document
         """
-        if not self._global_parameters and not self["parameters"]:
-            return {}
-        elif not self._global_parameters:
-            return self["parameters"]
-        elif not self["parameters"]:
-            return self._global_parameters
-        else:
-            return {**self["parameters"], **self._global_parameters}
+        return self._builder.parameters
 
     @property
     def optional_parameters(self) -> List[str]:
@@ -382,10 +537,11 @@ class Method:
         """
         return self._method_specs.get(key)
 
-    def _validate(self, instance, schema, schema_name=None):
-        return validate_(instance, schema, self._schemas, schema_name)
+    def _validate(self, instance, schema, schema_name=None, policy=None):
+        if isinstance(policy, ValidationPolicy):
+            return policy.validate(self["id"], self._schema_validator, instance, schema, schema_name)
+        return self._schema_validator.validate(instance, schema, schema_name)
 
-    @_temporarily_add_back_dashes_to_param_definitions
     def __call__(
         self,
         validate=None,
@@ -397,6 +553,7 @@ class Method:
         pipe_to=None,
         timeout=None,
         path_params_safe_chars={},
+        maximize_page_size=None,
         **uri_params,
     ) -> Request:
         """
@@ -418,7 +575,7 @@ class Method:
 
         Arguments:
 
-            validate (bool): Overrides :param: aiogoogle.Aiogoogle.validate if not None
+            validate (bool, aiogoogle.validate.ValidationPolicy): Overrides :param: aiogoogle.Aiogoogle.validate if not None
 
             json (dict): Json body
 
@@ -432,6 +589,14 @@ class Method:
 
             path_params_safe_chars (dict): Dictionary of safe characters for each path parameter.
 
+            maximize_page_size (bool):
+
+                * Ask for as many items per page as this method allows, unless a page size is passed. Fewer pages means fewer requests and less quota used
+
+                * Uses the maximum the discovery document declares for the page size parameter. See ``page_size_parameter``
+
+                * Overrides :param: aiogoogle.resource.GoogleAPI.maximize_page_size if not None
+
             **uri_params (dict): path and query, required and optional parameters
 
         Returns:
@@ -448,55 +613,104 @@ class Method:
         # NOTE: Use '_' instead of '-' when passing uri parameters that have a '-' in their names
         #
 
+        builder = self._builder
+
+        # Restore the names of parameters that were passed with '_'s instead of '-'s
+        if builder.aliases:
+            uri_params = {builder.aliases.get(k, k): v for k, v in uri_params.items()}
+
         # Remove params that are None
         uri_params = self._del_none_params(uri_params)
 
         # Assert timeout is int
-        if timeout is not None:
-            if not isinstance(timeout, int) or isinstance(timeout, bool):  # True isinstanceof int
-                raise TypeError("Timeouts can only be ints or None")
+        self._check_timeout(timeout)
 
         # Resolve validation status
-        if not isinstance(validate, bool):
+        if not isinstance(validate, (bool, ValidationPolicy)):
             validate = self._should_validate
 
+        if maximize_page_size is None:
+            maximize_page_size = self._should_maximize_page_size
+
+        return self._build(
+            uri_params,
+            validate,
+            data,
+            json,
+            upload_file,
+            pipe_from,
+            download_file,
+            pipe_to,
+            timeout,
+            path_params_safe_chars,
+            maximize_page_size=maximize_page_size,
+        )
+
+    def _build(
+        self,
+        uri_params,
+        validate,
+        data,
+        json,
+        upload_file,
+        pipe_from,
+        download_file,
+        pipe_to,
+        timeout,
+        path_params_safe_chars,
+        prevalidated=frozenset(),
+        validate_body=True,
+        maximize_page_size=False,
+    ):
+        """
+        Builds a request given parameters that were already renamed, stripped of ``None``s and checked
+
+        Arguments:
+
+            prevalidated (frozenset): Names of the URI parameters that were already validated
+
+            validate_body (bool): Set to False if the body was already validated
+
+            maximize_page_size (bool): Fill in the maximum page size if no page size was passed
+        """
+        builder = self._builder
         base_url = self._base_url
+        if maximize_page_size and builder.page_size is not None:
+            page_size_parameter, max_page_size = builder.page_size
+            if page_size_parameter not in uri_params:
+                # Validated along with the other parameters
+                uri_params = {**uri_params, page_size_parameter: max_page_size}
+        if isinstance(validate, ValidationPolicy):
+            validate._record_call(self["id"])
 
         # Build full url minus query & fragment
         url = self._build_url(
-            base_url=base_url, uri_params=uri_params.copy(), validate=validate, path_params_safe_chars=path_params_safe_chars
+            base_url=base_url,
+            uri_params=uri_params.copy(),
+            validate=validate,
+            path_params_safe_chars=path_params_safe_chars,
+            prevalidated=prevalidated,
         )
 
         # Filter out query parameters from all uri_params that were passed to this method
+        query_parameters = builder.query_parameters
         passed_query_params = {
             param_name: param_info
             for param_name, param_info in uri_params.items()
-            if param_name in self.query_parameters
+            if param_name in query_parameters
         }
 
         # Ensure all required query parameteters were passed
-        for param in self.required_query_parameters:
+        for param in builder.required_query_parameters:
             if param not in passed_query_params:
                 raise ValidationError(f'Missing query parameter: "{param}"')
 
         # Validate url query params
-        if validate is True:
+        if validate:
             if passed_query_params:
                 for param_name, passed_param in passed_query_params.items():
-                    schema = self.parameters[param_name]
-                    if schema.get('repeated') and isinstance(passed_param, (list, set, tuple)):
-                        for param in passed_param:
-                            self._validate(
-                                param,
-                                schema,
-                                schema_name=param_name
-                            )
-                    else:
-                        self._validate(
-                            passed_param,
-                            schema,
-                            schema_name=param_name,
-                        )
+                    if param_name not in prevalidated:
+                        self._validate_query_param(param_name, passed_param, validate)
 
         # Join query params
         if passed_query_params:
@@ -509,8 +723,7 @@ class Method:
             del uri_params[param_name]
 
         # Pop uri_params consumed
-        # for param_name in self["parameterOrder"]:
-        for param_name in self.path_parameters:
+        for param_name in builder.path_parameters:
             if param_name in uri_params:
                 del uri_params[param_name]
 
@@ -518,19 +731,11 @@ class Method:
         if uri_params:  # should be empty by now
             # If there's room for addtionalProperties, validate and add them to the URI
             if validate:
-                if self.parameters.get("additionalProperties"):
-                    for _, v in uri_params.items():
-                        self._validate(
-                            v,
-                            self.parameters["additionalProperties"],
-                            schema_name="Additional Url Parameters",
-                        )
-                else:
-                    raise ValidationError(
-                        f"Invalid (extra) parameters: {uri_params} were passed"
-                    )
+                self._validate_extra_params(
+                    {k: v for k, v in uri_params.items() if k not in prevalidated}, validate
+                )
             else:
-                if not self.parameters.get("additionalProperties"):
+                if not builder.additional_properties:
                     warnings.warn(
                         "Parameters {} were found and they're probably of no use."
                         " Check if they're valid parameters".format(str(uri_params))
@@ -552,12 +757,10 @@ class Method:
             # Better raise it early on
 
         # Validate body
-        if validate is True:
-            body = (
-                json if json is not None else data if data is not None else None
-            )  # json or data or None
+        if validate and validate_body:
+            body = _body_of({"json": json, "data": data})
             if body is not None:
-                self._validate_body(body)
+                self._validate_body(body, validate)
 
         # Validate selected options
         if download_file and pipe_to:
@@ -570,7 +773,7 @@ class Method:
 
         # Process download_file
         if download_file:
-            if validate is True:
+            if validate:
                 if self.__getitem__("supportsMediaDownload") is not True:
                     raise ValidationError(
                         "download_file was provided while method doesn't support media download"
@@ -579,7 +782,7 @@ class Method:
 
         # Process pipe_to
         if pipe_to:
-            if validate is True:
+            if validate:
                 if self.__getitem__("supportsMediaDownload") is not True:
                     raise ValidationError(
                         "pipe_to was provided while method doesn't support media download"
@@ -592,13 +795,13 @@ class Method:
         # Process upload_file
         if upload_file:
             media_upload = self._build_upload_media(
-                upload_file, uri, validate, fallback_url=url, pipe_from=None
+                upload_file, uri, bool(validate), fallback_url=url, pipe_from=None
             )
 
         # Process pipe_from
         if pipe_from:
             media_upload = self._build_upload_media(
-                upload_file, uri, validate, fallback_url=url, pipe_from=pipe_from
+                upload_file, uri, bool(validate), fallback_url=url, pipe_from=pipe_from
             )
 
         return Request(
@@ -611,23 +814,201 @@ class Method:
             media_download=media_download,
             media_upload=media_upload,
             callback=lambda res: res,  # TODO: get rid of this sorcery.
+            api_id=self.api_id,
+            method_id=self["id"],
+            items_key=self._items_key,
         )
 
-    def _build_url(self, base_url, uri_params, validate, path_params_safe_chars):
-        if self.path_parameters:
+    def iter_build(self, params, validate=None, **shared_kwargs):
+        """
+        Lazily builds a request for every set of parameters in ``params``
+
+        Builds the same requests as calling this method once per set of parameters would,
+        except that the arguments that are shared by all requests are checked and validated only once.
+
+        Requests are only built as they're consumed, so the sets of parameters can be streamed in,
+        and the requests streamed out, to ``aiogoogle.Aiogoogle.as_user_iter`` and friends.
+
+        Example:
+
+            ::
+
+                >>> requests = gmail.users.messages.get.iter_build(
+                ...     ({"id": message_id} for message_id in message_ids),
+                ...     userId="me",
+                ...     format="metadata",
+                ... )
+                >>> async for request, message in aiogoogle.as_user_iter(requests):
+                ...     process(message)
+
+        Arguments:
+
+            params (Iterable[dict]): Keyword arguments of each request. Takes anything ``__call__`` takes, except for ``validate``
+
+            validate (bool, aiogoogle.validate.ValidationPolicy): Overrides :param: aiogoogle.Aiogoogle.validate if not None
+
+            **shared_kwargs: Keyword arguments shared by all requests. Those of a set of ``params`` take precedence
+
+        Returns:
+
+            Iterator[aiogoogle.models.Request]: Unsent request objects
+
+        Raises:
+
+            aiogoogle.excs.ValidationError: Right away if the shared arguments are invalid. Otherwise, when the invalid request is built
+        """
+        if not isinstance(validate, (bool, ValidationPolicy)):
+            validate = self._should_validate
+
+        # Checked here rather than in the generator, so that invalid shared arguments fail early
+        shared_options, shared_uri_params = self._split_call_kwargs(shared_kwargs)
+        self._check_timeout(shared_options.get("timeout"))
+        if validate:
+            self._validate_uri_params(shared_uri_params, validate)
+            shared_body = _body_of(shared_options)
+            if shared_body is not None:
+                self._validate_body(shared_body, validate)
+
+        return self._iter_build(params, validate, shared_options, shared_uri_params)
+
+    def _iter_build(self, params, validate, shared_options, shared_uri_params):
+        for kwargs in params:
+            options, own_uri_params = self._split_call_kwargs(kwargs)
+            if "timeout" in options:
+                self._check_timeout(options["timeout"])
+            uri_params = {**shared_uri_params, **own_uri_params}
+            # Shared parameters that weren't overridden were validated already
+            prevalidated = frozenset(
+                name for name in shared_uri_params if name not in own_uri_params
+            )
+            # The shared body was validated already
+            validate_body = "json" in options or "data" in options
+            options = {**shared_options, **options}
+            maximize_page_size = options.get("maximize_page_size")
+            yield self._build(
+                uri_params,
+                validate,
+                options.get("data"),
+                options.get("json"),
+                options.get("upload_file"),
+                options.get("pipe_from"),
+                options.get("download_file"),
+                options.get("pipe_to"),
+                options.get("timeout"),
+                options.get("path_params_safe_chars") or {},
+                prevalidated=prevalidated,
+                validate_body=validate_body,
+                maximize_page_size=self._should_maximize_page_size if maximize_page_size is None else maximize_page_size,
+            )
+
+    def build_many(self, params, validate=None, **shared_kwargs) -> List[Request]:
+        """
+        Same as ``iter_build``, but returns a list of requests
+        """
+        return list(self.iter_build(params, validate, **shared_kwargs))
+
+    def _split_call_kwargs(self, kwargs):
+        """
+        Splits keyword arguments of ``__call__`` into options (e.g. json, timeout) and URI parameters.
+        URI parameters are renamed and stripped of ``None``s
+        """
+        aliases = self._builder.aliases
+        options = {}
+        uri_params = {}
+        for k, v in kwargs.items():
+            if k in _CALL_OPTIONS:
+                options[k] = v
+            elif v is not None:
+                uri_params[aliases.get(k, k)] = v
+        return options, uri_params
+
+    @staticmethod
+    def _check_timeout(timeout):
+        if timeout is not None:
+            if not isinstance(timeout, int) or isinstance(timeout, bool):  # True isinstanceof int
+                raise TypeError("Timeouts can only be ints or None")
+
+    def _validate_uri_params(self, uri_params, policy=None):
+        """
+        Validates URI parameters that may be any subset of the ones a request takes
+        """
+        builder = self._builder
+        self._validate_url(
+            {k: v for k, v in uri_params.items() if k in builder.path_parameter_order}, policy
+        )
+        for k, v in uri_params.items():
+            if k in builder.query_parameters:
+                self._validate_query_param(k, v, policy)
+        self._validate_extra_params(
+            {
+                k: v
+                for k, v in uri_params.items()
+                if k not in builder.query_parameters and k not in builder.path_parameters
+            },
+            policy,
+        )
+
+    def _validate_query_param(self, param_name, passed_param, policy=None):
+        schema = self._builder.parameters[param_name]
+        if schema.get('repeated') and isinstance(passed_param, (list, set, tuple)):
+            for param in passed_param:
+                self._validate(
+                    param,
+                    schema,
+                    schema_name=param_name,
+                    policy=policy,
+                )
+        else:
+            self._validate(
+                passed_param,
+                schema,
+                schema_name=param_name,
+                policy=policy,
+            )
+
+    def _validate_extra_params(self, extra_params, policy=None):
+        if not extra_params:
+            return
+        additional_properties = self._builder.additional_properties
+        if additional_properties:
+            for _, v in extra_params.items():
+                self._validate(
+                    v,
+                    additional_properties,
+                    schema_name="Additional Url Parameters",
+                    policy=policy,
+                )
+        else:
+            error = ValidationError(
+                f"Invalid (extra) parameters: {extra_params} were passed"
+            )
+            if isinstance(policy, ValidationPolicy) and policy.on_violation is not None:
+                policy.violations += 1
+                policy.on_violation(self["id"], error)
+            else:
+                raise error
+
+    def _build_url(self, base_url, uri_params, validate, path_params_safe_chars, prevalidated=frozenset()):
+        builder = self._builder
+        if builder.path_parameters:
             # sort path params as sepcified in method_specs.parameterOrder
             sorted_required_path_params = (
                 {}
             )  # Dict order is guaranteed (by insertion) as of Python 3.6
-            for param_name in self["parameterOrder"]:
+            for param_name in builder.path_parameter_order:
                 try:
                     sorted_required_path_params[param_name] = uri_params.pop(param_name)
                 except KeyError:
                     raise ValidationError(f"Missing URL path parameter: {param_name}")
 
             # Validate path params
-            if validate is True:
-                self._validate_url(sorted_required_path_params)
+            if validate:
+                if prevalidated:
+                    self._validate_url(
+                        {k: v for k, v in sorted_required_path_params.items() if k not in prevalidated}, validate
+                    )
+                else:
+                    self._validate_url(sorted_required_path_params, validate)
 
             for k, v in sorted_required_path_params.items():
                 if path_params_safe_chars.get(k) is not None:
@@ -639,17 +1020,11 @@ class Method:
                     sorted_required_path_params[k] = quote(str(v))
 
             # Build full path
-            # replace named placeholders with empty ones. e.g. {param} --> {}
-            # Why? Because some endpoints have different names in their url path placeholders than in their parameter defenitions
-            # e.g. path: {"v1/{+resourceName}/connections"}. e.g. param name: resourceName NOT +resourceName
-            self._method_specs["path"] = re.sub(
-                r"\{(.*?)\}", r"{}", self._method_specs["path"]
-            )
-            return base_url + self["path"].format(
-                *list(sorted_required_path_params.values())
+            return base_url + builder.path_template.format(
+                *sorted_required_path_params.values()
             )
         else:
-            return base_url + self["path"]
+            return base_url + builder.path_template
 
     def _build_upload_media(self, upload_file, qualified_url, validate, fallback_url, pipe_from):
         if not self["supportsMediaUpload"]:
@@ -716,29 +1091,29 @@ class Method:
         else:
             return int(size)
 
-    def _validate_url(self, sorted_required_path_params):
+    def _validate_url(self, sorted_required_path_params, policy=None):
         for path_param_name, path_param_info in sorted_required_path_params.items():
             self._validate(
                 instance=path_param_info,
-                schema=self.parameters[path_param_name],
+                schema=self._builder.parameters[path_param_name],
                 schema_name=path_param_name,
+                policy=policy,
             )
 
-    def _validate_body(self, req):
+    def _validate_body(self, req, policy=None):
         request_schema = self._method_specs.get("request")
         if request_schema is not None:
-            schema_name = "Request Body"
-            if "$ref" in request_schema:
-                schema_name = request_schema["$ref"]
-                request_schema = self._schemas[schema_name]
-            self._validate(req, request_schema, schema_name=schema_name)
+            # Validated against the reference rather than the schema it resolves to, so that its validator is cached by name.
+            # Schemas backed by a DiscoveryStore are new objects every time they're looked up
+            schema_name = request_schema.get("$ref", "Request Body")
+            self._validate(req, request_schema, schema_name=schema_name, policy=policy)
         else:
             raise ValidationError(
                 "Request body should've been validated, but wasn't because the method doesn't accept a JSON body"
             )
 
     def __contains__(self, item):
-        return item in self.parameters
+        return item in self.parameters or item in self._builder.aliases
 
     def __str__(self):
         return self["id"] + " method @ " + self._base_url
@@ -750,6 +1125,30 @@ class Method:
         return len(self.required_parameters) if self.required_parameters else 0
 
 
+def _get_node(parent, name):
+    """
+    Returns the nested resource or method ``name`` of a ``GoogleAPI`` or a ``Resource``, or None if there's none.
+
+    Nodes are only built the first time they're looked up, then cached on their parent,
+    so that ``api.resource.method`` chains cost a couple of dict lookups.
+    """
+    # Looked up in __dict__ because this is called from __getattr__
+    nodes = parent.__dict__.get("_nodes")
+    if nodes is None:
+        # Not initialized yet (e.g. while being copied or unpickled)
+        raise AttributeError(name)
+    node = nodes.get(name)
+    if node is None:
+        if name in (parent["resources"] or ()):
+            node = parent._get_resource(name)
+        elif name in (parent["methods"] or ()):
+            node = parent._get_method(name)
+        else:
+            return None
+        nodes[name] = node
+    return node
+
+
 class Resource:
     def __init__(
         self,
@@ -761,8 +1160,12 @@ class Resource:
         service_path,
         batch_path,
         validate,
+        api_id=None,
+        schema_validator=None,
+        maximize_page_size=False,
     ):
         self.name = name
+        self.api_id = api_id
         self._resource_specs = resource_specs
         self._global_parameters = global_parameters
         self._schemas = schemas
@@ -770,6 +1173,9 @@ class Resource:
         self._service_path = service_path
         self._batch_path = batch_path
         self._validate = validate
+        self._maximize_page_size = maximize_page_size
+        self._schema_validator = schema_validator or SchemaValidator(schemas)
+        self._nodes = {}
 
     @property
     def methods_available(self) -> List[str]:
@@ -795,6 +1201,9 @@ class Resource:
             service_path=self._service_path,
             batch_path=self._batch_path,
             validate=self._validate,
+            api_id=self.api_id,
+            schema_validator=self._schema_validator,
+            maximize_page_size=self._maximize_page_size,
         )
 
     def _get_method(self, method_name):
@@ -807,6 +1216,9 @@ class Resource:
             service_path=self._service_path,
             batch_path=self._batch_path,
             validate=self._validate,
+            api_id=self.api_id,
+            schema_validator=self._schema_validator,
+            maximize_page_size=self._maximize_page_size,
         )
 
     def __str__(self):
@@ -822,10 +1234,10 @@ class Resource:
         )
 
     def __len__(self):
-        return len(self.methods_available)
+        return len(self["methods"] or ())
 
     def __contains__(self, item):
-        return (item in self.methods_available) or (item in self.resources_available)
+        return item in (self["methods"] or ()) or item in (self["resources"] or ())
 
     def __getitem__(self, k):
         return self._resource_specs.get(k)
@@ -851,12 +1263,9 @@ class Resource:
 
             AttributeError:
         """
-        # 1. Search in nested resources
-        if method_or_resource in self.resources_available:
-            return self._get_resource(method_or_resource)
-        # 2. Search in methods
-        elif method_or_resource in self.methods_available:
-            return self._get_method(method_or_resource)
+        node = _get_node(self, method_or_resource)
+        if node is not None:
+            return node
         else:
             raise AttributeError(
                 f"""Resource/Method {method_or_resource} doesn't exist.
@@ -873,16 +1282,24 @@ class GoogleAPI:
 
     Arguments:
 
-        discovery_document (dict): A discovery document
+        discovery_document (dict, bytes): A discovery document, or a discovery document compiled with ``aiogoogle.compiler``
+
+        validate (bool, ValidationPolicy): Set this to True to use this lib's built in parameter validation logic. Note that you shouldn't rely on this for critical user input validation.
 
-        validate (bool): Set this to True to use this lib's built in parameter validation logic. Note that you shouldn't rely on this for critical user input validation.
+        maximize_page_size (bool): Ask for as many items per page as each paginated method allows, unless a page size is passed. See ``aiogoogle.resource.Method.__call__``
     """
 
-    def __init__(self, discovery_document, validate=False):
+    def __init__(self, discovery_document, validate=False, maximize_page_size=False):
+        if is_compiled(discovery_document):
+            discovery_document = load_compiled_discovery_document(discovery_document)
         self.discovery_document = self._add_extra_query_param_definitions(
             discovery_document
         )
         self._validate = validate
+        self._maximize_page_size = maximize_page_size
+        # josnschema validator will fail if schemas isn't a dict
+        self._schema_validator = SchemaValidator(self["schemas"] or {})
+        self._nodes = {}
 
     def _add_extra_query_param_definitions(self, discovery_document):
         """ Adds extra parameters that aren't explicitly defined in discovery docuemnts
@@ -926,6 +1343,9 @@ class GoogleAPI:
             service_path=self["servicePath"],
             batch_path=self["batchPath"],
             validate=self._validate,
+            api_id=self["id"],
+            schema_validator=self._schema_validator,
+            maximize_page_size=self._maximize_page_size,
         )
 
     def _get_method(self, method_name):
@@ -939,6 +1359,9 @@ class GoogleAPI:
             service_path=self["servicePath"],
             batch_path=self["batchPath"],
             validate=self._validate,
+            api_id=self["id"],
+            schema_validator=self._schema_validator,
+            maximize_page_size=self._maximize_page_size,
         )
 
     def __getattr__(self, method_or_resource) -> Resource:
@@ -970,10 +1393,9 @@ class GoogleAPI:
 
             AttributeError:
         """
-        if method_or_resource in self.resources_available:
-            return self._get_resource(method_or_resource)
-        elif method_or_resource in self.methods_available:
-            return self._get_method(method_or_resource)
+        node = _get_node(self, method_or_resource)
+        if node is not None:
+            return node
         else:
             documentation_link = (
                 self.discovery_document.get("documentationLink")
@@ -1027,7 +1449,7 @@ class GoogleAPI:
         return self.discovery_document.get(k)
 
     def __contains__(self, name):
-        return (name in self.resources_available) or (name in self.methods_available)
+        return name in (self["resources"] or ()) or name in (self["methods"] or ())
 
     def __repr__(self):
         labels = f'\nLabels:\n{self["labels"]}' if self["labels"] is not None else ""
@@ -1045,7 +1467,7 @@ class GoogleAPI:
         return self.__repr__()
 
     def __len__(self):
-        return len(self.resources_available) + len(self.methods_available)
+        return len(self["resources"] or ()) + len(self["methods"] or ())
 
     def __call__(self):
         raise TypeError(
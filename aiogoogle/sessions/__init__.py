@@ -1 +1 @@
-__all__ = ["aiohttp_session", "curio_asks_session", "trio_asks_session", "abc"]
+__all__ = ["aiohttp_session", "curio_asks_session", "trio_asks_session", "abc", "common", "limiters", "batching", "dedup", "cache", "codec"]
@@ -67,6 +67,82 @@ class AbstractSession(ABC):
 
                 * Defaults to ``self.__class__``
 
+            stats (aiogoogle.sessions.common.SessionStats):
+
+                * Counters to record to while sending these requests
+
+                * Defaults to the session's own counters (if it keeps any)
+
+            max_concurrency (int, aiogoogle.sessions.limiters.ConcurrencyLimiter):
+
+                * Maximum number of requests to have in flight at a time. Pass a limiter to share the cap with other calls
+
+                * Pass an ``aiogoogle.sessions.limiters.AdaptiveConcurrencyLimiter`` to have a per host cap that adapts to throttling
+
+                * Defaults to no limit
+
+                * Supported by ``AiohttpSession`` only. Other sessions raise NotImplementedError when it's set
+
+            retry_policy (aiogoogle.sessions.common.RetryPolicy):
+
+                * Policy for sending requests again when they fail with transient errors. Every retry is counted in ``stats.retries``
+
+                * Defaults to no retries
+
+            rate_limiter (aiogoogle.sessions.limiters.RateLimiter):
+
+                * Paces requests per API and per method before they're sent (retries included)
+
+                * Defaults to no pacing
+
+                * Supported by ``AiohttpSession`` only. Other sessions raise NotImplementedError when it's set
+
+            batch (bool, int):
+
+                * Send requests that share a ``batch_url`` in batch requests of up to 100 requests (or as many as the given int) each. See ``aiogoogle.models.Request.batch_requests``
+
+                * Only the parts of a batch that fail with a retryable status are retried
+
+                * Sessions that don't support batching send the requests one by one
+
+                * Defaults to False
+
+            auto_batch (bool, aiogoogle.sessions.batching.BatchCoalescer):
+
+                * Hold requests that can be batched for a short while, so that they're sent in a single batch request along with requests of other ``send`` calls
+
+                * Ignored if ``batch`` is set. Defaults to False
+
+                * Supported by ``AiohttpSession`` only. Other sessions raise NotImplementedError when it's set
+
+            deduplicate (bool, aiogoogle.sessions.dedup.SingleFlight):
+
+                * Make concurrent identical GET requests share one network call. Every caller gets its own copy of the response
+
+                * Defaults to False
+
+                * Supported by ``AiohttpSession`` only. Other sessions raise NotImplementedError when it's set
+
+            cache (bool, aiogoogle.sessions.cache.AbstractCache):
+
+                * Cache responses that have an ETag, send conditional (``If-None-Match``) requests for them and serve the cached body on a 304
+
+                * Entries are keyed by URL and by the identity the request was authorized with. True creates a ``MemoryCache``
+
+                * Defaults to no caching
+
+                * Supported by ``AiohttpSession`` only. Other sessions raise NotImplementedError when it's set
+
+            offload_json (bool, aiogoogle.sessions.codec.JsonCodec):
+
+                * Decompress and parse large JSON responses, and serialize large JSON request bodies, in an executor instead of on the event loop
+
+                * True creates a ``JsonCodec`` with its defaults. Pass one to pick the size threshold, the executor or a faster JSON library
+
+                * Defaults to handling bodies inline
+
+                * Supported by ``AiohttpSession`` only. Other sessions raise NotImplementedError when it's set
+
         Returns:
 
             aiogoogle.models.Response
@@ -77,3 +153,27 @@ class AbstractSession(ABC):
 
         """
         raise NotImplementedError
+
+    def send_iter(self, *requests, timeout=None, full_res=False, raise_for_status=True, session_factory=None, **kwargs):
+        """
+        Same as ``send``, except that it returns an async iterator that yields results as soon as each request completes,
+        instead of waiting for all of the requests to complete.
+
+        Arguments:
+
+            Same as ``send``. ``timeout`` is the total timeout for iterating over all of the results.
+            Instead of ``*requests``, a single iterable of requests (e.g. ``aiogoogle.resource.Method.iter_build``) can be passed.
+            Sessions that support it pull requests from it only as they're sent
+
+        Raises:
+
+            The timeout error of the session's event loop (e.g. ``asyncio.TimeoutError``, ``trio.TooSlowError``) once ``timeout`` runs out.
+            Requests that haven't completed by then, or by the time the iterator is closed, are cancelled
+
+        Yields:
+
+            tuple: ``(request, response_or_exception)``.
+            Exceptions raised while sending a request (including the ones raised by ``raise_for_status``) are yielded, not raised.
+            The response is the content of the response unless ``full_res`` is True
+        """
+        raise NotImplementedError
@@ -1,20 +1,35 @@
 __all__ = ["AiohttpSession"]
 
 import asyncio
+from collections.abc import Sized
 from json import JSONDecodeError
 
-from aiohttp import ClientSession, MultipartWriter
-from aiohttp.client_exceptions import ContentTypeError
+from aiohttp import ClientSession, MultipartWriter, TraceConfig
+from aiohttp.client_exceptions import ClientConnectionError, ContentTypeError
 import aiofiles
 from aiofiles import os as async_os
 import async_timeout
 
 from ..models import Response
 from .abc import AbstractSession
+from .common import SessionStats, _get_batch_size, _send_batched, _send_with_retries, _unpack_requests
+from .limiters import ConcurrencyLimiter
+from .batching import BatchCoalescer
+from .dedup import SingleFlight
+from .cache import AbstractCache, _send_cached
+from .codec import JsonCodec
 import os
 
 HTTP_PROXY = os.getenv("AIOGOOGLE_HTTP_PROXY", "")
 
+# Max requests in flight when sending an iterable of requests of unknown length without a concurrency limit
+STREAM_CONCURRENCY = 100
+# Put in the queue of results by the workers of _iter_completed once they're out of requests
+_WORKER_DONE = object()
+
+# Errors worth sending a request again for, given a retry policy. e.g. a dropped keep-alive connection
+TRANSIENT_ERRORS = (ClientConnectionError, asyncio.TimeoutError)
+
 
 async def _get_file_size(full_file_path):
     stat = await async_os.stat(full_file_path)
@@ -35,8 +50,138 @@ async def _read_file(file_name):
         return await file.read()
 
 
+async def _send_limited(limiter, request, get_response):
+    try:
+        await limiter.acquire(request)
+    finally:
+        limiter._dequeue()
+    try:
+        response = await get_response(request)
+    except BaseException as e:
+        limiter.release(request, exc=e)
+        raise
+    limiter.release(request, response=response)
+    return response
+
+
+async def _gather_bounded(limiter, requests, get_response):
+    """
+    Same as gathering ``get_response(request)`` for all requests, except that
+    it only keeps up to ``limiter.max_concurrency`` tasks alive at a time instead of one task per request.
+    """
+    responses = [None] * len(requests)
+    pending = iter(enumerate(requests))
+    picked = 0
+
+    async def worker():
+        nonlocal picked
+        for i, request in pending:
+            picked += 1
+            responses[i] = await _send_limited(limiter, request, get_response)
+
+    limiter._enqueue(len(requests))
+    workers = [
+        asyncio.ensure_future(worker())
+        for _ in range(min(limiter.max_concurrency, len(requests)))
+    ]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        # Don't keep sending the rest of the requests in the background
+        for w in workers:
+            w.cancel()
+        raise
+    finally:
+        limiter._dequeue(len(requests) - picked)
+    return responses
+
+
+async def _send_all(limiter, requests, get_response):
+    if limiter is not None:
+        return await _gather_bounded(limiter, requests, get_response)
+    return await asyncio.gather(*[get_response(request) for request in requests])
+
+
+async def _iter_completed(limiter, requests, get_response, timeout=None):
+    """
+    Yields ``(request, response_or_exception)`` tuples in the order in which the requests complete.
+
+    Given a limiter, only ``limiter.max_concurrency`` tasks are kept alive and
+    workers wait for the consumer once that many unconsumed results pile up.
+
+    ``requests`` can also be an iterable that isn't a sequence (e.g. a generator), in which case requests are only pulled
+    from it as workers free up, so that memory use doesn't grow with its length.
+    Without a limiter, up to ``STREAM_CONCURRENCY`` of them are sent at a time.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    sized = isinstance(requests, Sized)
+    pending = iter(requests)
+    picked = 0
+
+    if not sized:
+        n_workers = limiter.max_concurrency if limiter is not None else STREAM_CONCURRENCY
+        completed = asyncio.Queue(maxsize=n_workers)
+    elif limiter is None:
+        n_workers = len(requests)
+        completed = asyncio.Queue()
+    else:
+        n_workers = min(limiter.max_concurrency, len(requests))
+        completed = asyncio.Queue(maxsize=n_workers)
+        limiter._enqueue(len(requests))
+
+    async def worker():
+        nonlocal picked
+        try:
+            for request in pending:
+                picked += 1
+                try:
+                    if limiter is None:
+                        result = await get_response(request)
+                    else:
+                        if not sized:
+                            limiter._enqueue(1)
+                        result = await _send_limited(limiter, request, get_response)
+                except Exception as e:
+                    result = e
+                await completed.put((request, result))
+        except Exception as e:
+            # Raised by the iterable of requests itself. e.g. a request that fails validation as it's built
+            await completed.put((_WORKER_DONE, e))
+        else:
+            await completed.put((_WORKER_DONE, None))
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(n_workers)]
+    try:
+        done = 0
+        while done < n_workers:
+            if deadline is None:
+                request, result = await completed.get()
+            else:
+                request, result = await asyncio.wait_for(completed.get(), max(deadline - loop.time(), 0))
+            if request is _WORKER_DONE:
+                done += 1
+                if result is not None:
+                    raise result
+            else:
+                yield request, result
+    finally:
+        # The consumer might stop iterating early
+        for w in workers:
+            w.cancel()
+        if limiter is not None and sized:
+            limiter._dequeue(len(requests) - picked)
+
+
+def _stats_from_trace_ctx(trace_config_ctx, default):
+    # Every request is fired with the stats object of its caller as its ``trace_request_ctx``
+    return trace_config_ctx.trace_request_ctx or default
+
+
 class AiohttpSession(AbstractSession):
     def __init__(self, *args, **kwargs):
+        self.stats = SessionStats()
+        kwargs["trace_configs"] = [*kwargs.get("trace_configs", []), self._make_trace_config()]
         self._session = ClientSession(*args, **kwargs)
     
     async def __aenter__(self):
@@ -48,16 +193,57 @@ class AiohttpSession(AbstractSession):
     async def close(self):
         await self._session.close()
 
-    async def send(
+    @property
+    def closed(self):
+        return self._session.closed
+
+    def _make_trace_config(self):
+        async def on_connection_create_end(session, trace_config_ctx, params):
+            _stats_from_trace_ctx(trace_config_ctx, self.stats).connections_opened += 1
+
+        async def on_connection_reuseconn(session, trace_config_ctx, params):
+            _stats_from_trace_ctx(trace_config_ctx, self.stats).connections_reused += 1
+
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def _make_response_getter(
         self,
-        *requests,
-        timeout=None,
-        full_res=False,
-        raise_for_status=True,
-        session_factory=None,
-        auth_manager=None,
-        **kwargs
+        raise_for_status,
+        session_factory,
+        auth_manager,
+        stats,
+        limiter,
+        retry_policy,
+        rate_limiter,
+        coalescer,
+        single_flight,
+        cache,
+        codec,
+        kwargs,
     ):
+        """
+        Returns a coroutine function that sends a request and returns an ``aiogoogle.models.Response``
+        """
+        stats = stats or self.stats
+        session_factory = self.__class__ if session_factory is None else session_factory
+        user_creds = kwargs.get("user_creds")
+        # Options that should also apply to follow-up requests e.g. the next pages of a paginated response
+        send_kwargs = {
+            **kwargs,
+            "stats": stats,
+            "max_concurrency": limiter,
+            "retry_policy": retry_policy,
+            "rate_limiter": rate_limiter,
+            "auto_batch": coalescer,
+            "deduplicate": single_flight,
+            "cache": cache,
+            "offload_json": codec,
+        }
+        send_kwargs.pop("user_creds", None)
+
         async def resolve_response(request, response):
             data = None
             json = None
@@ -65,6 +251,7 @@ class AiohttpSession(AbstractSession):
             upload_file = None
             pipe_from = None
             pipe_to = None
+            raw_body = None
 
             # If downloading file:
             if request.media_download:
@@ -81,7 +268,21 @@ class AiohttpSession(AbstractSession):
                         async for line in response.content.iter_chunked(chunk_size):
                             await f.write(line)
             else:
-                if response.status != 204:  # If no (no content)
+                if response.status != 204 and codec is not None:
+                    body = await response.read()
+                    json, data = await codec.decode(
+                        body,
+                        response.headers.get("Content-Encoding"),
+                        response.content_type,
+                        response.charset,
+                        stats,
+                    )
+                    if cache is not None:
+                        raw_body = (body, response.headers.get("Content-Encoding"), response.content_type, response.charset)
+                elif response.status != 204:  # If no (no content)
+                    if cache is not None:
+                        # Read before parsing, so that the cache can keep the body as received (already decompressed by aiohttp)
+                        raw_body = (await response.read(), None, response.content_type, response.charset)
                     try:
                         json = await response.json()
                     except (JSONDecodeError, ContentTypeError):
@@ -96,7 +297,7 @@ class AiohttpSession(AbstractSession):
             if request.media_upload:
                 upload_file = request.media_upload.file_path
 
-            return Response(
+            res = Response(
                 url=str(response.url),
                 headers=response.headers,
                 status_code=response.status,
@@ -110,12 +311,20 @@ class AiohttpSession(AbstractSession):
                 pipe_from=pipe_from,
                 session_factory=session_factory,
                 auth_manager=auth_manager,
-                user_creds=kwargs.get("user_creds")
+                user_creds=user_creds,
+                session=self,
+                send_kwargs=send_kwargs,
             )
+            # Taken, and dropped, by the cache
+            res._raw_body = raw_body
+            return res
 
         async def fire_request(request):
             request.headers["Accept-Encoding"] = "gzip"
             request.headers["User-Agent"] = "Aiogoogle Aiohttp (gzip)"
+            # The codec decompresses the bodies it decodes itself, so that large ones are decompressed off the event loop too.
+            # Only passed when needed, since older versions of aiohttp don't accept auto_decompress per request
+            decompress_kwargs = {} if codec is None or request.media_download is not None else {"auto_decompress": False}
             if request.media_upload:
                 # Validate
                 await request.media_upload.run_validation(_get_file_size)
@@ -142,6 +351,8 @@ class AiohttpSession(AbstractSession):
                             timeout=request.timeout,
                             ssl=request._verify_ssl,
                             proxy=HTTP_PROXY,
+                            trace_request_ctx=stats,
+                            **decompress_kwargs,
                         )
                 # Else load file to memory and send
                 else:
@@ -156,36 +367,163 @@ class AiohttpSession(AbstractSession):
                         json=request.json,
                         timeout=request.timeout,
                         ssl=request._verify_ssl,
-                        proxy=HTTP_PROXY
+                        proxy=HTTP_PROXY,
+                        trace_request_ctx=stats,
+                        **decompress_kwargs,
                     )
             # Else, if no file upload
             else:
+                headers = request.headers
+                data = request.data
+                json = request.json
+                if codec is not None and json is not None and data is None:
+                    data = await codec.encode(json, stats)
+                    json = None
+                    headers = {"Content-Type": "application/json", **headers}
                 return await self._session.request(
                     method=request.method,
                     url=request.url,
-                    headers=request.headers,
-                    data=request.data,
-                    json=request.json,
+                    headers=headers,
+                    data=data,
+                    json=json,
                     timeout=request.timeout,
                     ssl=request._verify_ssl,
                     proxy=HTTP_PROXY,
+                    trace_request_ctx=stats,
+                    **decompress_kwargs,
                 )
 
         # ----------------- send sequence ------------------#
+        async def send_once(request):
+            if rate_limiter is not None:
+                await rate_limiter.acquire(request)
+            if limiter is None:
+                response = await fire_request(request)
+                return await resolve_response(request, response)
+
+            # Let the limiter see every attempt, including the throttled ones that end up being retried
+            loop = asyncio.get_running_loop()
+            started_at = loop.time()
+            try:
+                response = await resolve_response(request, await fire_request(request))
+            except TRANSIENT_ERRORS as e:
+                limiter.observe(request, exc=e, latency=loop.time() - started_at)
+                raise
+            limiter.observe(request, response=response, latency=loop.time() - started_at)
+            return response
+
+        async def send_with_retries(request):
+            return await _send_with_retries(
+                send_once, request, retry_policy, stats, asyncio.sleep, TRANSIENT_ERRORS
+            )
+
+        async def send_cached(request):
+            if cache is None:
+                return await send_with_retries(request)
+            return await _send_cached(cache, request, send_with_retries, stats, codec)
+
         async def get_response(request):
-            response = await fire_request(request)
-            response = await resolve_response(request, response)
+            if single_flight is not None:
+                response = await single_flight.send(request, send_cached, stats)
+            else:
+                response = await send_cached(request)
             if raise_for_status is True:
                 response.raise_for_status()
             return response
 
+        # ----------------- /send sequence ------------------#
+
+        return get_response
+
+    @staticmethod
+    def _make_coalesced_response_getter(coalescer, get_response, limiter, retry_policy, stats, raise_for_status):
+        """
+        Wraps ``get_response`` so that requests that can be batched are handed to ``coalescer`` instead of being sent right away.
+        ``get_response`` shouldn't raise for statuses: That's left to each caller
+        """
+
+        async def send_batch(requests):
+            return await _send_batched(
+                requests,
+                lambda batch_requests: _send_all(limiter, batch_requests, get_response),
+                coalescer.max_size,
+                retry_policy,
+                stats,
+                asyncio.sleep,
+            )
+
+        async def get_coalesced_response(request):
+            if request._is_batchable():
+                response = await coalescer.submit(request, send_batch)
+            elif limiter is None:
+                response = await get_response(request)
+            else:
+                limiter._enqueue(1)
+                response = await _send_limited(limiter, request, get_response)
+            # Only raised here, so that a part that failed is only raised to the caller that sent it, not to the whole batch
+            if raise_for_status is True:
+                response.raise_for_status()
+            return response
+
+        return get_coalesced_response
+
+    async def send(
+        self,
+        *requests,
+        timeout=None,
+        full_res=False,
+        raise_for_status=True,
+        session_factory=None,
+        auth_manager=None,
+        stats=None,
+        max_concurrency=None,
+        retry_policy=None,
+        rate_limiter=None,
+        batch=False,
+        auto_batch=None,
+        deduplicate=None,
+        cache=None,
+        offload_json=None,
+        **kwargs
+    ):
+        limiter = ConcurrencyLimiter.from_option(max_concurrency)
+        coalescer = BatchCoalescer.from_option(auto_batch)
+        single_flight = SingleFlight.from_option(deduplicate)
+        cache = AbstractCache.from_option(cache)
+        codec = JsonCodec.from_option(offload_json)
+        batch_size = _get_batch_size(batch)
+        stats = stats or self.stats
+        # Batched responses are only raised for once they're unbatched
+        get_response = self._make_response_getter(
+            raise_for_status and not batch_size and coalescer is None, session_factory, auth_manager, stats, limiter, retry_policy, rate_limiter, coalescer, single_flight, cache, codec, kwargs
+        )
+        if coalescer is not None and not batch_size:
+            get_response = self._make_coalesced_response_getter(
+                coalescer, get_response, limiter, retry_policy, stats, raise_for_status
+            )
+            # The limiter applies to the batches that are sent, not to the requests waiting to be batched
+            limiter = None
+
         async def get_content(request):
             response = await get_response(request)
             return response.content
 
-        # ----------------- /send sequence ------------------#
+        async def send_all(requests):
+            return await _send_all(limiter, requests, get_response)
+
+        async def send_batched():
+            responses = await _send_batched(requests, send_all, batch_size, retry_policy, stats, asyncio.sleep)
+            if raise_for_status is True:
+                for response in responses:
+                    response.raise_for_status()
+            return responses if full_res is True else [response.content for response in responses]
 
         async def schedule_tasks():
+            if batch_size:
+                return await send_batched()
+            if limiter is not None:
+                responses = await _gather_bounded(limiter, requests, get_response)
+                return responses if full_res is True else [response.content for response in responses]
             return await asyncio.gather(
                 *[
                     asyncio.ensure_future(
@@ -195,8 +533,6 @@ class AiohttpSession(AbstractSession):
                 return_exceptions=False
             )
 
-        session_factory = self.__class__ if session_factory is None else session_factory
-
         if timeout is not None:
             async with async_timeout.timeout(timeout):
                 results = await schedule_tasks()
@@ -206,3 +542,42 @@ class AiohttpSession(AbstractSession):
         return (
             results[0] if isinstance(results, list) and len(results) == 1 else results
         )
+
+    async def send_iter(
+        self,
+        *requests,
+        timeout=None,
+        full_res=False,
+        raise_for_status=True,
+        session_factory=None,
+        auth_manager=None,
+        stats=None,
+        max_concurrency=None,
+        retry_policy=None,
+        rate_limiter=None,
+        auto_batch=None,
+        deduplicate=None,
+        cache=None,
+        offload_json=None,
+        **kwargs
+    ):
+        requests = _unpack_requests(requests)
+        limiter = ConcurrencyLimiter.from_option(max_concurrency)
+        coalescer = BatchCoalescer.from_option(auto_batch)
+        single_flight = SingleFlight.from_option(deduplicate)
+        cache = AbstractCache.from_option(cache)
+        codec = JsonCodec.from_option(offload_json)
+        stats = stats or self.stats
+        get_response = self._make_response_getter(
+            raise_for_status and coalescer is None, session_factory, auth_manager, stats, limiter, retry_policy, rate_limiter, coalescer, single_flight, cache, codec, kwargs
+        )
+        if coalescer is not None:
+            get_response = self._make_coalesced_response_getter(
+                coalescer, get_response, limiter, retry_policy, stats, raise_for_status
+            )
+            limiter = None
+
+        async for request, result in _iter_completed(limiter, requests, get_response, timeout):
+            if full_res is not True and not isinstance(result, Exception):
+                result = result.content
+            yield request, result
@@ -0,0 +1,140 @@
+__all__ = ["BatchCoalescer"]
+
+import asyncio
+
+from ..models import MAX_BATCH_SIZE
+
+
+class _PendingBatch:
+    def __init__(self, send_batch):
+        self.send_batch = send_batch
+        self.requests = []
+        self.futures = []
+        self.timer = None
+
+
+class BatchCoalescer:
+    """
+    Holds requests that are sent individually for a short while, so that the ones
+    that can be sent to the same ``batch_url`` on behalf of the same user are sent together in a single batch request.
+
+    Every caller still awaits, and gets, the response of its own request.
+
+    Pass one to ``aiogoogle.Aiogoogle(auto_batch=...)``, or pass ``auto_batch=True`` to use the defaults
+
+    Arguments:
+
+        window (float): Seconds to wait for more requests after the first one of a batch comes in
+
+        max_size (int): Send a batch right away once this many requests are waiting. At most 100
+
+    Attributes:
+
+        batches_sent (int): Number of batches sent so far
+
+        requests_coalesced (int): Number of requests sent in these batches
+    """
+
+    def __init__(self, window=0.01, max_size=MAX_BATCH_SIZE):
+        if window < 0:
+            raise ValueError("window should be a positive number of seconds")
+        if not isinstance(max_size, int) or not 1 <= max_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"max_size should be an int between 1 and {MAX_BATCH_SIZE}")
+        self.window = window
+        self.max_size = max_size
+        self.batches_sent = 0
+        self.requests_coalesced = 0
+        self._pending = {}
+        # The event loop only keeps weak references to tasks. Batches in flight would otherwise be garbage collected before completing
+        self._tasks = set()
+
+    @classmethod
+    def from_option(cls, auto_batch):
+        """
+        Returns a coalescer given either a coalescer, a bool or None
+        """
+        if auto_batch is None or auto_batch is False:
+            return None
+        if auto_batch is True:
+            return cls()
+        if isinstance(auto_batch, BatchCoalescer):
+            return auto_batch
+        raise TypeError("auto_batch should be a bool or a BatchCoalescer")
+
+    @staticmethod
+    def _key_of(request):
+        # Requests authorized with an API key carry it in their URL, which is kept as is in the batch
+        return request.batch_url, request.headers.get("Authorization")
+
+    async def submit(self, request, send_batch):
+        """
+        Adds ``request`` to the batch it belongs to and waits for its response
+
+        Arguments:
+
+            request (aiogoogle.models.Request): Request to send. Should have a ``batch_url``
+
+            send_batch (callable):
+
+                * Coroutine function that takes a list of requests and returns a list of their responses, in the same order
+
+                * Only the one passed by the first request of a batch is used to send the batch
+
+        Returns:
+
+            aiogoogle.models.Response:
+        """
+        loop = asyncio.get_running_loop()
+        key = self._key_of(request)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingBatch(send_batch)
+            pending.timer = loop.call_later(self.window, self._flush, key)
+        future = loop.create_future()
+        pending.requests.append(request)
+        pending.futures.append(future)
+        if len(pending.requests) >= self.max_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key):
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        pending.timer.cancel()
+        self.batches_sent += 1
+        self.requests_coalesced += len(pending.requests)
+        task = asyncio.ensure_future(self._send(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def aclose(self):
+        """
+        Sends the batches that are still waiting for more requests right away, then waits for all batches in flight to complete.
+        Cancelling this cancels them instead
+        """
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _send(pending):
+        try:
+            responses = await pending.send_batch(pending.requests)
+        except asyncio.CancelledError:
+            for future in pending.futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in pending.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            # Callers that gave up waiting (e.g. timed out) have their futures cancelled already
+            for future, response in zip(pending.futures, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    def __repr__(self):
+        return f"BatchCoalescer(window={self.window}, max_size={self.max_size}, batches_sent={self.batches_sent})"
@@ -0,0 +1,250 @@
+__all__ = ["AbstractCache", "MemoryCache", "FileCache"]
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import os
+import time
+
+import aiofiles
+from aiofiles import os as async_os
+
+from .codec import _decode_body
+
+# Keys of the body of an entry as it was received. See AbstractCache
+RAW_BODY_KEYS = ("body", "content_encoding", "content_type", "charset")
+
+
+class AbstractCache(ABC):
+    """
+    Storage for the responses cached by sessions.
+
+    Entries are dicts with the following keys: "etag", "status_code", "headers", "json" and "data".
+    They only hold JSON serializable values. Implementations that expire entries add a "stored_at" key on ``set``.
+
+    Sessions that can also add the body as it was received, along with what it takes to parse it again:
+    "body" (bytes), "content_encoding", "content_type" and "charset". Implementations that serialize entries should leave these out.
+    Implementations that keep them may return entries with "json" and "data" set to None: Sessions only parse "body" once it's served.
+
+    Implementations should return entries that are safe for the caller to modify.
+    """
+
+    @classmethod
+    def from_option(cls, cache):
+        """
+        Returns a cache given either a cache, a bool or None. True creates a ``MemoryCache``
+        """
+        if cache is None or cache is False:
+            return None
+        if cache is True:
+            return MemoryCache()
+        if isinstance(cache, AbstractCache):
+            return cache
+        raise TypeError("cache should be a bool or an AbstractCache")
+
+    @abstractmethod
+    async def get(self, key):
+        """
+        Returns the entry stored under ``key`` or None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key, entry):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key):
+        raise NotImplementedError
+
+
+class MemoryCache(AbstractCache):
+    """
+    In memory LRU cache
+
+    Arguments:
+
+        max_entries (int): Evict the least recently used entries once there are more than this many
+
+        max_bytes (int): Evict the least recently used entries once the bodies of the entries take more than this many bytes. Defaults to no limit
+
+        ttl (float): Seconds after which an entry is dropped. Defaults to keeping entries until they're evicted
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None, clock=time.time):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, key):
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        entry, size = item
+        if self.ttl is not None and self._clock() - entry["stored_at"] > self.ttl:
+            await self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        if entry.get("body") is None:
+            return copy.deepcopy(entry)
+        # Left for the session to parse, and only if the server says it's still fresh
+        return {**entry, "headers": dict(entry["headers"])}
+
+    async def set(self, key, entry):
+        await self.delete(key)
+        if entry.get("body") is not None:
+            # Parsing the body as received again on every hit is cheaper than copying what it was parsed to, on both set and hit
+            size = len(entry["body"])
+            entry = {**entry, "headers": dict(entry["headers"]), "json": None, "data": None}
+        else:
+            size = len(json.dumps(entry["json"])) if entry["json"] is not None else len(entry["data"] or "")
+            entry = copy.deepcopy(entry)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = ({**entry, "stored_at": self._clock()}, size)
+        self.size += size
+        while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.size > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+
+    async def delete(self, key):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+
+
+class FileCache(AbstractCache):
+    """
+    Stores every entry in a JSON file of its own, so that cached responses survive restarts
+    and can be shared between processes
+
+    Arguments:
+
+        directory (str): Directory to store entries in. Created if it doesn't exist
+
+        ttl (float): Seconds after which an entry is dropped. Defaults to keeping entries forever
+    """
+
+    def __init__(self, directory, ttl=None, clock=time.time):
+        self.directory = directory
+        self.ttl = ttl
+        self._clock = clock
+        os.makedirs(directory, exist_ok=True)
+
+    def _path_of(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    async def get(self, key):
+        try:
+            async with aiofiles.open(self._path_of(key), "r") as f:
+                entry = json.loads(await f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+        if self.ttl is not None and self._clock() - entry["stored_at"] > self.ttl:
+            await self.delete(key)
+            return None
+        return entry
+
+    async def set(self, key, entry):
+        path = self._path_of(key)
+        # Write to a temporary file first, so that readers never see a half written entry
+        tmp_path = f"{path}.{os.getpid()}.{id(entry)}.tmp"
+        async with aiofiles.open(tmp_path, "w") as f:
+            entry = {k: v for k, v in entry.items() if k not in RAW_BODY_KEYS}
+            await f.write(json.dumps({**entry, "stored_at": self._clock()}))
+        os.replace(tmp_path, path)
+
+    async def delete(self, key):
+        try:
+            await async_os.remove(self._path_of(key))
+        except FileNotFoundError:
+            pass
+
+
+def _cache_key(request):
+    """
+    Returns the cache key of a request, or None if its response shouldn't be cached.
+
+    The key is made of the URL (API keys included) and a digest of the ``Authorization`` header,
+    so that users never get each other's responses
+    """
+    if (
+        (request.method or "GET").upper() != "GET"
+        or request.json is not None
+        or request.data is not None
+        or request.media_upload is not None
+        or request.media_download is not None
+    ):
+        return None
+    authorization = request.headers.get("Authorization") or ""
+    identity = hashlib.sha256(authorization.encode("utf-8")).hexdigest() if authorization else "anon"
+    return f"{identity} {request.url}"
+
+
+async def _decode_entry(entry, codec, stats):
+    """
+    Returns the ``(json, data)`` of an entry, parsing its body as received if it has one
+    """
+    if entry.get("body") is None:
+        return entry["json"], entry["data"]
+    if codec is not None:
+        return await codec.decode(entry["body"], entry["content_encoding"], entry["content_type"], entry["charset"], stats)
+    return _decode_body(json.loads, entry["body"], entry["content_encoding"], entry["content_type"], entry["charset"])
+
+
+async def _send_cached(cache, request, send, stats, codec=None):
+    """
+    Sends ``request`` conditionally if a response with an ETag was cached for it, and serves the cached body on a 304.
+    Stores new responses that have an ETag.
+
+    Cached bodies are parsed with ``codec`` (an ``aiogoogle.sessions.codec.JsonCodec``) if given, so that large ones are parsed off the event loop
+    """
+    key = _cache_key(request)
+    if key is None:
+        return await send(request)
+
+    entry = await cache.get(key)
+    conditional = entry is not None and "If-None-Match" not in request.headers
+    if conditional:
+        request.headers["If-None-Match"] = entry["etag"]
+    try:
+        response = await send(request)
+    finally:
+        # The same request object is reused for the next pages
+        if conditional:
+            request.headers.pop("If-None-Match", None)
+
+    if response.status_code == 304 and conditional:
+        stats.cache_hits += 1
+        response = copy.copy(response)
+        response.status_code = entry["status_code"]
+        fresh_headers = {k: v for k, v in dict(response.headers or {}).items() if k.lower() != "content-length"}
+        response.headers = {**entry["headers"], **fresh_headers}
+        response.json, response.data = await _decode_entry(entry, codec, stats)
+        return response
+
+    stats.cache_misses += 1
+    etag = (response.headers or {}).get("ETag")
+    # Set by sessions that keep the body as received for the cache
+    raw_body = getattr(response, "_raw_body", None)
+    response._raw_body = None
+    if response.status_code == 200 and etag and not isinstance(response.data, bytes):
+        entry = {
+            "etag": etag,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "json": response.json,
+            "data": response.data,
+        }
+        if raw_body is not None:
+            entry.update(zip(RAW_BODY_KEYS, raw_body))
+        await cache.set(key, entry)
+    return response
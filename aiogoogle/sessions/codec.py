@@ -0,0 +1,180 @@
+__all__ = ["JsonCodec"]
+
+import asyncio
+import importlib
+import re
+import zlib
+
+# Same content types aiohttp's ``ClientResponse.json()`` accepts e.g. application/json and application/problem+json
+_JSON_CONTENT_TYPE = re.compile(r"^application/(?:[\w.+-]+?\+)?json")
+
+
+def _decompress(body, content_encoding):
+    content_encoding = (content_encoding or "").strip().lower()
+    if content_encoding in ("gzip", "x-gzip"):
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    if content_encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate streams, without a zlib header
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def _decode_body(loads, body, content_encoding, content_type, charset):
+    """
+    Decompresses and decodes a response body the same way ``AiohttpSession`` does with aiohttp's ``json()``, ``text()`` and ``read()``
+
+    Returns:
+
+        tuple: ``(json, data)``
+    """
+    body = _decompress(body, content_encoding)
+    if _JSON_CONTENT_TYPE.match(content_type or ""):
+        if not body.strip():
+            return None, None
+        try:
+            if charset is None or charset.lower() in ("utf-8", "utf8"):
+                return loads(body), None
+            return loads(body.decode(charset)), None
+        except (ValueError, UnicodeDecodeError, LookupError):
+            pass
+    try:
+        return None, body.decode(charset or "utf-8")
+    except (UnicodeDecodeError, LookupError):
+        return None, body
+
+
+def _encode_body(dumps, value):
+    encoded = dumps(value)
+    if isinstance(encoded, str):
+        encoded = encoded.encode("utf-8")
+    return encoded
+
+
+def _exceeds(value, size):
+    """
+    Whether the JSON representation of ``value`` is roughly longer than ``size`` bytes.
+    Stops walking ``value`` as soon as it is, so that this costs at most as much as walking ``size`` bytes worth of it
+    """
+    stack = [value]
+    total = 0
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            total += len(value) + 3
+        elif isinstance(value, dict):
+            total += 2
+            for k, v in value.items():
+                total += len(k) + 4 if isinstance(k, str) else 8
+                stack.append(v)
+        elif isinstance(value, (list, tuple)):
+            total += 2
+            stack.extend(value)
+        else:
+            total += 8
+        if total >= size:
+            return True
+    return False
+
+
+class JsonCodec:
+    """
+    Parses JSON response bodies and serializes JSON request bodies, off the event loop once they're large enough.
+
+    Parsing (and decompressing) a response of a few megabytes e.g. a large BigQuery or Drive listing, blocks the event loop for tens of milliseconds,
+    stalling all the other requests in flight. Bodies past ``offload_threshold`` are handled by ``executor`` instead.
+
+    Pass one to ``aiogoogle.Aiogoogle(offload_json=...)``, or pass ``offload_json=True`` to create one with the default settings.
+    Check ``stats.bodies_offloaded`` and ``stats.bytes_offloaded`` for how much was offloaded.
+    Needs a version of aiohttp that accepts ``auto_decompress`` per request
+
+    Arguments:
+
+        offload_threshold (int): Size in bytes (as sent over the wire, compressed or not) from which bodies are handled by ``executor``. Smaller ones are handled inline
+
+        executor (concurrent.futures.Executor):
+
+            * Executor to handle large bodies in. Defaults to the event loop's default executor (a thread pool)
+
+            * A ``ProcessPoolExecutor`` also works, as long as the functions of ``backend`` can be pickled (the ones of json, orjson and ujson can)
+
+        backend (str, module): JSON library to use: "json", "orjson", "ujson", or any object with ``loads`` and ``dumps`` functions
+    """
+
+    def __init__(self, offload_threshold=256 * 1024, executor=None, backend="json"):
+        if offload_threshold < 0:
+            raise ValueError("offload_threshold can't be negative")
+        if isinstance(backend, str):
+            backend = importlib.import_module(backend)
+        self.offload_threshold = offload_threshold
+        self.executor = executor
+        self.loads = backend.loads
+        self.dumps = backend.dumps
+
+    @classmethod
+    def from_option(cls, offload_json):
+        """
+        Returns a ``JsonCodec`` given either a ``JsonCodec``, a bool or None
+        """
+        if offload_json is None or offload_json is False:
+            return None
+        if offload_json is True:
+            return cls()
+        if isinstance(offload_json, JsonCodec):
+            return offload_json
+        raise TypeError("offload_json should be a bool or a JsonCodec")
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def decode(self, body, content_encoding, content_type, charset, stats):
+        """
+        Decompresses and decodes a response body
+
+        Arguments:
+
+            body (bytes): Body as received, i.e. still compressed if it was sent compressed
+
+            content_encoding (str): ``Content-Encoding`` header of the response
+
+            content_type (str): Content type of the response, without parameters
+
+            charset (str): Charset of the response, if any
+
+            stats (aiogoogle.sessions.common.SessionStats): Counters to record offloaded bodies to
+
+        Returns:
+
+            tuple: ``(json, data)``. ``json`` is the parsed body if it's JSON, otherwise ``data`` is the body as text, or as bytes if it isn't text
+        """
+        if len(body) < self.offload_threshold:
+            return _decode_body(self.loads, body, content_encoding, content_type, charset)
+        stats.bodies_offloaded += 1
+        stats.bytes_offloaded += len(body)
+        return await self._run(_decode_body, self.loads, body, content_encoding, content_type, charset)
+
+    async def encode(self, value, stats):
+        """
+        Serializes a request body
+
+        Arguments:
+
+            value: JSON serializable value
+
+            stats (aiogoogle.sessions.common.SessionStats): Counters to record offloaded bodies to
+
+        Returns:
+
+            bytes: UTF-8 encoded JSON
+        """
+        if not _exceeds(value, self.offload_threshold):
+            return _encode_body(self.dumps, value)
+        encoded = await self._run(_encode_body, self.dumps, value)
+        stats.bodies_offloaded += 1
+        stats.bytes_offloaded += len(encoded)
+        return encoded
+
+    def __repr__(self):
+        return f"JsonCodec(offload_threshold={self.offload_threshold}, executor={self.executor!r}, backend={getattr(self.loads, '__module__', None)!r})"
@@ -0,0 +1,357 @@
+__all__ = ["SessionStats", "RetryPolicy"]
+
+from contextvars import ContextVar
+import datetime
+import random
+from email.utils import parsedate_to_datetime
+
+from ..models import MAX_BATCH_SIZE, Request
+
+# Attempts the requests being sent already used up, e.g. as parts of a batch request that failed. Set by ``_send_batched``
+_attempts_used = ContextVar("attempts_used", default=0)
+
+
+class SessionStats:
+    """
+    Counters collected by sessions while sending requests.
+
+    A single instance can be shared by many sessions (``aiogoogle.Aiogoogle`` does this with ``aiogoogle.Aiogoogle.stats``)
+    so that numbers add up across context managers and paginated calls.
+
+    Attributes:
+
+        connections_opened (int): Number of new (TCP + TLS) connections opened
+
+        connections_reused (int): Number of requests that were sent over an already open keep-alive connection
+
+        retries (int): Number of times a request was sent again after a transient error
+
+        deduplicated (int): Number of requests that got the response of an identical request that was already in flight, instead of being sent
+
+        cache_hits (int): Number of responses served from the response cache after the server answered a conditional request with a 304
+
+        cache_misses (int): Number of cacheable requests that got a full response
+
+        bodies_offloaded (int): Number of JSON bodies that were parsed or serialized in an executor instead of on the event loop
+
+        bytes_offloaded (int): Total size of the bodies counted by ``bodies_offloaded``
+
+        pages_fetched (int): Number of next pages requested while paginating through responses. Fewer with ``maximize_page_size``
+    """
+
+    def __init__(self):
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.retries = 0
+        self.deduplicated = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bodies_offloaded = 0
+        self.bytes_offloaded = 0
+        self.pages_fetched = 0
+
+    def as_dict(self) -> dict:
+        """ Returns a snapshot of all counters """
+        return dict(self.__dict__)
+
+    def __repr__(self):
+        counters = ", ".join(f"{k}={v}" for k, v in self.__dict__.items())
+        return f"SessionStats({counters})"
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests should be sent again and how long to wait before doing so.
+
+    Delays grow exponentially: ``initial_backoff * multiplier ** (attempt - 1)``, capped by ``max_backoff``.
+
+    Arguments:
+
+        max_attempts (int): Maximum number of times a request is sent, including the first attempt
+
+        initial_backoff (float): Delay in seconds before the first retry
+
+        max_backoff (float): Maximum delay in seconds between two attempts
+
+        multiplier (float): Factor the delay grows by after each attempt
+
+        jitter (float):
+
+            * Fraction of the delay that's randomized to avoid many clients retrying in lockstep
+
+            * 0 disables jitter. 1 picks a delay anywhere between 0 and the exponential delay ("full jitter")
+
+        retry_statuses (Iterable[int]): HTTP statuses to retry requests of idempotent methods on
+
+        idempotent_methods (Iterable[str]): HTTP methods that are safe to send again
+
+        non_idempotent_retry_statuses (Iterable[int]):
+
+            * HTTP statuses to retry requests of non idempotent methods (e.g. POST, PATCH) on
+
+            * Defaults to 429 only, because Google didn't process the request if it was rate limited
+
+        respect_retry_after (bool): Wait for at least as long as the ``Retry-After`` header of the response asks for
+
+        max_retry_after (float): Give up instead of waiting when ``Retry-After`` asks for longer than this many seconds
+
+    Note:
+
+        Connection errors (e.g. a dropped keep-alive connection) and timeouts are only retried for idempotent methods,
+        since there's no telling whether the server received the request or not.
+        Batch requests are retried as idempotent requests if all of their parts are.
+        Requests that stream their body from, or their response to, an object (``pipe_from``, ``pipe_to``) are never retried.
+    """
+
+    def __init__(
+        self,
+        max_attempts=5,
+        initial_backoff=0.5,
+        max_backoff=32,
+        multiplier=2,
+        jitter=1.0,
+        retry_statuses=(429, 500, 502, 503, 504),
+        idempotent_methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+        non_idempotent_retry_statuses=(429,),
+        respect_retry_after=True,
+        max_retry_after=60,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts should be at least 1")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter should be between 0 and 1")
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.non_idempotent_retry_statuses = frozenset(non_idempotent_retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def is_idempotent(self, request) -> bool:
+        # A batch request is a POST, but sending it again is as safe as sending its parts again
+        if request.batch:
+            return all(self.is_idempotent(part) for part in request.batch)
+        return (request.method or "GET").upper() in self.idempotent_methods
+
+    def should_retry(self, request, attempt, response=None, exc=None) -> bool:
+        """
+        Arguments:
+
+            request (aiogoogle.models.Request): The request that failed
+
+            attempt (int): Number of times the request was sent so far
+
+            response (aiogoogle.models.Response): Response received, if any
+
+            exc (Exception): Transient error raised while sending the request, if any
+
+        Returns:
+
+            bool: Whether or not to send the request again
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if request.media_upload is not None and request.media_upload.pipe_from is not None:
+            return False
+        if request.media_download is not None and request.media_download.pipe_to is not None:
+            return False
+        if exc is not None:
+            return self.is_idempotent(request)
+        if response is None:
+            return False
+        if self.is_idempotent(request):
+            retryable = response.status_code in self.retry_statuses
+        else:
+            retryable = response.status_code in self.non_idempotent_retry_statuses
+        if retryable and self.respect_retry_after:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > self.max_retry_after:
+                return False
+        return retryable
+
+    def get_delay(self, attempt, response=None) -> float:
+        """
+        Returns how many seconds to wait before sending a request for the ``attempt + 1``th time
+        """
+        backoff = min(self.initial_backoff * self.multiplier ** (attempt - 1), self.max_backoff)
+        delay = backoff * (1 - self.jitter * random.random())
+        if response is not None and self.respect_retry_after:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        return delay
+
+    @staticmethod
+    def get_retry_after(response):
+        """
+        Returns the number of seconds the ``Retry-After`` header of a response asks to wait for, if any
+        """
+        headers = response.headers or {}
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+        return max((retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0)
+
+    def __repr__(self):
+        return f"RetryPolicy(max_attempts={self.max_attempts}, initial_backoff={self.initial_backoff}, max_backoff={self.max_backoff})"
+
+
+async def _send_with_retries(send_once, request, retry_policy, stats, sleep, transient_errors):
+    """
+    Calls ``send_once(request)`` until it returns a response that ``retry_policy`` doesn't want retried.
+
+    Arguments:
+
+        send_once (callable): Coroutine function that sends the request and returns an ``aiogoogle.models.Response``
+
+        sleep (callable): Coroutine function of the session's event loop that sleeps for n seconds
+
+        transient_errors (tuple): Exceptions of the session's HTTP library that are worth retrying
+
+    Attempts ``request`` already used up as part of a batch request count towards ``retry_policy.max_attempts``
+    """
+    if retry_policy is None:
+        return await send_once(request)
+
+    attempt = _attempts_used.get()
+    while True:
+        attempt += 1
+        try:
+            response = await send_once(request)
+        except transient_errors as e:
+            if not retry_policy.should_retry(request, attempt, exc=e):
+                raise
+            delay = retry_policy.get_delay(attempt)
+        else:
+            if not retry_policy.should_retry(request, attempt, response=response):
+                return response
+            delay = retry_policy.get_delay(attempt, response)
+        stats.retries += 1
+        await sleep(delay)
+
+
+def _unpack_requests(requests):
+    """
+    Returns the requests passed to ``send_iter``: Either the positional arguments it was given,
+    or the only one of them if that's an iterable of requests (e.g. a generator)
+    """
+    if len(requests) == 1 and not isinstance(requests[0], Request):
+        return requests[0]
+    return requests
+
+
+# Options of ``send`` that only ``AiohttpSession`` implements
+AIOHTTP_ONLY_OPTIONS = ("max_concurrency", "rate_limiter", "auto_batch", "deduplicate", "cache", "offload_json")
+
+
+def _reject_unsupported_options(session, options):
+    """
+    Raises NotImplementedError if any of the ``AIOHTTP_ONLY_OPTIONS`` is set in the keyword arguments ``session`` was sent with,
+    rather than sending the requests without it
+    """
+    unsupported = [name for name in AIOHTTP_ONLY_OPTIONS if options.get(name) not in (None, False)]
+    if unsupported:
+        raise NotImplementedError(
+            f"Not supported by {type(session).__name__}: {', '.join(unsupported)}. Use AiohttpSession instead"
+        )
+
+
+def _get_batch_size(batch):
+    """
+    Returns the maximum number of requests per batch given the ``batch`` option of a session. 0 means don't batch
+    """
+    if batch is None or batch is False:
+        return 0
+    if batch is True:
+        return MAX_BATCH_SIZE
+    if not isinstance(batch, int) or not 0 < batch <= MAX_BATCH_SIZE:
+        raise ValueError(f"batch should be a bool or an int between 1 and {MAX_BATCH_SIZE}")
+    return batch
+
+
+async def _send_batched(requests, send_all, batch_size, retry_policy, stats, sleep):
+    """
+    Packs requests that share a ``batch_url`` in batch requests of up to ``batch_size`` requests each,
+    sends them and unpacks their responses.
+
+    Only the parts that failed with a status ``retry_policy`` wants retried are sent again, in a new batch.
+    Requests that can't be batched (e.g. media uploads) or that would end up alone in a batch are sent as is.
+
+    Arguments:
+
+        send_all (callable): Coroutine function that takes a list of requests and returns a list of their responses, in the same order
+
+        sleep (callable): Coroutine function of the session's event loop that sleeps for n seconds
+
+    Returns:
+
+        list: ``aiogoogle.models.Response`` objects in the same order as ``requests``
+    """
+    responses = [None] * len(requests)
+    pending = list(range(len(requests)))
+    attempt = 0
+    while pending:
+        attempt += 1
+        groups = {}
+        outgoing = []  # (indices of the requests in `requests`, request to send)
+        for i in pending:
+            if requests[i]._is_batchable():
+                groups.setdefault(requests[i].batch_url, []).append(i)
+            else:
+                outgoing.append(([i], requests[i]))
+        for indices in groups.values():
+            for start in range(0, len(indices), batch_size):
+                chunk = indices[start:start + batch_size]
+                if len(chunk) == 1:
+                    outgoing.append((chunk, requests[chunk[0]]))
+                else:
+                    outgoing.append((chunk, Request.batch_requests(*[requests[i] for i in chunk])))
+
+        # Parts sent again on their own only have the attempts left that they didn't use as parts of batches
+        token = _attempts_used.set(attempt - 1)
+        try:
+            results = await send_all([request for _, request in outgoing])
+        finally:
+            _attempts_used.reset(token)
+
+        retry = []
+        delay = 0
+        for (indices, request), response in zip(outgoing, results):
+            if request.batch is None:
+                # Already retried by the session if needed
+                responses[indices[0]] = response
+                continue
+            if response.status_code >= 400:
+                # The whole batch failed e.g. bad auth
+                parts = [response] * len(indices)
+            else:
+                parts = response.unbatch()
+            for i, part in zip(indices, parts):
+                responses[i] = part
+                if (
+                    retry_policy is not None
+                    and part is not response
+                    and retry_policy.should_retry(requests[i], attempt, response=part)
+                ):
+                    retry.append(i)
+                    delay = max(delay, retry_policy.get_delay(attempt, part))
+
+        pending = retry
+        if pending:
+            stats.retries += len(pending)
+            await sleep(delay)
+    return responses
@@ -3,12 +3,75 @@ __all__ = ["CurioAsksSession"]
 import curio
 import asks
 from asks import Session
+from asks.errors import ConnectivityError
 
 from .abc import AbstractSession
+from .common import SessionStats, _reject_unsupported_options, _send_with_retries, _unpack_requests
 from ..models import Response
 
 asks.init("curio")
 
+# Errors worth sending a request again for, given a retry policy
+TRANSIENT_ERRORS = (ConnectivityError, OSError)
+
+
+class _AsCompleted:
+    """
+    Async iterator that yields the results of ``get_result(request)`` in the order in which they complete.
+
+    Curio refuses to iterate over async generators that need finalization, hence the class.
+    The requests that haven't completed are cancelled as soon as it's closed: By ``aclose()``, at the end of an ``async with`` block or on error.
+    """
+
+    def __init__(self, requests, get_result, timeout=None):
+        self._requests = requests
+        self._get_result = get_result
+        self._timeout = timeout
+        self._remaining = len(requests)
+        self._queue = None
+        self._tasks = []
+        self._deadline = None
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _put_result(self, request):
+        await self._queue.put(await self._get_result(request))
+
+    async def __anext__(self):
+        if self._remaining == 0:
+            raise StopAsyncIteration
+        if self._queue is None:
+            self._queue = curio.Queue()
+            if self._timeout is not None:
+                self._deadline = await curio.clock() + self._timeout
+            for request in self._requests:
+                self._tasks.append(await curio.spawn(self._put_result, request, daemon=True))
+        try:
+            if self._deadline is None:
+                result = await self._queue.get()
+            else:
+                result = await curio.timeout_after(max(self._deadline - await curio.clock(), 0), self._queue.get)
+        except BaseException:
+            await self.aclose()
+            raise
+        self._remaining -= 1
+        return result
+
+    async def aclose(self):
+        """ Cancels the requests that haven't completed yet """
+        self._remaining = 0
+        # Waits for the requests to be cancelled, even if closing because the caller was cancelled
+        async with curio.disable_cancellation():
+            for task in self._tasks:
+                await task.cancel()
+
 
 class CurioAsksSession(Session, AbstractSession):
     def __init__(self, *args, **kwargs):
@@ -16,15 +79,15 @@ class CurioAsksSession(Session, AbstractSession):
             del kwargs["timeout"]
             kwargs.pop("timeout", None)
         super().__init__(*args, **kwargs)
+        self.stats = SessionStats()
+
+    def _make_response_getter(self, raise_for_status, session_factory, retry_policy=None, stats=None):
+        """
+        Returns a coroutine function that sends a request and returns an ``aiogoogle.models.Response``
+        """
+        session_factory = self.__class__ if session_factory is None else session_factory
+        stats = stats or self.stats
 
-    async def send(
-        self,
-        *requests,
-        timeout=None,
-        full_res=False,
-        raise_for_status=True,
-        session_factory=None
-    ):
         async def resolve_response(request, response):
             data = None
             json = None
@@ -90,14 +153,35 @@ class CurioAsksSession(Session, AbstractSession):
                     # verify=request._verify_ssl,
                 )
 
-        # ----------------- send sequence ------------------#
-        async def get_response(request):
+        async def send_once(request):
             response = await fire_request(request)
-            response = await resolve_response(request, response)
+            return await resolve_response(request, response)
+
+        async def get_response(request):
+            response = await _send_with_retries(
+                send_once, request, retry_policy, stats, curio.sleep, TRANSIENT_ERRORS
+            )
             if raise_for_status is True:
                 response.raise_for_status()
             return response
 
+        return get_response
+
+    async def send(
+        self,
+        *requests,
+        timeout=None,
+        full_res=False,
+        raise_for_status=True,
+        session_factory=None,
+        retry_policy=None,
+        stats=None,
+        **kwargs
+    ):
+        _reject_unsupported_options(self, kwargs)
+        get_response = self._make_response_getter(raise_for_status, session_factory, retry_policy, stats)
+
+        # ----------------- send sequence ------------------#
         async def get_content(request):
             response = await get_response(request)
             return response.content
@@ -116,8 +200,6 @@ class CurioAsksSession(Session, AbstractSession):
                     ]
             return await curio.gather(tasks)
 
-        session_factory = self.__class__ if session_factory is None else session_factory
-
         if timeout is not None:
             async with curio.timeout_after(timeout):
                 results = await execute_tasks()
@@ -128,3 +210,26 @@ class CurioAsksSession(Session, AbstractSession):
             return results[0]
         else:
             return results
+
+    def send_iter(
+        self,
+        *requests,
+        timeout=None,
+        full_res=False,
+        raise_for_status=True,
+        session_factory=None,
+        retry_policy=None,
+        stats=None,
+        **kwargs
+    ):
+        _reject_unsupported_options(self, kwargs)
+        get_response = self._make_response_getter(raise_for_status, session_factory, retry_policy, stats)
+
+        async def get_result(request):
+            try:
+                result = await get_response(request)
+            except Exception as e:
+                return request, e
+            return request, result if full_res is True else result.content
+
+        return _AsCompleted(tuple(_unpack_requests(requests)), get_result, timeout)
@@ -0,0 +1,119 @@
+__all__ = ["SingleFlight"]
+
+import asyncio
+import copy
+
+
+def _copy_response(response, request):
+    """
+    Returns a copy of ``response`` for the caller that sent ``request``.
+    Callers are free to modify the content of their copy, or to paginate with it.
+    """
+    response = copy.copy(response)
+    response.json = copy.deepcopy(response.json)
+    response.req = request
+    return response
+
+
+class SingleFlight:
+    """
+    Makes concurrent identical requests share one network call.
+
+    Two requests are identical if they have the same HTTP method, URL and ``Authorization`` header.
+    Only GET and HEAD requests that neither carry a body nor upload or download media are deduplicated.
+    Every caller gets its own copy of the response.
+
+    Pass one to ``aiogoogle.Aiogoogle(deduplicate=...)``, or pass ``deduplicate=True`` to create one
+
+    Attributes:
+
+        in_flight (int): Number of distinct requests currently in flight
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+
+    @classmethod
+    def from_option(cls, deduplicate):
+        """
+        Returns a ``SingleFlight`` given either a ``SingleFlight``, a bool or None
+        """
+        if deduplicate is None or deduplicate is False:
+            return None
+        if deduplicate is True:
+            return cls()
+        if isinstance(deduplicate, SingleFlight):
+            return deduplicate
+        raise TypeError("deduplicate should be a bool or a SingleFlight")
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    @staticmethod
+    def _key_of(request):
+        method = (request.method or "GET").upper()
+        if (
+            method not in ("GET", "HEAD")
+            or request.json is not None
+            or request.data is not None
+            or request.media_upload is not None
+            or request.media_download is not None
+        ):
+            return None
+        return method, request.url, request.headers.get("Authorization")
+
+    async def send(self, request, send, stats):
+        """
+        Sends ``request`` with ``send`` unless an identical request is already in flight,
+        in which case it waits for the response of that request instead
+
+        Arguments:
+
+            request (aiogoogle.models.Request): Request to send
+
+            send (callable): Coroutine function that sends a request and returns an ``aiogoogle.models.Response``
+
+            stats (aiogoogle.sessions.common.SessionStats): Counters to record deduplicated requests to
+
+        Returns:
+
+            aiogoogle.models.Response:
+        """
+        key = self._key_of(request)
+        if key is None:
+            return await send(request)
+
+        while key in self._in_flight:
+            future = self._in_flight[key]
+            try:
+                response = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The request we were waiting for was cancelled, not us. Try again
+                    continue
+                raise
+            stats.deduplicated += 1
+            return _copy_response(response, request)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response = await send(request)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Don't complain about an unretrieved exception if nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            # Keep the shared response untouched until all of the waiting callers got their copies
+            return _copy_response(response, request)
+        finally:
+            del self._in_flight[key]
+
+    def __repr__(self):
+        return f"SingleFlight(in_flight={self.in_flight})"
@@ -0,0 +1,417 @@
+__all__ = ["ConcurrencyLimiter", "AdaptiveConcurrencyLimiter", "HostWindow", "TokenBucket", "RateLimiter"]
+
+import asyncio
+import time
+from urllib.parse import urlparse
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of requests a session has in flight at a time.
+
+    Share one instance between many ``send`` calls (``aiogoogle.Aiogoogle(max_concurrency=...)`` does this for you)
+    to cap the total number of in-flight requests of your application.
+
+    Arguments:
+
+        max_concurrency (int): Maximum number of requests in flight
+
+    Attributes:
+
+        in_flight (int): Number of requests currently in flight
+
+        queue_depth (int): Number of requests waiting to be sent
+    """
+
+    def __init__(self, max_concurrency: int):
+        if not isinstance(max_concurrency, int) or isinstance(max_concurrency, bool) or max_concurrency < 1:
+            raise ValueError("max_concurrency should be a positive int")
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.queue_depth = 0
+        # Created lazily, so that the limiter is bound to the running event loop.
+        self._semaphore = None
+
+    @classmethod
+    def from_option(cls, max_concurrency):
+        """
+        Returns a limiter given either a limiter, an int or None
+        """
+        if max_concurrency is None or isinstance(max_concurrency, ConcurrencyLimiter):
+            return max_concurrency
+        return cls(max_concurrency)
+
+    def _enqueue(self, n):
+        self.queue_depth += n
+
+    def _dequeue(self, n=1):
+        self.queue_depth -= n
+
+    async def acquire(self, request):
+        """
+        Waits until there's a free slot for ``request``
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self._semaphore.acquire()
+        self.in_flight += 1
+
+    def release(self, request, response=None, exc=None):
+        """
+        Frees the slot taken by ``request`` once a response or an exception is received
+        """
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def observe(self, request, response=None, exc=None, latency=None):
+        """
+        Called after every attempt at sending a request, including the ones that are retried afterwards.
+        Does nothing by default, subclasses may use it to adapt to how the server is doing.
+
+        Arguments:
+
+            request (aiogoogle.models.Request): Request that was sent
+
+            response (aiogoogle.models.Response): Response received, if any
+
+            exc (Exception): Transient error raised while sending the request, if any
+
+            latency (float): Seconds it took to get the response or the error
+        """
+
+    def __repr__(self):
+        return (
+            f"ConcurrencyLimiter(max_concurrency={self.max_concurrency}, "
+            f"in_flight={self.in_flight}, queue_depth={self.queue_depth})"
+        )
+
+
+class HostWindow:
+    """
+    Congestion window of a single host, as managed by ``AdaptiveConcurrencyLimiter``
+
+    Attributes:
+
+        window (float): Number of requests allowed in flight to this host
+
+        in_flight (int): Number of requests currently in flight to this host
+
+        waiting (int): Number of requests waiting for the window to open up
+
+        increases (int): Number of times the window grew
+
+        decreases (int): Number of times the window shrank
+
+        last_decision (str): Either "increase", "decrease" or "hold"
+
+        last_decision_reason (str): Why the window shrank or held e.g. "status 429", "latency", "TimeoutError", "cooldown"
+
+        min_latency (float): Lowest latency observed for this host. Used as the baseline for latency checks
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.in_flight = 0
+        self.waiting = 0
+        self.increases = 0
+        self.decreases = 0
+        self.last_decision = None
+        self.last_decision_reason = None
+        self.min_latency = None
+        self._last_decrease_at = None
+        self._waiters = []
+
+    def as_dict(self) -> dict:
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+
+    def __repr__(self):
+        return f"HostWindow(window={self.window:.2f}, in_flight={self.in_flight}, last_decision={self.last_decision})"
+
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter):
+    """
+    Concurrency limiter that adapts the number of requests in flight to each host using AIMD
+    (Additive Increase, Multiplicative Decrease) just like TCP congestion control.
+
+    * Every healthy response grows the window of its host by ``increase / window``. i.e. by about ``increase`` per round trip
+
+    * A 429, a 503, a connection error or a latency above ``latency_tolerance`` times the lowest latency seen multiplies the window by ``decrease_factor``.
+      The window shrinks at most once per ``cooldown`` seconds, so that a burst of throttled responses only counts once
+
+    Pass it wherever a ``max_concurrency`` is accepted. e.g. ``Aiogoogle(max_concurrency=AdaptiveConcurrencyLimiter())``
+
+    Arguments:
+
+        initial_window (float): Window every host starts with
+
+        min_window (float): Window never shrinks below this
+
+        max_window (int): Window never grows beyond this. Also the maximum number of tasks a ``send`` call keeps alive
+
+        increase (float): Additive increase per round trip
+
+        decrease_factor (float): Multiplicative decrease on congestion
+
+        congestion_statuses (Iterable[int]): HTTP statuses that signal congestion
+
+        latency_tolerance (float): Treat responses slower than ``latency_tolerance * min_latency`` as congestion. Defaults to ignoring latency
+
+        cooldown (float): Minimum number of seconds between two decreases of the same window. Defaults to the host's lowest latency
+
+    Attributes:
+
+        hosts (dict): Maps hosts to their ``aiogoogle.sessions.limiters.HostWindow``
+    """
+
+    def __init__(
+        self,
+        initial_window=10,
+        min_window=1,
+        max_window=100,
+        increase=1,
+        decrease_factor=0.5,
+        congestion_statuses=(429, 503),
+        latency_tolerance=None,
+        cooldown=None,
+        clock=time.monotonic,
+    ):
+        super().__init__(max_window)
+        if not min_window <= initial_window <= max_window:
+            raise ValueError("initial_window should be between min_window and max_window")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor should be between 0 and 1")
+        self.initial_window = initial_window
+        self.min_window = max(min_window, 1)
+        self.max_window = max_window
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.congestion_statuses = frozenset(congestion_statuses)
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self._clock = clock
+        self.hosts = {}
+
+    @staticmethod
+    def _host_of(request):
+        url = request.media_upload.upload_path if request.media_upload is not None else request.url
+        return urlparse(url).netloc
+
+    def _get_host_window(self, host):
+        host_window = self.hosts.get(host)
+        if host_window is None:
+            host_window = self.hosts[host] = HostWindow(self.initial_window)
+        return host_window
+
+    @staticmethod
+    def _wake(host_window):
+        free_slots = int(host_window.window) - host_window.in_flight
+        for waiter in host_window._waiters[:max(free_slots, 0)]:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def acquire(self, request):
+        host_window = self._get_host_window(self._host_of(request))
+        while host_window.in_flight >= int(host_window.window):
+            waiter = asyncio.get_running_loop().create_future()
+            host_window._waiters.append(waiter)
+            host_window.waiting += 1
+            try:
+                await waiter
+            finally:
+                host_window._waiters.remove(waiter)
+                host_window.waiting -= 1
+        host_window.in_flight += 1
+        self.in_flight += 1
+
+    def release(self, request, response=None, exc=None):
+        host_window = self._get_host_window(self._host_of(request))
+        host_window.in_flight -= 1
+        self.in_flight -= 1
+        self._wake(host_window)
+
+    def observe(self, request, response=None, exc=None, latency=None):
+        host_window = self._get_host_window(self._host_of(request))
+        self._adjust(host_window, getattr(response, "status_code", None), exc, latency)
+        self._wake(host_window)
+
+    def _adjust(self, host_window, status_code, exc, latency):
+        if latency is not None and (host_window.min_latency is None or latency < host_window.min_latency):
+            host_window.min_latency = latency
+
+        if status_code in self.congestion_statuses:
+            reason = f"status {status_code}"
+        elif exc is not None:
+            reason = type(exc).__name__
+        elif (
+            self.latency_tolerance is not None
+            and latency is not None
+            and latency > self.latency_tolerance * host_window.min_latency
+        ):
+            reason = "latency"
+        else:
+            reason = None
+
+        if reason is None:
+            host_window.window = min(host_window.window + self.increase / host_window.window, self.max_window)
+            host_window.increases += 1
+            host_window.last_decision = "increase"
+            host_window.last_decision_reason = None
+            return
+
+        now = self._clock()
+        cooldown = self.cooldown if self.cooldown is not None else (host_window.min_latency or 0)
+        if host_window._last_decrease_at is not None and now - host_window._last_decrease_at < cooldown:
+            host_window.last_decision = "hold"
+            host_window.last_decision_reason = "cooldown"
+            return
+
+        host_window.window = max(host_window.window * self.decrease_factor, self.min_window)
+        host_window._last_decrease_at = now
+        host_window.decreases += 1
+        host_window.last_decision = "decrease"
+        host_window.last_decision_reason = reason
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the window of every host
+        """
+        return {host: host_window.as_dict() for host, host_window in self.hosts.items()}
+
+    def __repr__(self):
+        return f"AdaptiveConcurrencyLimiter(hosts={self.hosts}, queue_depth={self.queue_depth})"
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at ``rate`` tokens per second and holds up to ``burst`` tokens.
+
+    Arguments:
+
+        rate (float): Tokens added per second
+
+        burst (float): Maximum number of tokens the bucket can hold. Defaults to ``max(rate, 1)``
+
+        clock (callable): Returns the current time in seconds
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate should be positive")
+        self.rate = rate
+        self.burst = max(rate, 1) if burst is None else burst
+        self._clock = clock
+        self.tokens = self.burst
+        self._updated_at = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def time_until_available(self, cost=1) -> float:
+        """
+        Returns the number of seconds until ``cost`` tokens are available
+        """
+        self._refill()
+        # A request that costs more than the whole bucket waits until the bucket is full, then leaves it in debt for the rest
+        cost = min(cost, self.burst)
+        return max(cost - self.tokens, 0) / self.rate
+
+    def consume(self, cost=1):
+        self._refill()
+        self.tokens -= cost
+
+    def __repr__(self):
+        return f"TokenBucket(rate={self.rate}, burst={self.burst}, tokens={self.tokens:.2f})"
+
+
+class RateLimiter:
+    """
+    Client side rate limiter that paces requests per API and per method, before they're sent.
+
+    Keys are either:
+
+        * An API ID from a discovery document e.g. ``"drive:v3"`` (``aiogoogle.resource.GoogleAPI['id']``)
+
+        * A method ID e.g. ``"drive.files.list"`` (``aiogoogle.resource.Method['id']``)
+
+        * ``"*"`` to pace all requests
+
+    A request waits until every bucket that applies to it has enough tokens.
+    A batch request takes the tokens each of its parts would have taken if sent on its own.
+
+    Example:
+
+        ::
+
+            >>> limiter = RateLimiter(
+            ...     rates={
+            ...         "youtube:v3": (100, 1000),  # 100 units per second, bursts of up to 1000 units
+            ...         "drive.files.list": 5,  # 5 requests per second
+            ...     },
+            ...     costs={"youtube.search.list": 100},
+            ... )
+            >>> aiogoogle = Aiogoogle(rate_limiter=limiter)
+
+    Arguments:
+
+        rates (dict): Maps keys to either a rate (requests per second) or a ``(rate, burst)`` tuple
+
+        costs (dict): Maps method IDs to the number of tokens a request of that method takes. Defaults to 1. Useful for quota units
+
+    Attributes:
+
+        waiting (int): Number of requests waiting for tokens
+
+        waited (float): Total seconds requests spent waiting for tokens
+    """
+
+    GLOBAL_KEY = "*"
+
+    def __init__(self, rates=None, costs=None, clock=time.monotonic):
+        self.buckets = {}
+        for key, rate in (rates or {}).items():
+            rate, burst = rate if isinstance(rate, (tuple, list)) else (rate, None)
+            self.buckets[key] = TokenBucket(rate, burst, clock=clock)
+        self.costs = costs or {}
+        self.waiting = 0
+        self.waited = 0.0
+
+    def _buckets_for(self, request):
+        keys = (self.GLOBAL_KEY, request.api_id, request.method_id)
+        return [self.buckets[key] for key in keys if key is not None and key in self.buckets]
+
+    def _costs_for(self, request):
+        """
+        Returns the number of tokens ``request`` takes from each bucket
+        """
+        costs = {}
+        for part in request.batch or (request,):
+            cost = self.costs.get(part.method_id, 1)
+            for bucket in self._buckets_for(part):
+                costs[bucket] = costs.get(bucket, 0) + cost
+        return costs
+
+    async def acquire(self, request):
+        """
+        Waits until ``request`` is allowed to be sent, then takes its tokens
+        """
+        costs = self._costs_for(request)
+        if not costs:
+            return
+        self.waiting += 1
+        try:
+            while True:
+                delay = max(bucket.time_until_available(cost) for bucket, cost in costs.items())
+                if delay <= 0:
+                    # No awaits between checking and consuming. So, no other request can take these tokens meanwhile
+                    for bucket, cost in costs.items():
+                        bucket.consume(cost)
+                    return
+                self.waited += delay
+                await asyncio.sleep(delay)
+        finally:
+            self.waiting -= 1
+
+    def __repr__(self):
+        return f"RateLimiter(buckets={self.buckets}, waiting={self.waiting})"
@@ -1,14 +1,103 @@
 __all__ = ["TrioAsksSession"]
 
+import contextvars
+import math
+
 import trio
 import asks
 from asks import Session
+from asks.errors import ConnectivityError
 
 from .abc import AbstractSession
+from .common import SessionStats, _reject_unsupported_options, _send_with_retries, _unpack_requests
 from ..models import Response
 
 asks.init("trio")
 
+# Errors worth sending a request again for, given a retry policy
+TRANSIENT_ERRORS = (ConnectivityError, OSError)
+
+
+async def _send_all(requests, get_result, send_channel, cancel_scope, done):
+    async def send_result(request, send_channel):
+        async with send_channel:
+            await send_channel.send(await get_result(request))
+
+    try:
+        with cancel_scope:
+            async with send_channel, trio.open_nursery() as nursery:
+                for request in requests:
+                    nursery.start_soon(send_result, request, send_channel.clone())
+    finally:
+        done.set()
+
+
+class _AsCompleted:
+    """
+    Async iterator that yields the results of ``get_result(request)`` in the order in which they complete.
+
+    Trio doesn't allow yielding from inside a nursery, so the nursery the requests are sent from is owned by a system task instead.
+    It's cancelled as soon as the iterator is closed: By ``aclose()``, at the end of an ``async with`` block, on error or once it's garbage collected.
+    """
+
+    def __init__(self, requests, get_result, timeout=None):
+        self._requests = requests
+        self._get_result = get_result
+        self._timeout = timeout
+        self._remaining = len(requests)
+        self._receive_channel = None
+        self._cancel_scope = None
+        self._done = None
+        self._deadline = math.inf
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _start(self):
+        send_channel, self._receive_channel = trio.open_memory_channel(math.inf)
+        self._cancel_scope = trio.CancelScope()
+        self._done = trio.Event()
+        if self._timeout is not None:
+            self._deadline = trio.current_time() + self._timeout
+        # The task mustn't hold a reference to self, or self would never be garbage collected while requests are in flight
+        trio.lowlevel.spawn_system_task(
+            _send_all, self._requests, self._get_result, send_channel, self._cancel_scope, self._done, context=contextvars.copy_context()
+        )
+
+    async def __anext__(self):
+        if self._remaining == 0:
+            raise StopAsyncIteration
+        if self._receive_channel is None:
+            self._start()
+        try:
+            with trio.fail_at(self._deadline):
+                result = await self._receive_channel.receive()
+        except BaseException:
+            await self.aclose()
+            raise
+        self._remaining -= 1
+        return result
+
+    async def aclose(self):
+        """ Cancels the requests that haven't completed yet """
+        self._remaining = 0
+        if self._cancel_scope is not None:
+            self._cancel_scope.cancel()
+            # Shielded so that the requests are done with even if closing because the caller was cancelled
+            with trio.CancelScope(shield=True):
+                await self._done.wait()
+                await self._receive_channel.aclose()
+
+    def __del__(self):
+        if self._cancel_scope is not None:
+            self._cancel_scope.cancel()
+
 
 class TrioAsksSession(Session, AbstractSession):
     def __init__(self, *args, **kwargs):
@@ -16,16 +105,14 @@ class TrioAsksSession(Session, AbstractSession):
             del kwargs["timeout"]
             kwargs.pop("timeout", None)
         super().__init__(*args, **kwargs)
+        self.stats = SessionStats()
 
-    async def send(
-        self,
-        *requests,
-        timeout=None,
-        full_res=False,
-        raise_for_status=True,
-        session_factory=None
-    ):
-        responses = []
+    def _make_response_getter(self, raise_for_status, session_factory, retry_policy=None, stats=None):
+        """
+        Returns a coroutine function that sends a request and returns an ``aiogoogle.models.Response``
+        """
+        session_factory = self.__class__ if session_factory is None else session_factory
+        stats = stats or self.stats
 
         async def resolve_response(request, response):
             data = None
@@ -90,19 +177,42 @@ class TrioAsksSession(Session, AbstractSession):
                     # verify=request._verify_ssl,
                 )
 
-        # ----------------- send sequence ------------------#
-        async def get_response(request):
+        async def send_once(request):
             response = await fire_request(request)
-            response = await resolve_response(request, response)
+            return await resolve_response(request, response)
+
+        async def get_response(request):
+            response = await _send_with_retries(
+                send_once, request, retry_policy, stats, trio.sleep, TRANSIENT_ERRORS
+            )
             if raise_for_status is True:
                 response.raise_for_status()
+            return response
+
+        return get_response
+
+    async def send(
+        self,
+        *requests,
+        timeout=None,
+        full_res=False,
+        raise_for_status=True,
+        session_factory=None,
+        retry_policy=None,
+        stats=None,
+        **kwargs
+    ):
+        _reject_unsupported_options(self, kwargs)
+        responses = []
+        get_response = self._make_response_getter(raise_for_status, session_factory, retry_policy, stats)
+
+        # ----------------- send sequence ------------------#
+        async def append_response(request):
+            response = await get_response(request)
             responses.append(response)
 
-        async def get_content(request):
-            response = await fire_request(request)
-            response = await resolve_response(request, response)
-            if raise_for_status is True:
-                response.raise_for_status()
+        async def append_content(request):
+            response = await get_response(request)
             responses.append(response.content)
 
         # ----------------- /send sequence ------------------#
@@ -111,15 +221,13 @@ class TrioAsksSession(Session, AbstractSession):
             async with trio.open_nursery() as nursery:
                 if full_res is True:
                     list(
-                        map(lambda req: nursery.start_soon(get_response, req), requests)
+                        map(lambda req: nursery.start_soon(append_response, req), requests)
                     )
                 else:
                     list(
-                        map(lambda req: nursery.start_soon(get_content, req), requests)
+                        map(lambda req: nursery.start_soon(append_content, req), requests)
                     )
 
-        session_factory = self.__class__ if session_factory is None else session_factory
-
         if timeout is not None:
             with trio.move_on_after(timeout):
                 await execute_tasks()
@@ -130,3 +238,26 @@ class TrioAsksSession(Session, AbstractSession):
             return responses[0]
         else:
             return responses
+
+    def send_iter(
+        self,
+        *requests,
+        timeout=None,
+        full_res=False,
+        raise_for_status=True,
+        session_factory=None,
+        retry_policy=None,
+        stats=None,
+        **kwargs
+    ):
+        _reject_unsupported_options(self, kwargs)
+        get_response = self._make_response_getter(raise_for_status, session_factory, retry_policy, stats)
+
+        async def get_result(request):
+            try:
+                result = await get_response(request)
+            except Exception as e:
+                return request, e
+            return request, result if full_res is True else result.content
+
+        return _AsCompleted(tuple(_unpack_requests(requests)), get_result, timeout)
@@ -18,14 +18,17 @@ and more: https://tools.ietf.org/html/draft-zyp-json-schema-03
 """
 
 
-__all__ = ["validate"]
+__all__ = ["validate", "SchemaValidator", "ValidationPolicy"]
 
 import base64
 import datetime
+import itertools
+import random
 import warnings
 import re
 import rfc3339
 from functools import wraps
+from collections.abc import Mapping
 
 from .excs import ValidationError
 
@@ -370,128 +373,472 @@ def validate_all(instance, schema, schema_name=None):
     validate_enum(instance, schema, schema_name)
 
 
-# -- API --------------------
+# -- Compiled validators ---------------
+
+FORMAT_VALIDATORS = {
+    "int32": int32_validator,
+    "uint32": uint32_validator,
+    "double": double_validator,
+    "float": float_validator,
+    "null": null_validator,
+    "byte": byte_validator,
+    "date": date_validator,
+    "date-time": datetime_validator,
+    "int64": int64_validator,
+    "uint64": uint64_validator,
+}
 
+# Inline schemas (i.e. not $refs) whose validators are kept by a SchemaValidator
+MAX_CACHED_INLINE_SCHEMAS = 1024
 
-def validate(instance, schema, schemas=None, schema_name=None):
+
+def _compile_type_check(type_name):
     """
-    Arguments:
+    Same as the validator of a type, minus the overhead of ``handle_type_and_value_errors``: isinstance checks don't raise
+    """
+    req_types = JSON_PYTHON_TYPE_MAPPING[type_name]
 
-        Instance: Instance to validate
+    def check_type(instance, schema_name=None):
+        if not isinstance(instance, req_types):
+            raise ValidationError(
+                make_validation_error_msg(instance, str(req_types), schema_name)
+            )
 
-        schema: schema to validate instance against
+    return check_type
 
-        schemas: Full schamas dict to resolve refs if any
 
-        schema_name: Name of the schema (Useful if you want more meaningful errors)
+# Validators of the types that need checking. "any" needs none
+TYPE_VALIDATORS = {
+    type_name: _compile_type_check(type_name)
+    for type_name in ["array", "boolean", "integer", "number", "object", "string"]
+}
+TYPE_VALIDATORS["null"] = null_validator
+
+
+def _schema_error(exc_type, msg):
+    # For schemas that are only found to be broken once an instance is validated against them
+    def raise_error(instance, schema_name=None):
+        raise exc_type(msg)
+
+    return raise_error
+
+
+def _compile_leaf(schema):
+    """
+    Returns a validator that runs the same checks as ``validate_all``, in the same order,
+    with the checks that don't apply to ``schema`` left out
     """
+    checks = []
+
+    type_name = schema["type"]
+    if type_name in TYPE_VALIDATORS:
+        checks.append(TYPE_VALIDATORS[type_name])
+    elif type_name not in JSON_PYTHON_TYPE_MAPPING:
+        # Warns
+        checks.append(lambda instance, schema_name=None: validate_type(instance, schema, schema_name))
+
+    format_name = schema.get("format")
+    if format_name and format_name not in IGNORABLE_FORMATS:
+        if format_name in FORMAT_VALIDATORS:
+            checks.append(FORMAT_VALIDATORS[format_name])
+        else:
+            # Warns
+            checks.append(lambda instance, schema_name=None: validate_format(instance, schema, schema_name))
+
+    minimum = schema.get("minimum")
+    if minimum:
+        checks.append(lambda instance, schema_name=None: minimum_validator(instance, minimum, schema_name=schema_name))
+    maximum = schema.get("maximum")
+    if maximum:
+        checks.append(lambda instance, schema_name=None: maximum_validator(instance, maximum, schema_name=schema_name))
 
-    def resolve(schema):
+    pattern = schema.get("pattern")
+    if pattern is not None:
+        try:
+            compiled_pattern = re.compile(pattern)
+        except re.error:
+            # Fails the same way it always did, once it's used
+            checks.append(lambda instance, schema_name=None: validate_pattern(instance, schema, schema_name))
+        else:
+            def check_pattern(instance, schema_name=None):
+                if compiled_pattern.match(instance) is None:
+                    raise ValidationError(
+                        make_validation_error_msg(
+                            instance,
+                            f'Match this pattern: r"{pattern}"',
+                            schema_name=schema_name,
+                        )
+                    )
+
+            checks.append(check_pattern)
+
+    options = schema.get("enum")
+    if options is not None:
+        try:
+            option_set = frozenset(options)
+        except TypeError:
+            option_set = options
+
+        def check_enum(instance, schema_name=None):
+            try:
+                found = instance in option_set
+            except TypeError:  # Unhashable instance
+                found = instance in options
+            if not found:
+                option_string = ', '.join(f'"{o}"' for o in options)
+                raise ValidationError(
+                    make_validation_error_msg(
+                        instance,
+                        f'Must be one of the following: {option_string}',
+                        schema_name=schema_name
+                    )
+                )
+
+        checks.append(check_enum)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate_leaf(instance, schema_name=None):
+        for check in checks:
+            check(instance, schema_name=schema_name)
+
+    return validate_leaf
+
+
+class SchemaValidator:
+    """
+    Validates instances against the schemas of a discovery document.
+
+    Schemas are compiled into validator functions the first time they're used, so that validating against them again
+    doesn't walk them again: ``$ref``s are resolved, regex patterns compiled and the checks that don't apply are left out.
+    Validators of the schemas found in ``schemas`` are cached by name. ``aiogoogle.resource.GoogleAPI`` keeps one per API.
+
+    Arguments:
+
+        schemas (dict): Full schemas dict to resolve refs from, if any
+
+        max_array_items (int): Only validate this many items of each array. Defaults to all of them. See ``sampled``
+    """
+
+    def __init__(self, schemas=None, max_array_items=None):
+        if schemas is not None:
+            if not isinstance(schemas, Mapping):
+                raise TypeError("Schemas must be a dict")
+        if max_array_items is not None and (not isinstance(max_array_items, int) or max_array_items < 1):
+            raise ValueError("max_array_items should be a positive int")
+        self.schemas = schemas
+        self.max_array_items = max_array_items
+        self._refs = {}
+        self._inline = {}
+        self._sampled = {}
+
+    def __getstate__(self):
+        # Compiled validators are closures. They're compiled again once needed
+        return {"schemas": self.schemas, "max_array_items": self.max_array_items}
+
+    def __setstate__(self, state):
+        self.__init__(state["schemas"], state["max_array_items"])
+
+    def validate(self, instance, schema, schema_name=None):
+        """
+        Arguments:
+
+            Instance: Instance to validate
+
+            schema: schema to validate instance against
+
+            schema_name: Name of the schema (Useful if you want more meaningful errors)
+        """
+        self.validator_of(schema)(instance, schema_name=schema_name)
+
+    def validator_of(self, schema):
+        """
+        Returns the validator of a schema: A function that takes an instance and an optional ``schema_name``
+        """
+        # Mappings rather than dicts, because schemas can be backed by a ``aiogoogle.discovery_store.DiscoveryStore``
+        if not isinstance(schema, Mapping):
+            raise TypeError("Schema must be a dict")
+        if "$ref" in schema:
+            return self._ref_validator(schema)
+
+        # Keyed by id, because schemas are unhashable. The schema is kept alongside its validator so that its id isn't reused
+        cached = self._inline.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        validator = self._compile(schema)
+        if len(self._inline) >= MAX_CACHED_INLINE_SCHEMAS:
+            self._inline.clear()
+        self._inline[id(schema)] = (schema, validator)
+        return validator
+
+    def _resolve(self, schema):
         """
         Resolves schema from schemas
         if no $ref was found, returns original schema
         """
         if "$ref" in schema:
-            if schemas is None:
+            if self.schemas is None:
                 raise ValidationError(
                     f"Attempted to resolve a {str(schema)}, but no schemas ref were found to resolve from"
                 )
             try:
-                schema = schemas[schema["$ref"]]
+                schema = self.schemas[schema["$ref"]]
             except KeyError:
                 raise ValidationError(
                     f"Attempted to resolve {schema['$ref']}, but no results found."
                 )
         return schema
 
-    def validate_object():
-        # Validate instance is an object
-        object_validator(instance)  # dict validator, nothing jsonschema related
+    def _ref_validator(self, schema):
+        name = schema["$ref"]
+        validator = self._refs.get(name)
+        if validator is None:
+            validator = self._refs[name] = self._compile(self._resolve(schema))
+        return validator
 
+    def _compile(self, schema):
+        """
+        Compiles a schema that was already resolved
+        """
+        if not isinstance(schema, Mapping):
+            return _schema_error(TypeError, "Schema must be a dict")
+        if "type" not in schema:
+            return _schema_error(KeyError, "type")
+        if schema["type"] == "object":
+            return self._compile_object(schema)
+        if schema["type"] == "array":
+            return self._compile_array(schema)
+        return _compile_leaf(schema)
+
+    def _compile_object(self, schema):
         # 1. Resolve additional properties
         additional_properties = schema.get("additionalProperties")
         # Jsonschema draft 3
         if additional_properties is False or (
-            isinstance(additional_properties, dict) and len(additional_properties) == 0
+            isinstance(additional_properties, Mapping) and len(additional_properties) == 0
         ):
             additional_properties = None
-        if not isinstance(additional_properties, dict):
+        if not isinstance(additional_properties, Mapping):
             # Typically, additionalProperties should be either False, dict(schema) or empty.
             # Empty will default to None. And False, as shown above, also defaults to None.
             # Sometimes, it's a string, but strings shouldn't be schemas. Strings will be ignored.
             # There are too many of them to raise an error whenever we find one (around 75). So they'll just be ignored
-            # raise ValidationError(f'Invalid type of addiotional properties. Shoudl be either a dict or False')
             additional_properties = None
 
         # 2. Resolve properties
+        invalid_schema_msg = None
         if not schema.get("properties"):
             if not additional_properties:
-                raise ValidationError(
-                    f"""
+                invalid_schema_msg = f"""
                     Invalid Schema: {str(schema)}.
                     Neither properties nor addiotional properties found in this schema"""
-                )
             props = {}
         else:
             props = schema["properties"]
 
-        # 3. Raise warnings or fail on passed dict keys that aren't mentioned in the schema
-        for k, _ in instance.items():
-            if k not in props:
-                # If there's a schema for additional properties validate
-                if additional_properties is not None:
-                    # some additional properties are misused and
-                    # have many properties instead of just one.
-                    # Basically, additionalProperties is sort of like **kwargs,
-                    # you should only use one per statement/schema
-                    if "properties" not in additional_properties:
-                        validate(
-                            instance[k],
-                            additional_properties,
-                            schema_name=str(schema_name) + "/additionalProperties",
-                        )  # instace, schema for any additional props
+        # Nested schemas are compiled once the first instance is validated,
+        # which also keeps recursive schemas from being compiled forever
+        compiled = None
+
+        def compile_nested():
+            # some additional properties are misused and
+            # have many properties instead of just one.
+            # Basically, additionalProperties is sort of like **kwargs,
+            # you should only use one per statement/schema
+            if additional_properties is not None and "properties" not in additional_properties:
+                additional_validator = self.validator_of(additional_properties)
+            else:
+                additional_validator = None
+            prop_validators = []
+            for k, v in props.items():
+                if isinstance(v, Mapping) and "$ref" in v:
+                    required = self._resolve(v).get("required") is True
+                    prop_validators.append((k, required, self._ref_validator(v)))
                 else:
-                    warnings.warn(
-                        f"""
+                    required = isinstance(v, Mapping) and v.get("required") is True
+                    prop_validators.append((k, required, self._compile(v)))
+            return additional_validator, prop_validators
+
+        check_object = TYPE_VALIDATORS["object"]
+
+        def validate_object(instance, schema_name=None):
+            nonlocal compiled
+            # Validate instance is an object
+            check_object(instance)  # dict validator, nothing jsonschema related
+
+            if invalid_schema_msg is not None:
+                raise ValidationError(invalid_schema_msg)
+            if compiled is None:
+                compiled = compile_nested()
+            additional_validator, prop_validators = compiled
+
+            # 3. Raise warnings or fail on passed dict keys that aren't mentioned in the schema
+            for k, v in instance.items():
+                if k not in props:
+                    # If there's a schema for additional properties validate
+                    if additional_properties is not None:
+                        if additional_validator is not None:
+                            additional_validator(
+                                v, schema_name=str(schema_name) + "/additionalProperties"
+                            )
+                    else:
+                        warnings.warn(
+                            f"""
                         Item {k} was passed, but not mentioned in the
                         following schema {schema.get('id')}.\n\n
                         It will probably be discarded by the API you're using"""
-                    )
+                        )
+
+            # 4. Validate existing properties
+            for k, required, validator in prop_validators:
+                # Check if instance has the property, if not, check if it's required
+                if k not in instance:
+                    if required:
+                        raise ValidationError(f"Instance {k} is required")
+                else:
+                    validator(instance[k], schema_name=k)
 
-        # 4. Validate existing properties
-        for k, v in props.items():
-            # Check if there's a ref to resolve
-            v = resolve(v)
-            # Check if instance has the property, if not, check if it's required
-            if k not in instance:
-                if v.get("required") is True:
-                    raise ValidationError(f"Instance {k} is required")
-            else:
-                validate(instance[k], v, schemas, schema_name=k)
-
-    def validate_array():
-        array_validator(instance)
-        schema_ = resolve(schema["items"])
-        # Check if instance has the property, if not, check if it's required
-        for item in instance:
-            validate(item, schema_, schemas, schema_name=schema_name)
-
-    # Check schema and schemas are dicts.
-    # These errors shouldn't normally be raised, unless there's some messed up schema(s) being passed/reffed
-    if not isinstance(schema, dict):
-        raise TypeError("Schema must be a dict")
-    if schemas is not None:
-        if not isinstance(schemas, dict):
-            raise TypeError("Schemas must be a dict")
-    # Preliminary resolvement.
-    schema = resolve(schema)
-    # If object (Dict): iterate over each entry and recursively validate
-    if schema["type"] == "object":
-        validate_object()
-    # If array (list or tuple) iterate over each item and recursively validate
-    elif schema["type"] == "array":
-        # Validate instance is an array
-        validate_array()
-    # Else we reached the lowest level of a schema, validate
-    else:
-        validate_all(instance, schema, schema_name)
+        return validate_object
+
+    def _compile_array(self, schema):
+        items_validator = None
+        check_array = TYPE_VALIDATORS["array"]
+
+        def validate_array(instance, schema_name=None):
+            nonlocal items_validator
+            check_array(instance)
+            if items_validator is None:
+                items = schema["items"]
+                if isinstance(items, Mapping) and "$ref" in items:
+                    items_validator = self._ref_validator(items)
+                else:
+                    items_validator = self._compile(items)
+            for item in self._items_to_validate(instance):
+                items_validator(item, schema_name=schema_name)
+
+        return validate_array
+
+    def _items_to_validate(self, instance):
+        max_items = self.max_array_items
+        if max_items is None or len(instance) <= max_items:
+            return instance
+        if isinstance(instance, (list, tuple)):
+            # The first item is always checked, so that arrays of the wrong items are caught on the first try
+            return itertools.chain(
+                instance[:1], (instance[i] for i in random.sample(range(1, len(instance)), max_items - 1))
+            )
+        return itertools.islice(instance, max_items)
+
+    def sampled(self, max_array_items):
+        """
+        Returns a validator of the same schemas that only validates up to ``max_array_items`` items of each array.
+        The type of every array is still checked
+
+        Arguments:
+
+            max_array_items (int): Number of items to validate per array. The first item and randomly picked others
+        """
+        validator = self._sampled.get(max_array_items)
+        if validator is None:
+            validator = self._sampled[max_array_items] = SchemaValidator(self.schemas, max_array_items)
+        return validator
+
+
+class ValidationPolicy:
+    """
+    Validates requests for less than it costs to fully validate each of them, and/or reports violations instead of raising them.
+
+    Pass one wherever ``validate=True`` is accepted e.g. ``aiogoogle.Aiogoogle.discover(validate=...)``,
+    ``aiogoogle.resource.GoogleAPI(validate=...)`` or ``aiogoogle.resource.Method.__call__(validate=...)``
+
+    Example:
+
+        ::
+
+            >>> policy = ValidationPolicy(sample_size=100, full_calls=10, on_violation=lambda method_id, error: log.warning(error))
+            >>> sheets = await aiogoogle.discover("sheets", "v4", validate=policy)
+
+    Arguments:
+
+        sample_size (int): Validate up to this many items of each array, instead of all of them.
+        Everything else (including the type of every array) is still validated. Defaults to validating all items
+
+        full_calls (int): Number of requests of each method that are fully validated before sampling starts
+
+        on_violation (callable): Called with ``(method_id, error)`` for each ``aiogoogle.excs.ValidationError``
+        raised while validating a parameter or a body, instead of raising it. The request is built regardless.
+        Missing required parameters are always raised, because requests can't be built without them
+
+    Attributes:
+
+        violations (int): Number of violations reported to ``on_violation``
+    """
+
+    def __init__(self, sample_size=None, full_calls=0, on_violation=None):
+        if sample_size is not None and (not isinstance(sample_size, int) or sample_size < 1):
+            raise ValueError("sample_size should be a positive int")
+        if full_calls < 0:
+            raise ValueError("full_calls can't be negative")
+        self.sample_size = sample_size
+        self.full_calls = full_calls
+        self.on_violation = on_violation
+        self.violations = 0
+        self._calls = {}
+
+    def _record_call(self, method_id):
+        self._calls[method_id] = self._calls.get(method_id, 0) + 1
+
+    def _validator_for(self, method_id, schema_validator):
+        if self.sample_size is None or self._calls.get(method_id, 0) <= self.full_calls:
+            return schema_validator
+        return schema_validator.sampled(self.sample_size)
+
+    def validate(self, method_id, schema_validator, instance, schema, schema_name=None):
+        """
+        Validates an instance on behalf of a method, as this policy sees fit
+
+        Arguments:
+
+            method_id (str): ID of the method e.g. "drive.files.list"
+
+            schema_validator (SchemaValidator): Validator of the schemas of the method's API
+
+            instance: Instance to validate
+
+            schema: schema to validate instance against
+
+            schema_name: Name of the schema (Useful if you want more meaningful errors)
+        """
+        try:
+            self._validator_for(method_id, schema_validator).validate(instance, schema, schema_name)
+        except ValidationError as e:
+            if self.on_violation is None:
+                raise
+            self.violations += 1
+            self.on_violation(method_id, e)
+
+    def __repr__(self):
+        return f"ValidationPolicy(sample_size={self.sample_size}, full_calls={self.full_calls}, violations={self.violations})"
+
+
+# -- API --------------------
+
+
+def validate(instance, schema, schemas=None, schema_name=None):
+    """
+    Arguments:
+
+        Instance: Instance to validate
+
+        schema: schema to validate instance against
+
+        schemas: Full schamas dict to resolve refs if any
+
+        schema_name: Name of the schema (Useful if you want more meaningful errors)
+
+    Note:
+
+        Compiles ``schema`` every time it's called. Use a ``SchemaValidator`` to validate against the same schemas repeatedly
+    """
+    SchemaValidator(schemas).validate(instance, schema, schema_name)
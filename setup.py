@@ -43,4 +43,5 @@ setup(
         "Operating System :: OS Independent",
     ],
     extras_require={"curio_asks": ["asks", "curio"], "trio_asks": ["asks", "trio"]},
+    entry_points={"console_scripts": ["aiogoogle-compile=aiogoogle.compiler:main"]},
 )
@@ -0,0 +1,55 @@
+"""
+Microbenchmarks of resolving resources and methods of a ``GoogleAPI``
+
+Run with::
+
+    python -m tests.benchmarks.bench_resource
+"""
+
+import copy
+import timeit
+
+from aiogoogle.data import DISCOVERY_SERVICE_V1_DISCOVERY_DOC
+from aiogoogle.resource import GoogleAPI
+
+NUMBER = 100000
+
+
+def _report(name, seconds):
+    print(f"{name:<45} {seconds / NUMBER * 1e9:>10.0f} ns/op")
+
+
+def main():
+    api = GoogleAPI(copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC))
+
+    _report(
+        "api.apis.list (cached)",
+        timeit.timeit(lambda: api.apis.list, number=NUMBER),
+    )
+    # What every lookup used to cost: a new Resource and a new Method
+    _report(
+        "api.apis.list (rebuilt)",
+        timeit.timeit(lambda: api._get_resource("apis")._get_method("list"), number=NUMBER),
+    )
+    _report(
+        '"list" in api.apis',
+        timeit.timeit(lambda: "list" in api.apis, number=NUMBER),
+    )
+    _report(
+        "api.apis.list(name='drive')",
+        timeit.timeit(lambda: api.apis.list(name="drive"), number=NUMBER // 10) * 10,
+    )
+    _report(
+        "api.apis.getRest(api='drive', version='v3')",
+        timeit.timeit(lambda: api.apis.getRest(api="drive", version="v3"), number=NUMBER // 10) * 10,
+    )
+    _report(
+        "api.apis.getRest.build_many (per request)",
+        timeit.timeit(
+            lambda: api.apis.getRest.build_many([{"api": "drive"}] * 100, version="v3"), number=NUMBER // 1000
+        ) * 10,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Microbenchmarks of validating request bodies
+
+Run with::
+
+    python -m tests.benchmarks.bench_validate
+"""
+
+import timeit
+
+from aiogoogle.validate import SchemaValidator, validate
+
+from ..test_units.test_validate import ROWS_SCHEMAS
+
+NUMBER = 20
+BODY = {
+    "rows": [
+        {"id": "abc", "kind": "A", "size": i + 1, "labels": {"team": "x"}}
+        for i in range(10000)
+    ]
+}
+
+
+def _report(name, seconds):
+    print(f"{name:<50} {seconds / NUMBER * 1e6:>10.0f} us/op")
+
+
+def main():
+    validator = SchemaValidator(ROWS_SCHEMAS)
+
+    _report(
+        "validate (compiles on every call), 10k rows",
+        timeit.timeit(lambda: validate(BODY, {"$ref": "Rows"}, ROWS_SCHEMAS), number=NUMBER),
+    )
+    _report(
+        "SchemaValidator.validate, 10k rows",
+        timeit.timeit(lambda: validator.validate(BODY, {"$ref": "Rows"}), number=NUMBER),
+    )
+    sampled = validator.sampled(100)
+    _report(
+        "SchemaValidator.sampled(100).validate, 10k rows",
+        timeit.timeit(lambda: sampled.validate(BODY, {"$ref": "Rows"}), number=NUMBER),
+    )
+    row = BODY["rows"][0]
+    _report(
+        "validate (compiles on every call), 1 row",
+        timeit.timeit(lambda: validate(row, {"$ref": "Row"}, ROWS_SCHEMAS), number=NUMBER),
+    )
+    _report(
+        "SchemaValidator.validate, 1 row",
+        timeit.timeit(lambda: validator.validate(row, {"$ref": "Row"}), number=NUMBER),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import json
 from pathlib import Path
 
 import pytest
+import pytest_asyncio
+from aiohttp import web
 
 from aiogoogle.resource import GoogleAPI
 
@@ -57,3 +59,29 @@ def resources_generator(create_api):
         return generator(gapi)
 
     return wrapped
+
+
+@pytest_asyncio.fixture
+async def serve():
+    """
+    Starts a local HTTP server that answers every request with ``handler``.
+
+    Returns the base URL of the server. Requests received are appended to ``handler.received`` when the handler has that attribute.
+    """
+    runners = []
+
+    async def wrapped(handler):
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    yield wrapped
+
+    for runner in runners:
+        await runner.cleanup()
@@ -1,5 +1,9 @@
+import copy
+import pickle
+
 import pytest
 
+from aiogoogle.data import DISCOVERY_SERVICE_V1_DISCOVERY_DOC
 from aiogoogle.resource import (
     Resource,
     GoogleAPI,
@@ -89,3 +93,22 @@ def test_attaches_global_params(open_discovery_document, name, version):
     for param in STACK_QUERY_PARAMETERS:
         assert param in api["parameters"]
         assert api["parameters"][param] == STACK_QUERY_PARAMETER_DEFAULT_VALUE
+
+
+def test_resources_and_methods_are_cached():
+    api = GoogleAPI(copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC))
+    assert api.apis is api.apis
+    assert api.apis.list is api.apis.list
+    assert api.apis.getRest is not api.apis.list
+    assert "apis" in api
+    assert "list" in api.apis
+    assert "nope" not in api.apis
+    with pytest.raises(AttributeError):
+        api.apis.nope
+
+
+def test_cached_api_can_be_copied_and_pickled():
+    api = GoogleAPI(copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC), validate=True)
+    api.apis.list(name="drive")
+    for clone in (copy.deepcopy(api), pickle.loads(pickle.dumps(api))):
+        assert clone.apis.list(name="drive").url == api.apis.list(name="drive").url
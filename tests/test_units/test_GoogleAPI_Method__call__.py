@@ -1,7 +1,12 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from aiogoogle.resource import Method
+from aiogoogle.data import DISCOVERY_SERVICE_V1_DISCOVERY_DOC
+from aiogoogle.resource import GoogleAPI, Method
 from aiogoogle.excs import ValidationError
+from aiogoogle.validate import ValidationPolicy
 
 
 def test_NONE_uri_params_removed(create_api):
@@ -343,3 +348,246 @@ def test_arrays_passed_as_uri_params_are_encoded_as_separate_url_args(create_api
 
     req2 = sheets.spreadsheets.values.batchGet(spreadsheetId="IRRELEVANT", ranges='one', validate=False)
     assert req2.url == "https://sheets.googleapis.com/v4/spreadsheets/IRRELEVANT/values:batchGet?ranges=one"
+
+
+def test_request_carries_api_and_method_ids():
+    discovery_service = GoogleAPI(copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC))
+    req = discovery_service.apis.list(name="drive")
+    assert req.api_id == "discovery:v1"
+    assert req.method_id == "discovery.apis.list"
+
+
+def test_request_building_leaves_method_specs_untouched():
+    discovery_service = GoogleAPI(copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC))
+    get_rest = discovery_service.apis.getRest
+    first = get_rest(api="drive", version="v3")
+    second = get_rest(api="gmail", version="v1")
+    assert first.url == "https://www.googleapis.com/discovery/v1/apis/drive/v3/rest"
+    assert second.url == "https://www.googleapis.com/discovery/v1/apis/gmail/v1/rest"
+    assert get_rest["path"] == "apis/{api}/{version}/rest"
+
+
+DASHED_PARAMS_DISCOVERY_DOC = {
+    "id": "dashed:v1",
+    "name": "dashed",
+    "version": "v1",
+    "rootUrl": "https://dashed.googleapis.com/",
+    "servicePath": "v1/",
+    "batchPath": "batch",
+    "parameters": {"quota-user": {"type": "string", "location": "query"}},
+    "resources": {
+        "things": {
+            "methods": {
+                "get": {
+                    "id": "dashed.things.get",
+                    "path": "things/{+thingName}",
+                    "httpMethod": "GET",
+                    "parameterOrder": ["thingName"],
+                    "parameters": {
+                        "thingName": {"type": "string", "location": "path", "required": True},
+                        "page-token": {"type": "string", "location": "query"},
+                        "view": {"type": "string", "location": "query", "required": True},
+                    },
+                }
+            }
+        }
+    },
+}
+
+
+def test_dashed_params_dont_mutate_discovery_document():
+    api = GoogleAPI(copy.deepcopy(DASHED_PARAMS_DISCOVERY_DOC), validate=True)
+    before = copy.deepcopy(api.discovery_document)
+    get = api.things.get
+    req = get(thingName="a", view="FULL", page_token="x", quota_user="me")
+    assert req.url == "https://dashed.googleapis.com/v1/things/a?view=FULL&page-token=x&quota-user=me"
+    with pytest.raises(ValidationError):
+        get(thingName="a", page_token="x")
+    assert api.discovery_document == before
+    assert "page_token" in get and "page-token" in get
+
+
+def test_requests_can_be_built_from_many_threads():
+    api = GoogleAPI(copy.deepcopy(DASHED_PARAMS_DISCOVERY_DOC))
+    get = api.things.get
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        urls = list(executor.map(lambda i: get(thingName=str(i), view="FULL", page_token=str(i)).url, range(200)))
+    assert urls == [f"https://dashed.googleapis.com/v1/things/{i}?view=FULL&page-token={i}" for i in range(200)]
+
+
+def test_build_many_builds_the_same_requests_as_calls():
+    api = GoogleAPI(copy.deepcopy(DASHED_PARAMS_DISCOVERY_DOC), validate=True)
+    get = api.things.get
+    params = [{"thingName": "a"}, {"thingName": "b", "view": "BASIC", "timeout": 5}]
+    built = get.build_many(params, view="FULL", page_token="x")
+    called = [get(**{"view": "FULL", "page_token": "x", **kwargs}) for kwargs in params]
+    assert [(req.url, req.timeout) for req in built] == [(req.url, req.timeout) for req in called]
+
+
+def test_iter_build_validates_shared_params_once(monkeypatch):
+    api = GoogleAPI(copy.deepcopy(DASHED_PARAMS_DISCOVERY_DOC), validate=True)
+    get = api.things.get
+    validated = []
+    validate = Method._validate
+
+    def recording_validate(self, instance, schema, schema_name=None, policy=None):
+        validated.append(schema_name)
+        return validate(self, instance, schema, schema_name, policy)
+
+    monkeypatch.setattr(Method, "_validate", recording_validate)
+    requests = get.iter_build(({"thingName": str(i)} for i in range(3)), view="FULL", page_token="x")
+    assert validated == ["view", "page-token"]
+    assert len(list(requests)) == 3
+    assert validated == ["view", "page-token", "thingName", "thingName", "thingName"]
+
+
+def test_iter_build_fails_early_on_invalid_shared_params():
+    api = GoogleAPI(copy.deepcopy(DASHED_PARAMS_DISCOVERY_DOC), validate=True)
+    with pytest.raises(ValidationError):
+        api.things.get.iter_build([], view=1)
+    with pytest.raises(TypeError):
+        api.things.get.iter_build([], timeout="1")
+
+
+def test_validation_policy_reports_invalid_params_but_raises_missing_ones():
+    reported = []
+    policy = ValidationPolicy(on_violation=lambda method_id, e: reported.append(method_id))
+    api = GoogleAPI(copy.deepcopy(DASHED_PARAMS_DISCOVERY_DOC), validate=policy)
+    get = api.things.get
+    req = get(thingName="a", view=1)
+    assert req.url == "https://dashed.googleapis.com/v1/things/a?view=1"
+    assert reported == ["dashed.things.get"]
+    with pytest.raises(ValidationError):
+        get(thingName="a")
+
+
+def test_items_key_is_inferred_from_response_schema():
+    doc = copy.deepcopy(DASHED_PARAMS_DISCOVERY_DOC)
+    methods = doc["resources"]["things"]["methods"]
+    methods["get"]["response"] = {"$ref": "Thing"}
+    methods["list"] = {**methods["get"], "id": "dashed.things.list", "response": {"$ref": "ThingList"}}
+    methods["listPrefixes"] = {**methods["get"], "id": "dashed.things.listPrefixes", "response": {"$ref": "PrefixedThingList"}}
+    doc["schemas"] = {
+        "Thing": {"id": "Thing", "type": "object", "properties": {"name": {"type": "string"}}},
+        "ThingList": {
+            "id": "ThingList",
+            "type": "object",
+            "properties": {"things": {"type": "array", "items": {"$ref": "Thing"}}, "nextPageToken": {"type": "string"}},
+        },
+        "PrefixedThingList": {
+            "id": "PrefixedThingList",
+            "type": "object",
+            "properties": {
+                "prefixes": {"type": "array", "items": {"type": "string"}},
+                "items": {"type": "array", "items": {"$ref": "Thing"}},
+            },
+        },
+    }
+    api = GoogleAPI(doc)
+    assert api.things.get.items_key is None
+    assert api.things.list.items_key == "things"
+    assert api.things.listPrefixes.items_key == "items"
+    assert api.things.list(thingName="a", view="FULL").items_key == "things"
+
+
+PAGINATED_DISCOVERY_DOC = {
+    **DASHED_PARAMS_DISCOVERY_DOC,
+    "resources": {
+        "things": {
+            "methods": {
+                **DASHED_PARAMS_DISCOVERY_DOC["resources"]["things"]["methods"],
+                "list": {
+                    "id": "dashed.things.list",
+                    "path": "things",
+                    "httpMethod": "GET",
+                    "parameters": {
+                        "pageToken": {"type": "string", "location": "query"},
+                        "pageSize": {"type": "integer", "format": "int32", "location": "query", "minimum": "1", "maximum": "1000"},
+                    },
+                },
+            }
+        }
+    },
+}
+
+
+def test_maximize_page_size_fills_in_declared_maximum():
+    api = GoogleAPI(copy.deepcopy(PAGINATED_DISCOVERY_DOC), validate=True, maximize_page_size=True)
+    things = api.things
+    assert things.list.page_size_parameter == "pageSize"
+    assert things.get.page_size_parameter is None
+    assert things.list().url == "https://dashed.googleapis.com/v1/things?pageSize=1000"
+    assert things.list(pageSize=10).url == "https://dashed.googleapis.com/v1/things?pageSize=10"
+    assert things.list(maximize_page_size=False).url == "https://dashed.googleapis.com/v1/things"
+    assert [req.url for req in things.list.build_many([{}, {"maximize_page_size": False}])] == [
+        "https://dashed.googleapis.com/v1/things?pageSize=1000",
+        "https://dashed.googleapis.com/v1/things",
+    ]
+    assert things.get(thingName="a", view="FULL").url == "https://dashed.googleapis.com/v1/things/a?view=FULL"
+
+
+def test_maximize_page_size_is_opt_in():
+    api = GoogleAPI(copy.deepcopy(PAGINATED_DISCOVERY_DOC))
+    assert api.things.list().url == "https://dashed.googleapis.com/v1/things"
+    assert api.things.list(maximize_page_size=True).url == "https://dashed.googleapis.com/v1/things?pageSize=1000"
+
+
+def listing_api():
+    doc = copy.deepcopy(PAGINATED_DISCOVERY_DOC)
+    doc["resources"]["things"]["methods"]["list"]["response"] = {"$ref": "ThingList"}
+    doc["parameters"]["fields"] = {"type": "string", "location": "query"}
+    doc["schemas"] = {
+        "ThingList": {
+            "id": "ThingList",
+            "type": "object",
+            "properties": {
+                "nextPageToken": {"type": "string"},
+                "incompleteSearch": {"type": "boolean"},
+                "things": {"type": "array", "items": {"$ref": "Thing"}},
+            },
+        },
+        "Thing": {
+            "id": "Thing",
+            "type": "object",
+            "properties": {
+                "id": {"type": "string"},
+                "owners": {"type": "array", "items": {"$ref": "User"}},
+                "labels": {"type": "object", "additionalProperties": {"type": "string"}},
+            },
+        },
+        "User": {"id": "User", "type": "object", "properties": {"email": {"type": "string"}, "name": {"type": "string"}}},
+    }
+    return GoogleAPI(doc)
+
+
+def test_fields_mask_keeps_page_token_and_items_wrapper():
+    list_things = listing_api().things.list
+    assert list_things.fields_mask(["id"]) == "nextPageToken,things(id)"
+    assert (
+        list_things.fields_mask(["id", "owners/email", "owners(name,email)", "labels/anything"], fields=["incompleteSearch"])
+        == "nextPageToken,incompleteSearch,things(id,owners/email,owners(name,email),labels/anything)"
+    )
+    mask = list_things.fields_mask(["id"])
+    assert list_things(fields=mask).url == "https://dashed.googleapis.com/v1/things?fields=nextPageToken%2Cthings%28id%29"
+
+
+@pytest.mark.parametrize(
+    "item_fields, fields",
+    [
+        (["missing"], ()),
+        (["owners/missing"], ()),
+        (["owners(name,missing)"], ()),
+        (["owners(name"], ()),
+        (["id"], ["missing"]),
+        ([], ()),
+    ],
+)
+def test_fields_mask_is_checked_against_response_schema(item_fields, fields):
+    with pytest.raises(ValidationError):
+        listing_api().things.list.fields_mask(item_fields, fields=fields)
+
+
+def test_fields_mask_needs_items_key():
+    api = listing_api()
+    with pytest.raises(ValidationError):
+        api.things.get.fields_mask(["id"])
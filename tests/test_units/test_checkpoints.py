@@ -0,0 +1,73 @@
+import pytest
+
+from aiogoogle.auth.creds import IdToken, ServiceAccountCreds, UserCreds
+from aiogoogle.auth.managers import ServiceAccountManager
+from aiogoogle.checkpoints import FileCheckpointStore, MemoryCheckpointStore, _Checkpointer, _checkpoint_key
+
+
+def checkpoint(page_token="2"):
+    return {"method": "GET", "url": "https://example.com/items", "json": None, "page_token": page_token, "pages_emitted": 2, "items_emitted": 20}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_store", [lambda tmp_path: MemoryCheckpointStore(), lambda tmp_path: FileCheckpointStore(str(tmp_path / "checkpoints"))])
+async def test_checkpoint_stores(tmp_path, make_store):
+    store = make_store(tmp_path)
+    assert await store.get("a") is None
+    await store.set("a", checkpoint())
+    stored = await store.get("a")
+    assert stored == checkpoint()
+    stored["page_token"] = "mutated"
+    assert (await store.get("a"))["page_token"] == "2"
+    await store.delete("a")
+    await store.delete("a")
+    assert await store.get("a") is None
+
+
+def test_checkpoint_key_ignores_order_of_body_keys():
+    assert _checkpoint_key("GET", "https://example.com/items", {"a": 1, "b": 2}) == _checkpoint_key("get", "https://example.com/items", {"b": 2, "a": 1})
+    assert _checkpoint_key("GET", "https://example.com/items", None) != _checkpoint_key("POST", "https://example.com/items", None)
+
+
+def test_checkpoint_key_depends_on_stable_identity():
+    url = "https://example.com/items"
+
+    def key(**kwargs):
+        return _checkpoint_key("GET", url, None, True, **kwargs)
+
+    alice = key(user_creds=UserCreds(access_token="1", id_token=IdToken(sub="alice")))
+    # Renewing the access token doesn't change the key
+    assert alice == key(user_creds=UserCreds(access_token="2", id_token=IdToken(sub="alice")))
+    assert alice != key(user_creds=UserCreds(access_token="1", id_token=IdToken(sub="bob")))
+    assert key(user_creds=UserCreds(access_token="1", refresh_token="a")) == key(user_creds=UserCreds(access_token="2", refresh_token="a"))
+    assert key(user_creds=UserCreds(refresh_token="a")) != key(user_creds=UserCreds(refresh_token="b"))
+    service_account = key(auth_manager=ServiceAccountManager(creds=ServiceAccountCreds(client_email="sa@example.com")))
+    assert service_account not in (alice, _checkpoint_key("GET", url, None))
+    assert _checkpoint_key("GET", url + "?key=alice", None) != _checkpoint_key("GET", url + "?key=bob", None)
+    with pytest.raises(ValueError):
+        key(user_creds=UserCreds(access_token="1"))
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_never_hold_credentials():
+    store = MemoryCheckpointStore()
+    checkpointer = _Checkpointer(store, "scan", "GET", "https://example.com/items?q=a&key=secret&access_token=secret", None)
+    await checkpointer.commit("1", 10)
+    assert (await store.get("scan"))["url"] == "https://example.com/items?q=a"
+
+
+@pytest.mark.asyncio
+async def test_checkpointer_commits_progress_and_deletes_when_done():
+    store = MemoryCheckpointStore()
+    checkpointer = _Checkpointer(store, "scan", "GET", "https://example.com/items", None)
+    assert await checkpointer.load() is None
+    await checkpointer.commit("1", 10)
+    await checkpointer.commit("2", 10)
+    assert await store.get("scan") == checkpoint()
+
+    resumed = _Checkpointer(store, "scan", "GET", "https://example.com/items", None)
+    assert await resumed.load() == "2"
+    await resumed.commit("3", 5)
+    assert (await store.get("scan"))["items_emitted"] == 25
+    await resumed.commit(None, 5)
+    assert len(store) == 0
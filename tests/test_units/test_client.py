@@ -1,8 +1,14 @@
+import copy
 import sys
 from unittest.mock import patch
-from aiogoogle.client import Aiogoogle, DISCOVERY_SERVICE_V1_DISCOVERY_DOC
+
+from aiohttp import web
 import pytest
 
+from aiogoogle.client import Aiogoogle, DISCOVERY_SERVICE_V1_DISCOVERY_DOC
+from aiogoogle.excs import HTTPError
+from aiogoogle.resource import GoogleAPI
+
 
 @pytest.mark.skipif(
     sys.version_info < (3, 8),
@@ -36,3 +42,74 @@ async def test_fetch_api_discovery_doc_via_google_discovery_service_v2():
         # Validate that the correct Google endpoint would have been called
         google_api_request = mock_send_unauthorized_requests.await_args[0][0]
         google_api_request.url == expected
+
+
+def discovery_handler(fail=False):
+    received = []
+
+    async def handler(request):
+        received.append((request.path, request.headers.get("If-None-Match")))
+        if handler.fail:
+            return web.json_response({"error": {"message": "unavailable"}}, status=503)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        if request.path.endswith("/apis"):
+            return web.json_response({"items": [{"name": "discovery", "version": "v1"}]})
+        return web.json_response(DISCOVERY_SERVICE_V1_DISCOVERY_DOC, headers={"ETag": '"v1"'})
+
+    handler.received = received
+    handler.fail = fail
+    return handler
+
+
+def local_discovery_service(base_url):
+    doc = copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC)
+    doc["rootUrl"] = f"{base_url}/"
+    return GoogleAPI(doc)
+
+
+@pytest.mark.asyncio
+async def test_discovery_cache(serve, tmp_path):
+    handler = discovery_handler()
+    base_url = await serve(handler)
+
+    for _ in range(2):
+        async with Aiogoogle(discovery_cache_dir=str(tmp_path)) as aiogoogle:
+            aiogoogle.discovery_service = local_discovery_service(base_url)
+            api = await aiogoogle.discover("discovery")
+
+    assert api["id"] == "discovery:v1"
+    # The second client (e.g. another process) didn't hit the network
+    assert handler.received == [("/discovery/v1/apis", None), ("/discovery/v1/apis/discovery/v1/rest", None)]
+
+
+@pytest.mark.asyncio
+async def test_discovery_cache_revalidates_and_serves_stale(serve, tmp_path):
+    handler = discovery_handler()
+    base_url = await serve(handler)
+
+    async with Aiogoogle(discovery_cache_dir=str(tmp_path), discovery_cache_ttl=0) as aiogoogle:
+        aiogoogle.discovery_service = local_discovery_service(base_url)
+        await aiogoogle.discover("discovery", "v1")
+        await aiogoogle.discover("discovery", "v1")
+        handler.fail = True
+        api = await aiogoogle.discover("discovery", "v1")
+
+    assert api["id"] == "discovery:v1"
+    assert [if_none_match for _, if_none_match in handler.received] == [None, '"v1"', '"v1"']
+
+    async with Aiogoogle(discovery_cache_dir=str(tmp_path / "empty")) as aiogoogle:
+        aiogoogle.discovery_service = local_discovery_service(base_url)
+        with pytest.raises(HTTPError):
+            await aiogoogle.list_api("discovery")
+
+
+@pytest.mark.asyncio
+async def test_discovery_cache_stores_responses_without_a_json_body(serve, tmp_path):
+    async def handler(request):
+        return web.Response(text="not json")
+
+    base_url = await serve(handler)
+    async with Aiogoogle(discovery_cache_dir=str(tmp_path)) as aiogoogle:
+        aiogoogle.discovery_service = local_discovery_service(base_url)
+        assert await aiogoogle.list_api("discovery") is None
@@ -0,0 +1,55 @@
+import copy
+import json
+
+import pytest
+
+from aiogoogle.compiler import compile_discovery_document, is_compiled, load_compiled_discovery_document, main, MAGIC
+from aiogoogle.data import DISCOVERY_SERVICE_V1_DISCOVERY_DOC
+from aiogoogle.resource import GoogleAPI
+
+
+def test_compiled_document_keeps_routing_and_schemas_only():
+    doc = copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC)
+    # A schema property that happens to be called "description" must survive
+    assert doc["schemas"]["DirectoryList"]["properties"]["items"]["items"]["properties"]["description"]["type"] == "string"
+
+    compiled = compile_discovery_document(doc)
+    assert is_compiled(compiled)
+    assert len(compiled) < len(json.dumps(doc))
+
+    loaded = load_compiled_discovery_document(compiled)
+    assert "description" not in loaded
+    assert "icons" not in loaded
+    assert "description" not in loaded["resources"]["apis"]["methods"]["list"]
+    assert loaded["resources"]["apis"]["methods"]["list"]["parameters"]["preferred"]["type"] == "boolean"
+    assert loaded["schemas"]["DirectoryList"]["properties"]["items"]["items"]["properties"]["description"] == {"type": "string"}
+    # Strings are interned
+    list_method = loaded["resources"]["apis"]["methods"]["list"]
+    assert list_method["httpMethod"] is loaded["resources"]["apis"]["methods"]["getRest"]["httpMethod"]
+
+
+def test_google_api_accepts_compiled_documents():
+    api = GoogleAPI(compile_discovery_document(copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC)))
+    req = api.apis.getRest(api="drive", version="v3")
+    assert req.url == "https://www.googleapis.com/discovery/v1/apis/drive/v3/rest"
+
+
+def test_load_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        load_compiled_discovery_document(b"{}")
+    with pytest.raises(ValueError):
+        load_compiled_discovery_document(MAGIC + b"\x63" + b"data")
+    # Pickles that reference any global are refused
+    evil = MAGIC + b"\x01" + b"cos\nsystem\n(S'echo hi'\ntR."
+    with pytest.raises(ValueError):
+        load_compiled_discovery_document(evil)
+
+
+def test_cli_compiles_files(tmp_path, capsys):
+    source = tmp_path / "discovery_v1.json"
+    source.write_text(json.dumps(DISCOVERY_SERVICE_V1_DISCOVERY_DOC))
+    main([str(source), "-o", str(tmp_path / "out")])
+
+    compiled = (tmp_path / "out" / "discovery_v1.aiogoogle").read_bytes()
+    assert GoogleAPI(compiled)["id"] == "discovery:v1"
+    assert "discovery:v1" in capsys.readouterr().out
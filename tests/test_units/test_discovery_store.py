@@ -0,0 +1,96 @@
+import copy
+import pickle
+
+import pytest
+
+from aiogoogle.data import DISCOVERY_SERVICE_V1_DISCOVERY_DOC
+from aiogoogle.discovery_store import DiscoveryStore, MappedNode, build_discovery_store
+from aiogoogle.excs import ValidationError
+
+from .test_GoogleAPI_Method__call__ import PAGINATED_DISCOVERY_DOC
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "apis.store")
+    build_discovery_store(path, [copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC)], min_node_size=64)
+    store = DiscoveryStore(path)
+    yield store
+    store.close()
+
+
+def test_store_decodes_nodes_lazily(store):
+    assert list(store) == ["discovery:v1"]
+    doc = store["discovery:v1"]
+    assert isinstance(doc, MappedNode)
+    assert doc._items is None
+
+    assert doc["name"] == "discovery"
+    methods = doc["resources"]["apis"]["methods"]
+    assert isinstance(methods, MappedNode)
+    # Child nodes aren't kept by their parents
+    assert isinstance(doc["schemas"], MappedNode)
+    assert doc["schemas"] is not doc["schemas"]
+    assert methods["getRest"]["httpMethod"] == "GET"
+    assert "description" not in methods["getRest"]
+
+
+def test_store_content_matches_the_document(store):
+    expected = copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC)
+    loaded = copy.deepcopy(store["discovery:v1"])
+    assert type(loaded) is dict
+    assert loaded["schemas"]["DirectoryList"]["properties"]["items"]["items"]["properties"]["description"] == {"type": "string"}
+    assert loaded["resources"]["apis"]["methods"]["list"]["parameters"]["name"]["type"] == expected["resources"]["apis"]["methods"]["list"]["parameters"]["name"]["type"]
+    assert pickle.loads(pickle.dumps(store["discovery:v1"]))["id"] == "discovery:v1"
+
+
+def test_google_api_backed_by_store(store):
+    api = store.google_api("discovery:v1", validate=True)
+    req = api.apis.list(name="drive", preferred=True)
+    assert req.url == "https://www.googleapis.com/discovery/v1/apis?name=drive&preferred=True"
+    assert req.api_id == "discovery:v1"
+    with pytest.raises(ValidationError):
+        api.apis.list(preferred="not a boolean")
+    # Changes only affect the node they're made to
+    api.discovery_document["parameters"]["alt"] = "changed"
+    assert store["discovery:v1"]["parameters"]["alt"] != "changed"
+
+
+def test_google_api_maximize_page_size(tmp_path):
+    path = str(tmp_path / "apis.store")
+    build_discovery_store(path, [copy.deepcopy(PAGINATED_DISCOVERY_DOC)])
+    store = DiscoveryStore(path)
+    try:
+        api = store.google_api(PAGINATED_DISCOVERY_DOC["id"], maximize_page_size=True)
+        assert api.things.list().url == "https://dashed.googleapis.com/v1/things?pageSize=1000"
+    finally:
+        store.close()
+
+
+def test_request_bodies_of_store_backed_apis_are_compiled_once(tmp_path):
+    doc = copy.deepcopy(PAGINATED_DISCOVERY_DOC)
+    doc["schemas"] = {"Thing": {"id": "Thing", "type": "object", "properties": {"name": {"type": "string"}}}}
+    doc["resources"]["things"]["methods"]["insert"] = {
+        "id": "dashed.things.insert", "path": "things", "httpMethod": "POST", "request": {"$ref": "Thing"},
+    }
+    path = str(tmp_path / "apis.store")
+    build_discovery_store(path, [doc])
+    store = DiscoveryStore(path)
+    try:
+        api = store.google_api(doc["id"], validate=True)
+        for i in range(5):
+            api.things.insert(json={"name": str(i)})
+        with pytest.raises(ValidationError):
+            api.things.insert(json={"name": 1})
+        validator = api.things.insert._schema_validator
+        assert list(validator._refs) == ["Thing"]
+        assert validator._inline == {}
+    finally:
+        store.close()
+
+
+def test_store_rejects_other_files(tmp_path):
+    path = tmp_path / "not.store"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        DiscoveryStore(str(path))
@@ -9,8 +9,8 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from aiogoogle.models import Request, MediaUpload
-from aiogoogle.excs import ValidationError
+from aiogoogle.models import Request, Response, MediaUpload
+from aiogoogle.excs import HTTPError, ValidationError
 
 
 def async_return(result):
@@ -109,3 +109,68 @@ async def test_media_upload_validation():
 
     mu = MediaUpload(file_path, max_size=200)
     await mu.run_validation(size_func)
+
+
+def test_batch_requests_packs_requests_in_a_multipart_body():
+    reqs = [
+        Request(method="GET", url="https://www.googleapis.com/drive/v3/files/a?fields=id", batch_url="https://www.googleapis.com/batch/drive/v3",
+                headers={"Authorization": "Bearer token"}),
+        Request(method="PATCH", url="https://www.googleapis.com/drive/v3/files/b", batch_url="https://www.googleapis.com/batch/drive/v3",
+                headers={"Authorization": "Bearer token"}, json={"name": "b"}),
+    ]
+    batch = Request.batch_requests(*reqs)
+
+    assert batch.method == "POST"
+    assert batch.url == "https://www.googleapis.com/batch/drive/v3"
+    assert batch.batch == reqs
+    assert batch.headers["Authorization"] == "Bearer token"
+    boundary = batch.headers["Content-Type"].split("boundary=")[1]
+    body = batch.data.decode()
+    assert body.count(f"--{boundary}\r\nContent-Type: application/http\r\n") == 2
+    assert "Content-ID: <item1>" in body
+    assert "GET /drive/v3/files/a?fields=id HTTP/1.1\r\n" in body
+    assert 'PATCH /drive/v3/files/b HTTP/1.1\r\nAuthorization: Bearer token\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n{"name": "b"}' in body
+    assert body.endswith(f"--{boundary}--\r\n")
+
+
+def test_batch_requests_rejects_unbatchable_requests():
+    with pytest.raises(ValueError):
+        Request.batch_requests()
+    with pytest.raises(ValueError):
+        Request.batch_requests(Request(url="https://a.com/1", batch_url="https://a.com/batch"), Request(url="https://b.com/1", batch_url="https://b.com/batch"))
+    with pytest.raises(ValueError):
+        Request.batch_requests(Request(url="https://a.com/1", batch_url="https://a.com/batch", media_upload=MediaUpload(b"data")))
+    with pytest.raises(ValueError):
+        Request.batch_requests(*[Request(url="https://a.com/1", batch_url="https://a.com/batch")] * 101)
+
+
+def test_unbatch_parses_parts_by_content_id():
+    reqs = [Request(method="GET", url=f"https://a.com/{i}", batch_url="https://a.com/batch") for i in range(2)]
+    batch = Request.batch_requests(*reqs)
+    body = (
+        "--batch_xyz\r\n"
+        "Content-Type: application/http\r\n"
+        "Content-ID: <response-item1>\r\n\r\n"
+        "HTTP/1.1 404 Not Found\r\n"
+        "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+        '{"error": {"code": 404, "message": "File not found"}}\r\n'
+        "--batch_xyz\r\n"
+        "Content-Type: application/http\r\n"
+        "Content-ID: <response-item0>\r\n\r\n"
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+        '{"id": "0"}\r\n'
+        "--batch_xyz--\r\n"
+    )
+    res = Response(status_code=200, headers={"Content-Type": "multipart/mixed; boundary=batch_xyz"}, data=body, req=batch)
+
+    ok, not_found = res.unbatch()
+    assert ok.status_code == 200
+    assert ok.json == {"id": "0"}
+    assert ok.req is reqs[0]
+    assert not_found.status_code == 404
+    assert not_found.reason == "Not Found"
+    assert not_found.headers["Content-Type"] == "application/json; charset=UTF-8"
+    assert not_found.req is reqs[1]
+    with pytest.raises(HTTPError):
+        not_found.raise_for_status()
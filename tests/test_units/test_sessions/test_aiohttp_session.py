@@ -0,0 +1,782 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from aiogoogle import Aiogoogle, HTTPError
+from aiogoogle.checkpoints import FileCheckpointStore, MemoryCheckpointStore
+from aiogoogle.models import Request
+from aiogoogle.sessions.batching import BatchCoalescer
+from aiogoogle.sessions.codec import JsonCodec
+from aiogoogle.sessions.common import RetryPolicy
+from aiogoogle.sessions.limiters import AdaptiveConcurrencyLimiter, ConcurrencyLimiter, RateLimiter
+
+
+def paginated_handler(pages, per_page=1, key="items", events=None, failing_page=None):
+    """
+    Serves ``pages`` pages of ``per_page`` consecutive integers each, under ``key``.
+    Appends ``("fetch", page)`` to ``events`` for every page requested. ``failing_page`` is answered with a 400
+    """
+    async def handler(request):
+        page = int(request.query.get("pageToken", 0))
+        if events is not None:
+            events.append(("fetch", page))
+        if page == failing_page:
+            return web.json_response({"error": {"message": "Nope"}}, status=400)
+        body = {key: [page * per_page + i for i in range(per_page)]}
+        if page + 1 < pages:
+            body["nextPageToken"] = str(page + 1)
+        return web.json_response(body)
+
+    return handler
+
+
+@pytest.fixture
+def serve_pages(serve):
+    """
+    Serves ``paginated_handler(pages, **kwargs)`` and returns the URL of its first page
+    """
+    async def wrapped(pages, **kwargs):
+        return await serve(paginated_handler(pages, **kwargs)) + "/items"
+
+    return wrapped
+
+
+async def first_page(aiogoogle, url, **kwargs):
+    return await aiogoogle.as_anon(Request(method="GET", url=url, **kwargs), full_res=True)
+
+
+@pytest.mark.asyncio
+async def test_pagination_reuses_active_session(serve_pages):
+    url = await serve_pages(3)
+
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+        pages = [page async for page in res]
+        session = aiogoogle._get_session()
+
+    assert [page["items"] for page in pages] == [[0], [1], [2]]
+    assert res.session is session
+    assert aiogoogle.stats.connections_opened == 1
+    assert aiogoogle.stats.connections_reused == 2
+    assert aiogoogle.stats.pages_fetched == 2
+
+
+@pytest.mark.asyncio
+async def test_pagination_after_session_closed_shares_one_session(serve_pages):
+    url = await serve_pages(4)
+
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+
+    # The session that sent the first page is closed by now
+    pages = [page async for page in res]
+
+    assert len(pages) == 4
+    assert aiogoogle.stats.connections_opened == 2
+    assert aiogoogle.stats.connections_reused == 2
+
+
+def slow_handler(tracker, delay=0.01):
+    async def handler(request):
+        tracker["in_flight"] += 1
+        tracker["max_in_flight"] = max(tracker["max_in_flight"], tracker["in_flight"])
+        await asyncio.sleep(delay)
+        tracker["in_flight"] -= 1
+        return web.json_response({"path": request.path})
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_caps_in_flight_requests(serve):
+    tracker = {"in_flight": 0, "max_in_flight": 0}
+    base_url = await serve(slow_handler(tracker))
+
+    async with Aiogoogle(max_concurrency=3) as aiogoogle:
+        reqs = [Request(method="GET", url=f"{base_url}/{i}") for i in range(20)]
+        results = await aiogoogle.as_anon(*reqs)
+
+    # Results are still returned in input order
+    assert [res["path"] for res in results] == [f"/{i}" for i in range(20)]
+    assert tracker["max_in_flight"] == 3
+    assert aiogoogle.concurrency_limiter.in_flight == 0
+    assert aiogoogle.concurrency_limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_is_shared_between_calls(serve):
+    tracker = {"in_flight": 0, "max_in_flight": 0}
+    base_url = await serve(slow_handler(tracker))
+    limiter = ConcurrencyLimiter(2)
+
+    async with Aiogoogle(max_concurrency=limiter) as aiogoogle:
+        calls = [
+            aiogoogle.as_anon(*[Request(method="GET", url=f"{base_url}/{i}") for i in range(5)])
+            for _ in range(3)
+        ]
+        queue_depths = []
+
+        async def watch():
+            while limiter.in_flight == 0:
+                await asyncio.sleep(0)
+            queue_depths.append(limiter.queue_depth)
+
+        await asyncio.gather(watch(), *calls)
+
+    assert tracker["max_in_flight"] == 2
+    assert queue_depths[0] > 0
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_stops_sending_on_error(serve):
+    received = []
+
+    async def handler(request):
+        received.append(request.path)
+        if request.path == "/0":
+            return web.json_response({"error": {"message": "nope"}}, status=400)
+        await asyncio.sleep(0.01)
+        return web.json_response({})
+
+    base_url = await serve(handler)
+
+    async with Aiogoogle() as aiogoogle:
+        reqs = [Request(method="GET", url=f"{base_url}/{i}") for i in range(50)]
+        with pytest.raises(HTTPError):
+            await aiogoogle.send(*reqs, max_concurrency=1)
+
+    assert received == ["/0"]
+
+
+def test_max_concurrency_must_be_positive():
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(0)
+
+
+def delayed_handler():
+    async def handler(request):
+        await asyncio.sleep(float(request.path.strip("/")))
+        if request.path == "/0.02":
+            return web.json_response({"error": {"message": "nope"}}, status=500)
+        return web.json_response({"delay": request.path})
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_as_anon_iter_yields_as_completed(serve):
+    base_url = await serve(delayed_handler())
+    delays = ["0.09", "0.01", "0.05", "0.02"]
+
+    async with Aiogoogle() as aiogoogle:
+        reqs = [Request(method="GET", url=f"{base_url}/{d}") for d in delays]
+        results = [result async for result in aiogoogle.as_anon_iter(*reqs)]
+
+    assert [req.url.rsplit("/", 1)[1] for req, _ in results] == ["0.01", "0.02", "0.05", "0.09"]
+    assert results[0][1] == {"delay": "/0.01"}
+    # Errors are yielded instead of being raised
+    assert isinstance(results[1][1], HTTPError)
+
+
+@pytest.mark.asyncio
+async def test_send_iter_with_max_concurrency(serve):
+    base_url = await serve(delayed_handler())
+
+    async with Aiogoogle(max_concurrency=2) as aiogoogle:
+        reqs = [Request(method="GET", url=f"{base_url}/0.01") for _ in range(10)]
+        results = [res async for _, res in aiogoogle.send_iter(*reqs, full_res=True)]
+
+    assert len(results) == 10
+    assert all(res.status_code == 200 for res in results)
+    assert aiogoogle.concurrency_limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_send_iter_timeout(serve):
+    base_url = await serve(delayed_handler())
+
+    async with Aiogoogle() as aiogoogle:
+        reqs = [Request(method="GET", url=f"{base_url}/{d}") for d in ["0.01", "1"]]
+        results = []
+        with pytest.raises(asyncio.TimeoutError):
+            async for result in aiogoogle.send_iter(*reqs, timeout=0.2):
+                results.append(result)
+
+    assert len(results) == 1
+
+
+@pytest.mark.asyncio
+async def test_as_anon_iter_pulls_from_iterables_lazily(serve):
+    tracker = {"in_flight": 0, "max_in_flight": 0}
+    base_url = await serve(slow_handler(tracker))
+    built = []
+
+    def requests():
+        for i in range(30):
+            built.append(i)
+            yield Request(method="GET", url=f"{base_url}/{i}")
+
+    async with Aiogoogle(max_concurrency=3) as aiogoogle:
+        seen = []
+        async for _, res in aiogoogle.as_anon_iter(requests()):
+            # Requests are only built once a worker is free to send them
+            assert len(built) - len(seen) <= 3 * 2 + 1
+            seen.append(res["path"])
+
+    assert sorted(seen) == sorted(f"/{i}" for i in range(30))
+    assert tracker["max_in_flight"] == 3
+    assert aiogoogle.concurrency_limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_send_iter_raises_errors_of_the_iterable(serve):
+    base_url = await serve(slow_handler({"in_flight": 0, "max_in_flight": 0}))
+
+    def requests():
+        yield Request(method="GET", url=f"{base_url}/0")
+        raise ValueError("Can't build this one")
+
+    async with Aiogoogle() as aiogoogle:
+        with pytest.raises(ValueError):
+            async for _ in aiogoogle.send_iter(requests()):
+                pass
+
+
+def flaky_handler(failures, status=503):
+    received = []
+
+    async def handler(request):
+        received.append(request.method)
+        if len(received) <= failures:
+            if status is None:
+                # Drop the connection without responding
+                request.transport.close()
+                return web.Response()
+            return web.json_response({"error": {"message": "try again"}}, status=status, headers={"Retry-After": "0"})
+        return web.json_response({"attempt": len(received)})
+
+    handler.received = received
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_retries_transient_statuses(serve):
+    handler = flaky_handler(failures=2)
+    base_url = await serve(handler)
+
+    async with Aiogoogle(retry_policy=RetryPolicy(initial_backoff=0.001)) as aiogoogle:
+        res = await aiogoogle.as_anon(Request(method="GET", url=base_url))
+
+    assert res == {"attempt": 3}
+    assert aiogoogle.stats.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_retries_dropped_connections(serve):
+    # Aiohttp sends idempotent requests one more time on its own when the server disconnects
+    handler = flaky_handler(failures=2, status=None)
+    base_url = await serve(handler)
+
+    async with Aiogoogle(retry_policy=RetryPolicy(initial_backoff=0.001)) as aiogoogle:
+        res = await aiogoogle.as_anon(Request(method="GET", url=base_url))
+
+    assert res == {"attempt": 3}
+    assert aiogoogle.stats.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_gives_up_after_max_attempts(serve):
+    handler = flaky_handler(failures=10)
+    base_url = await serve(handler)
+
+    async with Aiogoogle(retry_policy=RetryPolicy(max_attempts=3, initial_backoff=0.001)) as aiogoogle:
+        with pytest.raises(HTTPError) as e:
+            await aiogoogle.as_anon(Request(method="GET", url=base_url))
+
+    assert e.value.res.status_code == 503
+    assert len(handler.received) == 3
+    assert aiogoogle.stats.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_policy_doesnt_retry_non_idempotent_server_errors(serve):
+    handler = flaky_handler(failures=1, status=500)
+    base_url = await serve(handler)
+
+    async with Aiogoogle(retry_policy=RetryPolicy(initial_backoff=0.001)) as aiogoogle:
+        with pytest.raises(HTTPError):
+            await aiogoogle.as_anon(Request(method="POST", url=base_url, json={}))
+
+    assert handler.received == ["POST"]
+    assert aiogoogle.stats.retries == 0
+
+
+@pytest.mark.asyncio
+async def test_no_retries_by_default(serve):
+    handler = flaky_handler(failures=1)
+    base_url = await serve(handler)
+
+    async with Aiogoogle() as aiogoogle:
+        with pytest.raises(HTTPError):
+            await aiogoogle.as_anon(Request(method="GET", url=base_url))
+
+    assert len(handler.received) == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_is_applied_before_sending(serve):
+    base_url = await serve(delayed_handler())
+    limiter = RateLimiter(rates={"discovery:v1": (50, 1)})
+
+    async with Aiogoogle(rate_limiter=limiter) as aiogoogle:
+        reqs = [Request(method="GET", url=f"{base_url}/0", api_id="discovery:v1") for _ in range(3)]
+        unlimited = Request(method="GET", url=f"{base_url}/0", api_id="drive:v3")
+        await aiogoogle.as_anon(*reqs, unlimited)
+
+    # 2 requests waited for ~20ms each
+    assert limiter.waited >= 0.03
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_backs_off_on_throttled_retries(serve):
+    handler = flaky_handler(failures=1, status=429)
+    base_url = await serve(handler)
+    limiter = AdaptiveConcurrencyLimiter(initial_window=8)
+
+    async with Aiogoogle(max_concurrency=limiter, retry_policy=RetryPolicy(initial_backoff=0.001)) as aiogoogle:
+        res = await aiogoogle.as_anon(Request(method="GET", url=base_url))
+
+    assert res == {"attempt": 2}
+    host_window = next(iter(limiter.hosts.values()))
+    # Shrunk once on the 429, then grew a bit on the retry that went through
+    assert host_window.decreases == 1
+    assert host_window.increases == 1
+    assert 4 < host_window.window < 5
+    assert limiter.in_flight == 0
+
+
+def batch_handler(failures=0):
+    """ Fakes Google's batch endpoint. Fails requests to odd paths with a 503 ``failures`` times each, whether batched or not """
+    received = []
+    attempts = {}
+
+    async def handler(request):
+        if request.path != "/batch":
+            received.append(request.path)
+            attempts[request.path] = attempts.get(request.path, 0) + 1
+            if int(request.path.strip("/")) % 2 and attempts[request.path] <= failures:
+                return web.json_response({"error": {"message": "try again"}}, status=503)
+            return web.json_response({"path": request.path})
+        boundary = request.headers["Content-Type"].split("boundary=")[1]
+        body = (await request.read()).decode()
+        parts = body.split(f"--{boundary}")[1:-1]
+        received.append(len(parts))
+        out = ""
+        for part in parts:
+            content_id = part.split("Content-ID: <")[1].split(">")[0]
+            path = part.split("\r\n\r\n")[1].split(" ")[1]
+            attempts[path] = attempts.get(path, 0) + 1
+            if int(path.strip("/")) % 2 and attempts[path] <= failures:
+                status, payload = "503 Service Unavailable", {"error": {"message": "try again"}}
+            else:
+                status, payload = "200 OK", {"path": path}
+            out += (
+                f"--resp\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n\r\n{json.dumps(payload)}\r\n"
+            )
+        out += "--resp--\r\n"
+        return web.Response(text=out, headers={"Content-Type": "multipart/mixed; boundary=resp"})
+
+    handler.received = received
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_batch_packs_requests_per_batch_url(serve):
+    handler = batch_handler()
+    base_url = await serve(handler)
+
+    reqs = [Request(method="GET", url=f"{base_url}/{i}", batch_url=f"{base_url}/batch") for i in range(5)]
+    async with Aiogoogle() as aiogoogle:
+        res = await aiogoogle.as_anon(*reqs, batch=2)
+
+    assert res == [{"path": f"/{i}"} for i in range(5)]
+    # The last request would be alone in its batch, so it's sent as is
+    assert sorted(handler.received, key=str) == ["/4", 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_batch_only_retries_failed_parts(serve):
+    handler = batch_handler(failures=1)
+    base_url = await serve(handler)
+
+    reqs = [Request(method="GET", url=f"{base_url}/{i}", batch_url=f"{base_url}/batch") for i in range(6)]
+    async with Aiogoogle(retry_policy=RetryPolicy(initial_backoff=0.001)) as aiogoogle:
+        res = await aiogoogle.as_anon(*reqs, batch=True)
+
+    assert res == [{"path": f"/{i}"} for i in range(6)]
+    assert handler.received == [6, 3]
+    assert aiogoogle.stats.retries == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_parts_sent_again_alone_share_the_retry_budget(serve):
+    handler = batch_handler(failures=5)
+    base_url = await serve(handler)
+
+    reqs = [Request(method="GET", url=f"{base_url}/{i}", batch_url=f"{base_url}/batch") for i in range(2)]
+    async with Aiogoogle(retry_policy=RetryPolicy(max_attempts=2, initial_backoff=0.001)) as aiogoogle:
+        responses = await aiogoogle.as_anon(*reqs, batch=True, full_res=True, raise_for_status=False)
+
+    assert [response.status_code for response in responses] == [200, 503]
+    assert handler.received == [2, "/1"]
+    assert aiogoogle.stats.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_raises_errors_of_parts(serve):
+    base_url = await serve(batch_handler(failures=1))
+
+    reqs = [Request(method="GET", url=f"{base_url}/{i}", batch_url=f"{base_url}/batch") for i in range(2)]
+    async with Aiogoogle() as aiogoogle:
+        with pytest.raises(HTTPError) as e:
+            await aiogoogle.as_anon(*reqs, batch=True)
+        responses = await aiogoogle.as_anon(*reqs, batch=True, full_res=True, raise_for_status=False)
+
+    assert e.value.res.req is reqs[1]
+    assert [response.status_code for response in responses] == [200, 200]
+
+
+@pytest.mark.asyncio
+async def test_auto_batch_coalesces_individually_awaited_requests(serve):
+    handler = batch_handler(failures=1)
+    base_url = await serve(handler)
+
+    async with Aiogoogle(auto_batch=BatchCoalescer(window=0.05), retry_policy=RetryPolicy(initial_backoff=0.001)) as aiogoogle:
+        res = await asyncio.gather(*[
+            aiogoogle.as_anon(Request(method="GET", url=f"{base_url}/{i}", batch_url=f"{base_url}/batch"))
+            for i in range(4)
+        ])
+        unbatchable = await aiogoogle.as_anon(Request(method="GET", url=f"{base_url}/5"))
+
+    assert res == [{"path": f"/{i}"} for i in range(4)]
+    assert unbatchable == {"path": "/5"}
+    # The 2 failed parts are retried together
+    assert handler.received == [4, 2, "/5", "/5"]
+    assert aiogoogle.batch_coalescer.batches_sent == 1
+    assert aiogoogle.batch_coalescer.requests_coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_auto_batch_only_raises_failed_parts_to_their_callers(serve):
+    base_url = await serve(batch_handler(failures=5))
+
+    async with Aiogoogle(auto_batch=BatchCoalescer(window=0.05), retry_policy=RetryPolicy(max_attempts=2, initial_backoff=0.001)) as aiogoogle:
+        failed, succeeded = await asyncio.gather(*[
+            aiogoogle.as_anon(Request(method="GET", url=f"{base_url}/{i}", batch_url=f"{base_url}/batch"))
+            for i in (1, 2)
+        ], return_exceptions=True)
+
+    assert isinstance(failed, HTTPError)
+    assert failed.res.status_code == 503
+    assert succeeded == {"path": "/2"}
+
+
+@pytest.mark.asyncio
+async def test_auto_batch_keeps_users_apart(serve):
+    handler = batch_handler()
+    base_url = await serve(handler)
+
+    def req(i, token):
+        return Request(method="GET", url=f"{base_url}/{i}", batch_url=f"{base_url}/batch", headers={"Authorization": f"Bearer {token}"})
+
+    async with Aiogoogle(auto_batch=BatchCoalescer(window=0.05, max_size=2)) as aiogoogle:
+        await asyncio.gather(*[aiogoogle.as_anon(req(i, token)) for i in range(3) for token in ("a", "b")])
+
+    # Per user: a full batch of 2 right away and the last request sent on its own once the window is over
+    assert handler.received == [2, 2, "/2", "/2"]
+    assert aiogoogle.batch_coalescer.batches_sent == 4
+
+
+@pytest.mark.asyncio
+async def test_auto_batch_respects_max_concurrency(serve):
+    base_url = await serve(batch_handler())
+
+    async with Aiogoogle(auto_batch=BatchCoalescer(window=0.01), max_concurrency=1) as aiogoogle:
+        res = await aiogoogle.as_anon(*[Request(method="GET", url=f"{base_url}/{i}", batch_url=f"{base_url}/batch") for i in range(3)])
+
+    assert res == [{"path": f"/{i}"} for i in range(3)]
+    assert aiogoogle.concurrency_limiter.in_flight == 0
+
+
+def counting_handler(delay=0.05):
+    received = []
+
+    async def handler(request):
+        received.append((request.method, request.path_qs, request.headers.get("Authorization")))
+        await asyncio.sleep(delay)
+        return web.json_response({"items": [request.path_qs]})
+
+    handler.received = received
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_shares_identical_in_flight_requests(serve):
+    handler = counting_handler()
+    base_url = await serve(handler)
+
+    def get(path, token="a"):
+        return Request(method="GET", url=f"{base_url}{path}", headers={"Authorization": f"Bearer {token}"})
+
+    async with Aiogoogle(deduplicate=True) as aiogoogle:
+        reqs = [get("/file"), get("/file"), get("/file"), get("/file", token="b"), get("/other")]
+        responses = await asyncio.gather(*[aiogoogle.as_anon(req, full_res=True) for req in reqs])
+        posted = await asyncio.gather(*[aiogoogle.as_anon(Request(method="POST", url=f"{base_url}/file", json={})) for _ in range(2)])
+
+    assert sorted(handler.received[:3]) == [
+        ("GET", "/file", "Bearer a"),
+        ("GET", "/file", "Bearer b"),
+        ("GET", "/other", "Bearer a"),
+    ]
+    assert len(handler.received) == 5
+    assert aiogoogle.stats.deduplicated == 2
+    assert posted == [{"items": ["/file"]}] * 2
+
+    # Every caller gets its own copy
+    assert [response.req for response in responses] == reqs
+    responses[0].json["items"].append("mutated")
+    assert responses[1].json == {"items": ["/file"]}
+    assert aiogoogle.single_flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_waiters_send_again_if_the_shared_request_is_cancelled(serve):
+    handler = counting_handler()
+    base_url = await serve(handler)
+
+    async with Aiogoogle(deduplicate=True) as aiogoogle:
+        first = asyncio.ensure_future(aiogoogle.as_anon(Request(method="GET", url=f"{base_url}/file")))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(aiogoogle.as_anon(Request(method="GET", url=f"{base_url}/file")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == {"items": ["/file"]}
+
+    assert first.cancelled()
+    assert len(handler.received) == 2
+    assert aiogoogle.stats.deduplicated == 0
+
+
+def etag_handler():
+    received = []
+
+    async def handler(request):
+        received.append(request.headers.get("If-None-Match"))
+        etag = f'"{request.path}-v1"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response({"path": request.path, "user": request.headers.get("Authorization")}, headers={"ETag": etag})
+
+    handler.received = received
+    return handler
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("offload_json", [None, JsonCodec(offload_threshold=1)])
+async def test_cache_revalidates_with_etags(serve, offload_json):
+    handler = etag_handler()
+    base_url = await serve(handler)
+
+    def get(token):
+        return Request(method="GET", url=f"{base_url}/file", headers={"Authorization": f"Bearer {token}"})
+
+    async with Aiogoogle(cache=True, offload_json=offload_json) as aiogoogle:
+        first = await aiogoogle.as_anon(get("alice"))
+        first["mutated"] = True
+        alice_req = get("alice")
+        second = await aiogoogle.as_anon(alice_req, full_res=True)
+        bob = await aiogoogle.as_anon(get("bob"))
+
+    assert handler.received == [None, '"/file-v1"', None]
+    assert second.status_code == 200
+    assert second.json == {"path": "/file", "user": "Bearer alice"}
+    assert second.headers["Content-Type"] == "application/json; charset=utf-8"
+    assert "If-None-Match" not in alice_req.headers
+    # Users never get each other's responses
+    assert bob == {"path": "/file", "user": "Bearer bob"}
+    assert aiogoogle.stats.cache_hits == 1
+    assert aiogoogle.stats.cache_misses == 2
+    # Cached bodies are parsed by the codec too, once they're served
+    assert aiogoogle.stats.bodies_offloaded == (3 if offload_json else 0)
+
+
+def echo_handler():
+    async def handler(request):
+        if request.path == "/text":
+            return web.Response(text="not json")
+        body = await request.json() if request.can_read_body else None
+        response = web.json_response({"items": [0] * 1000, "echo": body, "content_type": request.content_type})
+        response.enable_compression()
+        return response
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_offload_json_parses_and_serializes_large_bodies_in_executor(serve):
+    base_url = await serve(echo_handler())
+    codec = JsonCodec(offload_threshold=1024)
+
+    async with Aiogoogle(offload_json=codec) as aiogoogle:
+        small = await aiogoogle.as_anon(Request(method="POST", url=base_url + "/items", json={"a": 1}), full_res=True)
+        large = await aiogoogle.as_anon(Request(method="POST", url=base_url + "/items", json={"a": "x" * 2048}))
+        text = await aiogoogle.as_anon(Request(method="GET", url=base_url + "/text"))
+
+    # Compressed, the response bodies are small enough to be decoded inline
+    assert small.headers["Content-Encoding"] == "gzip"
+    assert small.json == {"items": [0] * 1000, "echo": {"a": 1}, "content_type": "application/json"}
+    assert large["echo"] == {"a": "x" * 2048}
+    assert text == "not json"
+    assert aiogoogle.stats.bodies_offloaded == 1
+    assert aiogoogle.stats.bytes_offloaded == len(json.dumps({"a": "x" * 2048}))
+
+
+@pytest.mark.asyncio
+async def test_offload_json_decompresses_large_responses_in_executor(serve):
+    base_url = await serve(echo_handler())
+
+    async with Aiogoogle(offload_json=JsonCodec(offload_threshold=0)) as aiogoogle:
+        res = await aiogoogle.as_anon(Request(method="GET", url=base_url + "/items"))
+
+    assert res["items"] == [0] * 1000
+    assert aiogoogle.stats.bodies_offloaded == 1
+    assert 0 < aiogoogle.stats.bytes_offloaded < len(json.dumps(res))
+
+
+@pytest.mark.asyncio
+async def test_pagination_prefetches_next_pages(serve_pages):
+    events = []
+    url = await serve_pages(5, events=events)
+
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+        async for page in res(prefetch=2):
+            events.append(("consume", page["items"][0]))
+            await asyncio.sleep(0.05)
+
+    assert [page for event, page in events if event == "consume"] == [0, 1, 2, 3, 4]
+    # The next pages were fetched while the first one was being consumed, but no more than the buffer holds
+    assert events[:6] == [("fetch", 0), ("consume", 0), ("fetch", 1), ("fetch", 2), ("fetch", 3), ("consume", 1)]
+
+
+@pytest.mark.asyncio
+async def test_pagination_prefetch_stops_when_consumer_stops(serve_pages):
+    events = []
+    url = await serve_pages(10, events=events)
+
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+        res.prefetch = 1
+        async for page in res:
+            break
+        await asyncio.sleep(0.05)
+
+    assert len(events) <= 3
+
+
+@pytest.mark.asyncio
+async def test_pagination_prefetch_raises_errors_of_next_pages(serve_pages):
+    url = await serve_pages(3, failing_page=1)
+
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+        pages = []
+        with pytest.raises(HTTPError):
+            async for page in res(prefetch=2):
+                pages.append(page)
+
+    assert pages == [{"items": [0], "nextPageToken": "1"}]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 2])
+async def test_response_items_yields_items_across_pages(serve_pages, prefetch):
+    url = await serve_pages(4, per_page=3, key="files")
+
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+        items = [item async for item in res.items(prefetch=prefetch)]
+        keyed_res = await first_page(aiogoogle, url, items_key="missing")
+        keyed = [item async for item in keyed_res.items("files")]
+        missing_res = await first_page(aiogoogle, url, items_key="missing")
+        missing = [item async for item in missing_res.items()]
+
+    assert items == list(range(12))
+    # Keys passed to items() take precedence over the one of the request
+    assert keyed == items
+    assert missing == []
+    # The first page is left untouched
+    assert res.json["files"] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 2])
+async def test_checkpointed_scan_resumes_from_last_consumed_page(serve_pages, tmp_path, prefetch):
+    events = []
+    url = await serve_pages(5, per_page=3, events=events)
+    store = FileCheckpointStore(str(tmp_path))
+
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+        consumed = []
+        async for item in res.items(checkpoint_store=store, prefetch=prefetch):
+            consumed.append(item)
+            if item == 4:
+                # Dies halfway through the second page
+                break
+
+    assert consumed == [0, 1, 2, 3, 4]
+    (checkpoint_file,) = tmp_path.iterdir()
+    checkpoint = json.loads(checkpoint_file.read_text())
+    assert (checkpoint["page_token"], checkpoint["pages_emitted"], checkpoint["items_emitted"]) == ("1", 1, 3)
+
+    # Another process runs the same scan
+    events.clear()
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+        resumed = [item async for item in res.items(checkpoint_store=store, prefetch=prefetch)]
+
+    # The second page wasn't fully processed, so it's processed again
+    assert resumed == list(range(3, 15))
+    assert events == [("fetch", page) for page in range(5)]
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_checkpointed_scan_records_progress(serve_pages):
+    events = []
+    url = await serve_pages(5, per_page=3, events=events)
+    store = MemoryCheckpointStore()
+
+    async with Aiogoogle() as aiogoogle:
+        res = await first_page(aiogoogle, url)
+        async for page in res(checkpoint_store=store, checkpoint_key="items"):
+            if page["items"][0] == 6:
+                break
+
+        checkpoint = await store.get("items")
+        assert (checkpoint["page_token"], checkpoint["pages_emitted"]) == ("2", 2)
+        # Pages don't know which of their properties holds items unless the request does
+        assert checkpoint["items_emitted"] == 0
+
+        # Resuming with the request of the checkpointed page doesn't request the first page again
+        events.clear()
+        res = await first_page(aiogoogle, url + "?pageToken=2", items_key="items")
+        pages = [page async for page in res(checkpoint_store=store, checkpoint_key="items")]
+
+    assert [page["items"][0] for page in pages] == [6, 9, 12]
+    assert events == [("fetch", 2), ("fetch", 3), ("fetch", 4)]
+    assert len(store) == 0
@@ -0,0 +1,32 @@
+import asyncio
+import gc
+
+import pytest
+
+from aiogoogle.models import Request
+from aiogoogle.sessions.batching import BatchCoalescer
+
+
+@pytest.mark.asyncio
+async def test_coalescer_keeps_batches_in_flight_and_waits_for_them_on_close():
+    coalescer = BatchCoalescer(window=10)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def send_batch(requests):
+        started.set()
+        await release.wait()
+        return [request.url for request in requests]
+
+    urls = [f"https://example.com/{i}" for i in range(2)]
+    waiters = [asyncio.ensure_future(coalescer.submit(Request(url=url, batch_url="https://example.com/batch"), send_batch)) for url in urls]
+    await asyncio.sleep(0)
+    # Sends the pending batch without waiting for the window to end
+    closing = asyncio.ensure_future(coalescer.aclose())
+    await started.wait()
+    gc.collect()
+    assert len(coalescer._tasks) == 1
+    release.set()
+    await closing
+    assert await asyncio.gather(*waiters) == urls
+    assert not coalescer._tasks
@@ -0,0 +1,97 @@
+import gzip
+
+import pytest
+
+from aiogoogle.models import Request
+from aiogoogle.sessions.cache import FileCache, MemoryCache, _cache_key, _decode_entry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def entry(json=None, data=None):
+    return {"etag": '"1"', "status_code": 200, "headers": {}, "json": json, "data": data}
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    await cache.set("a", entry({"a": 1}))
+    await cache.set("b", entry({"b": 1}))
+    await cache.get("a")
+    await cache.set("c", entry({"c": 1}))
+    assert await cache.get("b") is None
+    assert (await cache.get("a"))["json"] == {"a": 1}
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_max_bytes_and_ttl():
+    clock = FakeClock()
+    cache = MemoryCache(max_bytes=10, ttl=60, clock=clock)
+    await cache.set("a", entry(data="12345"))
+    await cache.set("b", entry(data="123456"))
+    assert await cache.get("a") is None
+    await cache.set("too big", entry(data="x" * 11))
+    assert await cache.get("too big") is None
+    assert cache.size == 6
+
+    clock.now = 61
+    assert await cache.get("b") is None
+    assert cache.size == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_returns_copies():
+    cache = MemoryCache()
+    stored = entry({"items": [1]})
+    await cache.set("a", stored)
+    stored["json"]["items"].append(2)
+    got = await cache.get("a")
+    got["json"]["items"].append(3)
+    assert (await cache.get("a"))["json"] == {"items": [1]}
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_keeps_bodies_as_received():
+    cache = MemoryCache(max_bytes=1000)
+    body = gzip.compress(b'{"items": [1]}')
+    await cache.set("a", {**entry({"items": [1]}), "body": body, "content_encoding": "gzip", "content_type": "application/json", "charset": None})
+    # Sized by the body as received, rather than by serializing what it was parsed to again
+    assert cache.size == len(body)
+    got = await cache.get("a")
+    # Only parsed once served
+    assert got["json"] is None
+    json_body, _ = await _decode_entry(got, None, None)
+    assert json_body == {"items": [1]}
+    json_body["items"].append(2)
+    assert (await _decode_entry(await cache.get("a"), None, None))[0] == {"items": [1]}
+
+
+@pytest.mark.asyncio
+async def test_file_cache(tmp_path):
+    clock = FakeClock()
+    cache = FileCache(str(tmp_path / "cache"), ttl=10, clock=clock)
+    await cache.set("a", {**entry({"a": 1}), "body": b'{"a": 1}', "content_encoding": None, "content_type": "application/json", "charset": None})
+    assert (await cache.get("a"))["json"] == {"a": 1}
+    assert await cache.get("b") is None
+
+    clock.now = 11
+    assert await cache.get("a") is None
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_cache_key_depends_on_identity():
+    url = "https://www.googleapis.com/drive/v3/files/a"
+    anon = _cache_key(Request(method="GET", url=url))
+    alice = _cache_key(Request(method="GET", url=url, headers={"Authorization": "Bearer alice"}))
+    bob = _cache_key(Request(method="GET", url=url, headers={"Authorization": "Bearer bob"}))
+    assert len({anon, alice, bob}) == 3
+    # Tokens aren't stored as is
+    assert "alice" not in alice
+    assert _cache_key(Request(method="POST", url=url, json={})) is None
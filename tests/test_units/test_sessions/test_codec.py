@@ -0,0 +1,54 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+from aiogoogle.sessions.codec import JsonCodec, _decode_body, _exceeds
+
+
+def test_decode_body_falls_back_to_text_and_bytes():
+    assert _decode_body(json.loads, b'{"a": 1}', None, "application/json", None) == ({"a": 1}, None)
+    assert _decode_body(json.loads, b'{"a": 1}', None, "application/problem+json", "utf-8") == ({"a": 1}, None)
+    assert _decode_body(json.loads, b"  ", None, "application/json", None) == (None, None)
+    assert _decode_body(json.loads, b"not json", None, "application/json", None) == (None, "not json")
+    assert _decode_body(json.loads, b'{"a": 1}', None, "text/plain", None) == (None, '{"a": 1}')
+    assert _decode_body(json.loads, b"\xff\xfe", None, "application/octet-stream", None) == (None, b"\xff\xfe")
+
+
+def test_decode_body_decompresses():
+    body = json.dumps({"a": [1, 2]}).encode()
+    assert _decode_body(json.loads, gzip.compress(body), "gzip", "application/json", None) == ({"a": [1, 2]}, None)
+    assert _decode_body(json.loads, zlib.compress(body), "deflate", "application/json", None) == ({"a": [1, 2]}, None)
+
+
+def test_exceeds_stops_early():
+    assert not _exceeds({"a": [1, 2, "b"]}, 100)
+    assert _exceeds({"a": ["x" * 60, "y" * 60]}, 100)
+    assert _exceeds([[1] * 10 ** 6], 100)
+
+
+def test_from_option():
+    codec = JsonCodec()
+    assert JsonCodec.from_option(None) is None
+    assert JsonCodec.from_option(False) is None
+    assert isinstance(JsonCodec.from_option(True), JsonCodec)
+    assert JsonCodec.from_option(codec) is codec
+    with pytest.raises(TypeError):
+        JsonCodec.from_option(1)
+
+
+def test_pluggable_backend():
+    class Backend:
+        @staticmethod
+        def loads(s):
+            return {"loaded": json.loads(s)}
+
+        @staticmethod
+        def dumps(value):
+            return json.dumps(value).encode()
+
+    codec = JsonCodec(backend=Backend)
+    assert _decode_body(codec.loads, b"1", None, "application/json", None) == ({"loaded": 1}, None)
+    with pytest.raises(ModuleNotFoundError):
+        JsonCodec(backend="not_a_json_library")
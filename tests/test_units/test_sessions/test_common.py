@@ -0,0 +1,85 @@
+import datetime
+from email.utils import format_datetime
+
+import pytest
+
+from aiogoogle.models import Request, Response, MediaUpload
+from aiogoogle.sessions.common import RetryPolicy
+
+
+def make_response(status_code, headers=None, method="GET"):
+    return Response(status_code=status_code, headers=headers or {}, req=Request(method=method, url="https://example.com"))
+
+
+@pytest.mark.parametrize("status_code, retried", [(200, False), (400, False), (429, True), (500, True), (503, True)])
+def test_retry_policy_retries_transient_statuses(status_code, retried):
+    policy = RetryPolicy()
+    res = make_response(status_code)
+    assert policy.should_retry(res.req, 1, response=res) is retried
+
+
+@pytest.mark.parametrize("status_code, retried", [(429, True), (500, False), (503, False)])
+def test_retry_policy_non_idempotent_methods(status_code, retried):
+    policy = RetryPolicy()
+    res = make_response(status_code, method="POST")
+    assert policy.should_retry(res.req, 1, response=res) is retried
+
+
+def test_retry_policy_connection_errors_only_retried_for_idempotent_methods():
+    policy = RetryPolicy()
+    assert policy.should_retry(Request(method="GET"), 1, exc=ConnectionError()) is True
+    assert policy.should_retry(Request(method="POST"), 1, exc=ConnectionError()) is False
+
+
+def test_retry_policy_batch_requests_are_as_idempotent_as_their_parts():
+    policy = RetryPolicy()
+    gets = Request.batch_requests(*[Request(method="GET", url="https://example.com", batch_url="https://example.com/batch") for _ in range(2)])
+    mixed = Request.batch_requests(
+        Request(method="GET", url="https://example.com", batch_url="https://example.com/batch"),
+        Request(method="POST", url="https://example.com", batch_url="https://example.com/batch"),
+    )
+    assert policy.should_retry(gets, 1, response=Response(status_code=503, req=gets)) is True
+    assert policy.should_retry(mixed, 1, response=Response(status_code=503, req=mixed)) is False
+    assert policy.should_retry(mixed, 1, response=Response(status_code=429, req=mixed)) is True
+
+
+def test_retry_policy_max_attempts():
+    policy = RetryPolicy(max_attempts=3)
+    res = make_response(503)
+    assert policy.should_retry(res.req, 2, response=res) is True
+    assert policy.should_retry(res.req, 3, response=res) is False
+
+
+def test_retry_policy_doesnt_retry_piped_uploads():
+    policy = RetryPolicy()
+    req = Request(method="PUT", media_upload=MediaUpload(None, pipe_from=object()))
+    assert policy.should_retry(req, 1, exc=ConnectionError()) is False
+
+
+def test_retry_policy_exponential_delay_without_jitter():
+    policy = RetryPolicy(initial_backoff=1, multiplier=2, max_backoff=5, jitter=0)
+    assert [policy.get_delay(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+
+
+def test_retry_policy_jitter_stays_within_backoff():
+    policy = RetryPolicy(initial_backoff=1, jitter=1)
+    for _ in range(100):
+        assert 0 <= policy.get_delay(1) <= 1
+
+
+def test_retry_policy_respects_retry_after_seconds():
+    policy = RetryPolicy(initial_backoff=0.1, jitter=0)
+    assert policy.get_delay(1, make_response(429, {"Retry-After": "7"})) == 7
+
+
+def test_retry_policy_respects_retry_after_http_date():
+    policy = RetryPolicy(initial_backoff=0.1, jitter=0)
+    retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    delay = policy.get_delay(1, make_response(503, {"Retry-After": format_datetime(retry_at, usegmt=True)}))
+    assert 25 < delay <= 30
+
+
+def test_retry_policy_gives_up_on_long_retry_after():
+    policy = RetryPolicy(max_retry_after=10)
+    res = make_response(429, {"Retry-After": "3600"})
+    assert policy.should_retry(res.req, 1, response=res) is False
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from aiogoogle.models import Request, Response
+from aiogoogle.sessions.limiters import AdaptiveConcurrencyLimiter, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_up_to_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=4, clock=clock)
+    for _ in range(4):
+        assert bucket.time_until_available() == 0
+        bucket.consume()
+    assert bucket.time_until_available() == 0.5
+    clock.now = 100
+    assert bucket.time_until_available(4) == 0
+    assert bucket.tokens == 4
+
+
+def test_token_bucket_cost_larger_than_burst_waits_for_full_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, burst=2, clock=clock)
+    bucket.consume(2)
+    assert bucket.time_until_available(10) == 2
+
+
+def test_rate_limiter_picks_buckets_by_api_and_method():
+    limiter = RateLimiter(rates={"drive:v3": 10, "drive.files.list": (1, 5), "gmail:v1": 3})
+    req = Request(api_id="drive:v3", method_id="drive.files.list")
+    assert limiter._buckets_for(req) == [limiter.buckets["drive:v3"], limiter.buckets["drive.files.list"]]
+    assert limiter.buckets["drive.files.list"].burst == 5
+    assert limiter._buckets_for(Request()) == []
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_paces_requests():
+    limiter = RateLimiter(rates={"*": (100, 1)})
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(*[limiter.acquire(Request()) for _ in range(5)])
+    # The first request goes through right away, the other 4 wait for 10ms each
+    assert loop.time() - started >= 0.035
+    assert limiter.waiting == 0
+    assert limiter.waited > 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_costs():
+    clock = FakeClock()
+    limiter = RateLimiter(rates={"youtube:v3": (1, 100)}, costs={"youtube.search.list": 100}, clock=clock)
+    await limiter.acquire(Request(api_id="youtube:v3", method_id="youtube.search.list"))
+    assert limiter.buckets["youtube:v3"].tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_charges_each_part_of_batch_requests():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        rates={"youtube:v3": (1, 1000), "youtube.search.list": (1, 10)}, costs={"youtube.search.list": 100}, clock=clock
+    )
+    parts = [Request(api_id="youtube:v3", method_id="youtube.search.list", batch_url="https://example.com/batch") for _ in range(3)]
+    parts.append(Request(api_id="youtube:v3", method_id="youtube.videos.list", batch_url="https://example.com/batch"))
+    await limiter.acquire(Request.batch_requests(*parts))
+    assert limiter.buckets["youtube:v3"].tokens == 1000 - 301
+    # Went through once the bucket was full, leaving it in debt for the rest
+    assert limiter.buckets["youtube.search.list"].tokens == 10 - 300
+
+
+def test_adaptive_limiter_grows_additively_and_shrinks_multiplicatively():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_window=4, max_window=8, cooldown=1, clock=clock)
+    req = Request(url="https://www.googleapis.com/drive/v3/files")
+    for _ in range(4):
+        limiter.observe(req, response=Response(status_code=200), latency=0.1)
+    host_window = limiter.hosts["www.googleapis.com"]
+    # About +1 per round trip (i.e. per window's worth of responses)
+    assert 4.9 < host_window.window < 5
+    assert host_window.increases == 4
+
+    limiter.observe(req, response=Response(status_code=429), latency=0.1)
+    assert 2.4 < host_window.window < 2.5
+    assert (host_window.last_decision, host_window.last_decision_reason) == ("decrease", "status 429")
+
+    # Responses throttled during the same burst don't shrink the window again
+    limiter.observe(req, response=Response(status_code=503), latency=0.1)
+    assert host_window.decreases == 1
+    assert host_window.last_decision == "hold"
+
+    clock.now = 2
+    for _ in range(5):
+        limiter.observe(req, response=Response(status_code=503), latency=0.1)
+        clock.now += 2
+    assert host_window.window == limiter.min_window
+
+
+def test_adaptive_limiter_treats_slow_responses_and_errors_as_congestion():
+    limiter = AdaptiveConcurrencyLimiter(initial_window=8, latency_tolerance=3, cooldown=0)
+    req = Request(url="https://sheets.googleapis.com/v4/spreadsheets")
+    limiter.observe(req, response=Response(status_code=200), latency=0.1)
+    limiter.observe(req, response=Response(status_code=200), latency=0.5)
+    host_window = limiter.hosts["sheets.googleapis.com"]
+    assert host_window.last_decision_reason == "latency"
+    limiter.observe(req, exc=asyncio.TimeoutError(), latency=0.1)
+    assert host_window.decreases == 2
+    assert limiter.stats()["sheets.googleapis.com"]["decreases"] == 2
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_keeps_a_window_per_host():
+    limiter = AdaptiveConcurrencyLimiter(initial_window=1)
+    drive = Request(url="https://www.googleapis.com/drive/v3/files")
+    sheets = Request(url="https://sheets.googleapis.com/v4/spreadsheets")
+    await limiter.acquire(drive)
+    # Another host isn't held back by a full window
+    await asyncio.wait_for(limiter.acquire(sheets), 1)
+
+    waiter = asyncio.ensure_future(limiter.acquire(drive))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    assert limiter.hosts["www.googleapis.com"].waiting == 1
+    limiter.release(drive, response=Response(status_code=200))
+    await asyncio.wait_for(waiter, 1)
+    assert limiter.in_flight == 2
+
+
+def test_adaptive_limiter_validates_arguments():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(initial_window=200, max_window=100)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(decrease_factor=1)
@@ -0,0 +1,88 @@
+import pytest
+
+trio = pytest.importorskip("trio")
+pytest.importorskip("asks")
+
+from aiogoogle.models import Request, Response  # noqa: E402
+from aiogoogle.sessions.trio_asks_session import TrioAsksSession  # noqa: E402
+
+# Seconds each request takes, by URL
+DELAYS = {"https://example.com/slow": 0.3, "https://example.com/medium": 0.2, "https://example.com/fast": 0.1}
+
+
+def make_session(in_flight):
+    """
+    Returns a session whose requests take as long as DELAYS says, without touching the network.
+    ``in_flight`` tracks the URLs of the requests that haven't completed
+    """
+    session = TrioAsksSession()
+
+    def make_response_getter(*args, **kwargs):
+        async def get_response(request):
+            in_flight.add(request.url)
+            try:
+                await trio.sleep(DELAYS[request.url])
+            finally:
+                in_flight.discard(request.url)
+            return Response(status_code=200, json={"url": request.url}, req=request)
+
+        return get_response
+
+    session._make_response_getter = make_response_getter
+    return session
+
+
+def make_requests():
+    return [Request(url=url) for url in DELAYS]
+
+
+def test_send_iter_yields_in_completion_order():
+    async def main():
+        session = make_session(set())
+        return [res["url"] async for _, res in session.send_iter(*make_requests())]
+
+    assert trio.run(main) == ["https://example.com/fast", "https://example.com/medium", "https://example.com/slow"]
+
+
+def test_send_iter_cancels_pending_requests_on_early_break():
+    in_flight = set()
+
+    async def main():
+        async with make_session(in_flight).send_iter(*make_requests()) as results:
+            async for _, res in results:
+                break
+        # Cancelled, rather than left running in the background
+        assert in_flight == set()
+        return res
+
+    assert trio.run(main) == {"url": "https://example.com/fast"}
+
+
+def test_send_iter_timeout_raises():
+    in_flight = set()
+    received = []
+
+    async def main():
+        with pytest.raises(trio.TooSlowError):
+            async for _, res in make_session(in_flight).send_iter(*make_requests(), timeout=0.15):
+                received.append(res)
+        assert in_flight == set()
+
+    trio.run(main)
+    assert received == [{"url": "https://example.com/fast"}]
+
+
+def test_aiohttp_only_options_raise_rather_than_being_ignored():
+    in_flight = set()
+
+    async def main():
+        session = make_session(in_flight)
+        with pytest.raises(NotImplementedError, match="max_concurrency, cache"):
+            await session.send(*make_requests(), max_concurrency=2, cache=True, deduplicate=None, auto_batch=False)
+        with pytest.raises(NotImplementedError, match="offload_json"):
+            session.send_iter(*make_requests(), offload_json=True)
+        # Unset options are passed as None by Aiogoogle
+        return await session.send(*make_requests(), max_concurrency=None, rate_limiter=None, full_res=True)
+
+    assert len(trio.run(main)) == 3
+    assert in_flight == set()
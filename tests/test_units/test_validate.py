@@ -1,6 +1,10 @@
+import copy
+
 import pytest
 
+from aiogoogle.data import DISCOVERY_SERVICE_V1_DISCOVERY_DOC
 from aiogoogle.excs import ValidationError
+from aiogoogle.validate import SchemaValidator, ValidationPolicy, validate
 
 
 # TODO: Test additionalParameters P.S it's tricky as it's not in compliance with jsonschema3
@@ -461,3 +465,89 @@ def test_validates_repeated(create_api):
             ranges=[132, 'valid'],  # Only first item is invalid
             validate=True
         )
+
+
+ROWS_SCHEMAS = {
+    "Rows": {
+        "id": "Rows",
+        "type": "object",
+        "properties": {
+            "rows": {"type": "array", "items": {"$ref": "Row"}},
+        },
+    },
+    "Row": {
+        "id": "Row",
+        "type": "object",
+        "properties": {
+            "id": {"type": "string", "pattern": "^[a-z]+$", "required": True},
+            "kind": {"type": "string", "enum": ["A", "B"]},
+            "size": {"type": "integer", "format": "int32", "minimum": "1"},
+            "labels": {"type": "object", "additionalProperties": {"$ref": "Label"}},
+        },
+    },
+    "Label": {"id": "Label", "type": "string"},
+}
+
+
+def test_schema_validator_caches_compiled_refs():
+    validator = SchemaValidator(ROWS_SCHEMAS)
+    assert validator.validator_of({"$ref": "Rows"}) is validator.validator_of({"$ref": "Rows"})
+    validator.validate({"rows": [{"id": "a", "kind": "A", "size": 2, "labels": {"x": "y"}}] * 10}, {"$ref": "Rows"})
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        {"kind": "A"},
+        {"id": "NOT_LOWERCASE"},
+        {"id": "a", "kind": "C"},
+        {"id": "a", "size": 0},
+        {"id": "a", "size": "1"},
+        {"id": "a", "labels": {"x": 1}},
+    ],
+)
+def test_schema_validator_errors_match_validate(row):
+    body = {"rows": [{"id": "a"}, row]}
+    with pytest.raises(ValidationError) as expected:
+        validate(body, {"$ref": "Rows"}, ROWS_SCHEMAS)
+    validator = SchemaValidator(ROWS_SCHEMAS)
+    for _ in range(2):
+        with pytest.raises(ValidationError) as compiled:
+            validator.validate(body, {"$ref": "Rows"})
+        assert str(compiled.value) == str(expected.value)
+
+
+def test_schema_validator_handles_recursive_schemas():
+    doc = copy.deepcopy(DISCOVERY_SERVICE_V1_DISCOVERY_DOC)
+    SchemaValidator(doc["schemas"]).validate(doc, {"$ref": "RestDescription"})
+
+
+def test_sampled_validator_checks_first_item_and_array_type():
+    full_validator = SchemaValidator(ROWS_SCHEMAS)
+    validator = full_validator.sampled(1)
+    assert validator is full_validator.sampled(1)
+    validator.validate({"rows": [{"id": "a"}] + [{"id": "NOT_LOWERCASE"}] * 100}, {"$ref": "Rows"})
+    with pytest.raises(ValidationError):
+        validator.validate({"rows": [{"id": "NOT_LOWERCASE"}, {"id": "a"}]}, {"$ref": "Rows"})
+    with pytest.raises(ValidationError):
+        validator.validate({"rows": {"id": "a"}}, {"$ref": "Rows"})
+
+
+def test_validation_policy_samples_after_full_calls():
+    schema_validator = SchemaValidator(ROWS_SCHEMAS)
+    policy = ValidationPolicy(sample_size=1, full_calls=1)
+    body = {"rows": [{"id": "a"}, {"id": "NOT_LOWERCASE"}]}
+    policy._record_call("rows.insert")
+    with pytest.raises(ValidationError):
+        policy.validate("rows.insert", schema_validator, body, {"$ref": "Rows"})
+    policy._record_call("rows.insert")
+    policy.validate("rows.insert", schema_validator, body, {"$ref": "Rows"})
+
+
+def test_validation_policy_reports_violations():
+    reported = []
+    policy = ValidationPolicy(on_violation=lambda method_id, e: reported.append((method_id, e)))
+    policy.validate("rows.insert", SchemaValidator(ROWS_SCHEMAS), {"rows": [{"kind": "A"}]}, {"$ref": "Rows"})
+    assert policy.violations == 1
+    assert reported[0][0] == "rows.insert"
+    assert isinstance(reported[0][1], ValidationError)